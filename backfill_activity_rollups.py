@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Rebuild the listing_activity_daily and listing_activity_prices rollups behind
+/admin/analytics/timeseries.
+
+    python backfill_activity_rollups.py
+
+Run once after deploying the rollup, or to repair it. Submissions are dated by
+created_at; a listing's current approved/rejected/sold status by updated_at
+(earlier transitions are not stored, so e.g. a sold listing's approval is not
+backfilled). New transitions are recorded as they happen.
+"""
+
+from src.infrastructure.repository.mysql_repo import MySQLRealEstateRepository
+
+
+def main():
+    repo = MySQLRealEstateRepository()
+    rows = repo.rebuild_listing_activity()
+    print(f"✅ Rebuilt listing activity rollup: {rows} rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark the in-memory property search index against the MySQL search path.
+
+    python benchmark_search.py                      # index only, 100k synthetic listings
+    python benchmark_search.py --seed-sql --sql     # also seed MySQL and time the same filters there
+    python benchmark_search.py --cleanup            # remove seeded benchmark rows
+
+Seeded rows are tagged with broker_id = 'benchmark-seed'.
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from src.domain.models.common_models import CondoScheme, FurnishingStatus, PropertyStatus, PropertyType
+from src.domain.models.property_models import Property, PropertyFilter
+from src.infrastructure.search.property_index import PropertySearchIndex
+from src.utils.constants import CONDOMINIUM_SITES
+
+BENCHMARK_BROKER_ID = "benchmark-seed"
+
+
+def make_properties(count: int, seed: int = 42) -> list[Property]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    properties = []
+    for _ in range(count):
+        prop_type = rng.choice(list(PropertyType))
+        is_condo = prop_type == PropertyType.CONDOMINIUM
+        properties.append(Property(
+            pid=str(uuid.uuid4()),
+            status=PropertyStatus.APPROVED,
+            property_type=prop_type,
+            location={"region": "Addis Ababa", "city": "Addis Ababa", "site": rng.choice(CONDOMINIUM_SITES)},
+            bedrooms=rng.randint(0, 6),
+            bathrooms=rng.randint(1, 4),
+            size_sqm=rng.uniform(30, 600),
+            price_etb=rng.uniform(500_000, 60_000_000),
+            description="Benchmark listing",
+            image_urls=["/images/benchmark"],
+            furnishing_status=rng.choice([None, *FurnishingStatus]),
+            condominium_scheme=rng.choice(list(CondoScheme)) if is_condo else None,
+            floor_level=rng.randint(0, 20) if rng.random() < 0.7 else None,
+            is_commercial=rng.choice([None, True, False]) if prop_type == PropertyType.BUILDING else None,
+            has_elevator=rng.choice([None, True, False]),
+            broker_id=BENCHMARK_BROKER_ID,
+            created_at=now - timedelta(minutes=rng.randint(0, 525_600)),
+            updated_at=now,
+        ))
+    return properties
+
+
+def make_filters(count: int, seed: int = 7) -> list[PropertyFilter]:
+    rng = random.Random(seed)
+    filters = []
+    for _ in range(count):
+        min_price = rng.choice([None, 1_000_000, 5_000_000, 10_000_000])
+        filters.append(PropertyFilter(
+            property_type=rng.choice([None, *PropertyType]),
+            location_site=rng.choice([None, None, *CONDOMINIUM_SITES]),
+            min_bedrooms=rng.choice([None, 1, 2, 3]),
+            min_price=min_price,
+            max_price=(min_price or 0) + rng.choice([5_000_000, 20_000_000]) if rng.random() < 0.5 else None,
+            min_floor_level=rng.choice([None, None, 2, 5]),
+            filter_has_elevator=rng.choice([None, None, True]),
+        ))
+    return filters
+
+
+def time_queries(label: str, run_query, filters: list[PropertyFilter], page_size: int) -> None:
+    durations = []
+    for f in filters:
+        started = time.perf_counter()
+        run_query(f, page_size)
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    p95 = durations[int(len(durations) * 0.95) - 1]
+    print(f"{label:>8}: {len(filters)} queries, "
+          f"median {statistics.median(durations) * 1e6:,.0f} µs, p95 {p95 * 1e6:,.0f} µs, "
+          f"max {durations[-1] * 1e6:,.0f} µs")
+
+
+def seed_sql(repo, properties: list[Property], batch_size: int = 1000) -> None:
+    columns = ("pid", "property_type", "location_region", "location_city", "location_site", "bedrooms",
+               "bathrooms", "size_sqm", "price_etb", "description", "furnishing_status", "condominium_scheme",
+               "floor_level", "is_commercial", "has_elevator", "broker_id", "status", "created_at", "updated_at")
+    sql = f"INSERT INTO properties ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    rows = [(
+        p.pid, p.property_type.value, p.location.region, p.location.city, p.location.site, p.bedrooms,
+        p.bathrooms, p.size_sqm, p.price_etb, p.description,
+        p.furnishing_status.value if p.furnishing_status else None,
+        p.condominium_scheme.value if p.condominium_scheme else None,
+        p.floor_level, p.is_commercial, p.has_elevator, p.broker_id, p.status.value, p.created_at, p.updated_at,
+    ) for p in properties]
+    connection = repo._get_connection()
+    try:
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                cursor.executemany(sql, rows[start:start + batch_size])
+                cursor.executemany(
+                    "INSERT INTO property_images (property_id, image_url, image_order) VALUES (%s, %s, 0)",
+                    [(row[0], "/images/benchmark") for row in rows[start:start + batch_size]],
+                )
+        connection.commit()
+    finally:
+        connection.close()
+    print(f"Seeded {len(rows)} benchmark listings into MySQL.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listings", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--sql", action="store_true", help="also time the MySQL search path")
+    parser.add_argument("--seed-sql", action="store_true", help="insert the synthetic listings into MySQL first")
+    parser.add_argument("--cleanup", action="store_true", help="delete seeded benchmark listings and exit")
+    args = parser.parse_args()
+
+    repo = None
+    if args.sql or args.seed_sql or args.cleanup:
+        from src.infrastructure.repository.mysql_repo import MySQLRealEstateRepository
+        repo = MySQLRealEstateRepository()
+    if args.cleanup:
+        repo._execute_query("DELETE FROM properties WHERE broker_id = %s", (BENCHMARK_BROKER_ID,))
+        print("Removed benchmark listings.")
+        return
+
+    print(f"Generating {args.listings:,} synthetic listings...")
+    properties = make_properties(args.listings)
+    filters = make_filters(args.queries)
+
+    index = PropertySearchIndex()
+    started = time.perf_counter()
+    index.rebuild(properties)
+    print(f"Index build: {(time.perf_counter() - started) * 1000:,.0f} ms, {index.stats()['approx_bytes'] / 1e6:.1f} MB")
+    time_queries("index", lambda f, n: index.query(f, limit=n), filters, args.page_size)
+
+    if args.seed_sql:
+        seed_sql(repo, properties)
+    if args.sql:
+        time_queries("mysql", lambda f, n: repo.query_properties(f, limit=n), filters, args.page_size)
+
+
+if __name__ == "__main__":
+    main()
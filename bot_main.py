@@ -133,6 +133,7 @@ async def start_bot_with_tunnel():
         settings.MYSQL_HOST = direct_host
         os.environ['MYSQL_HOST'] = direct_host
 
+    notifier = None
     try:
         # Import bot components
         from src.infrastructure.telegram_bot.bot import setup_bot_application
@@ -153,6 +154,12 @@ async def start_bot_with_tunnel():
         await application.start()
         await application.updater.start_polling(drop_pending_updates=True)
         
+        # Send broker notifications queued by bulk moderation in the API
+        from src.infrastructure.telegram_bot.notifications import deliver_broker_notifications
+        notifier = asyncio.create_task(
+            deliver_broker_notifications(application, settings.BROKER_NOTIFY_INTERVAL_SECONDS)
+        )
+        
         logger.info("✅ Bot is running! Press Ctrl+C to stop.")
         
         # Keep the bot running
@@ -174,6 +181,8 @@ async def start_bot_with_tunnel():
         logger.error(f"Error running bot: {e}", exc_info=True)
     finally:
         logger.info("Stopping bot...")
+        if notifier:
+            notifier.cancel()
         try:
             await application.updater.stop()
             await application.stop()
@@ -14,6 +14,7 @@ CREATE TABLE users (
     language VARCHAR(10) DEFAULT 'en',
     hashed_password VARCHAR(255),
     active BOOLEAN DEFAULT TRUE,
+    token_version INT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     
@@ -111,7 +112,10 @@ CREATE TABLE properties (
     INDEX idx_price_range (price_etb, bedrooms),
     INDEX idx_building_features (is_commercial, has_elevator),
     INDEX idx_penthouse_features (has_private_rooftop, is_two_story_penthouse),
-    INDEX idx_duplex_features (has_private_entrance)
+    INDEX idx_duplex_features (has_private_entrance),
+
+    -- Keyword search (GET /properties/?q=)
+    FULLTEXT INDEX ft_property_text (description, location_site, location_region)
 );
 
 -- Property images table (one-to-many relationship)
@@ -172,6 +176,7 @@ CREATE TABLE cars (
     INDEX idx_model_year (model_year),
     INDEX idx_broker_id (broker_id),
     INDEX idx_created_at (created_at),
+    INDEX idx_updated_at (updated_at),
     
     -- Composite indexes for common queries
     INDEX idx_status_type (status, car_type),
@@ -191,6 +196,44 @@ CREATE TABLE car_images (
     INDEX idx_image_order (image_order)
 );
 
+-- Daily listing activity rollup (read by /admin/analytics/timeseries).
+-- One row per kind/day/site/event; n is incremented in the same transaction as every
+-- submission or status transition. Rebuild with: python backfill_activity_rollups.py
+CREATE TABLE listing_activity_daily (
+    day DATE NOT NULL,
+    kind VARCHAR(16) NOT NULL,
+    location_site VARCHAR(255) NOT NULL DEFAULT '',
+    event VARCHAR(16) NOT NULL,
+    n INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, day, location_site, event)
+);
+
+-- Prices of approved and sold listings per kind/day/site/event, with a count per price,
+-- so the timeseries can report exact medians for any period or site grouping.
+CREATE TABLE listing_activity_prices (
+    day DATE NOT NULL,
+    kind VARCHAR(16) NOT NULL,
+    location_site VARCHAR(255) NOT NULL DEFAULT '',
+    event VARCHAR(16) NOT NULL,
+    price_etb DECIMAL(15,2) NOT NULL,
+    n INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, day, location_site, event, price_etb)
+);
+
+-- Outbox of broker notifications queued by bulk moderation (/admin/*/bulk).
+-- The bot sends unsent rows and stamps sent_at.
+CREATE TABLE broker_notifications (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    broker_id VARCHAR(36) NOT NULL,
+    kind VARCHAR(16) NOT NULL,
+    listing_id VARCHAR(36) NOT NULL,
+    event VARCHAR(16) NOT NULL,
+    reason TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP NULL DEFAULT NULL,
+    INDEX idx_unsent (sent_at, id)
+);
+
 -- Create views for easier querying
 CREATE VIEW active_users AS
 SELECT u.*, GROUP_CONCAT(ur.role) as roles
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Export properties, cars or users as NDJSON or CSV (the CLI twin of GET /admin/export/<kind>).
+
+    python export_listings.py properties --format csv --status approved -o approved.csv
+    python export_listings.py users > users.ndjson
+
+Rows are read through a server-side cursor and written as they arrive, so memory use
+does not grow with the table. CSV exports of listings can be fed back to import_listings.py.
+"""
+
+import argparse
+import sys
+
+from src.domain.models.car_models import CarFilter, CarStatus, CarType
+from src.domain.models.property_models import PropertyFilter, PropertyStatus, PropertyType
+from src.domain.models.user_models import UserRole
+from src.infrastructure.repository.mysql_repo import MySQLRealEstateRepository
+from src.use_cases.listing_export import EXPORT_FORMATS, export_lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export listings or users as NDJSON or CSV.")
+    parser.add_argument("kind", choices=("properties", "cars", "users"))
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--status", help="listing status (default: every status)")
+    parser.add_argument("--type", help="property_type or car_type")
+    parser.add_argument("--site", help="location_site (properties)")
+    parser.add_argument("--min-price", type=float)
+    parser.add_argument("--max-price", type=float)
+    parser.add_argument("--role", choices=[role.value for role in UserRole], help="users with this role")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    # The export only streams rows, so the repository is used directly instead of the use cases
+    repo = MySQLRealEstateRepository()
+    if args.kind == "properties":
+        rows = repo.stream_properties(PropertyFilter(
+            status=PropertyStatus(args.status) if args.status else None,
+            property_type=PropertyType(args.type) if args.type else None,
+            location_site=args.site,
+            min_price=args.min_price,
+            max_price=args.max_price,
+        ))
+    elif args.kind == "cars":
+        rows = repo.stream_cars(
+            CarFilter(car_type=CarType(args.type) if args.type else None, min_price=args.min_price, max_price=args.max_price),
+            CarStatus(args.status) if args.status else None,
+        )
+    else:
+        rows = repo.stream_users(role=UserRole(args.role) if args.role else None)
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        for chunk in export_lines(rows, args.format):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
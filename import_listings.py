@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Import listings from a CSV or NDJSON file (the CLI twin of POST /admin/import/<kind>).
+
+    python import_listings.py partner.csv --kind property
+    python import_listings.py cars.ndjson --kind car --status approved --report report.json
+
+CSV files need a header row. Columns are the PropertyCreate/CarCreate fields; the
+location can be given as location_region/location_city/location_site, and several
+image URLs go in one cell separated by "|". Rows are validated one by one and
+inserted IMPORT_BATCH_SIZE at a time; invalid rows are listed in the report.
+"""
+
+import argparse
+import json
+import sys
+
+from src.infrastructure.repository.mysql_repo import MySQLRealEstateRepository
+from src.use_cases.listing_import import IMPORT_FORMATS
+from src.use_cases.property_use_cases import PropertyUseCases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import listings from CSV or NDJSON.")
+    parser.add_argument("path", help="CSV or NDJSON file")
+    parser.add_argument("--kind", choices=("property", "car"), default="property")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="defaults to the file extension")
+    parser.add_argument("--status", choices=("pending", "approved"), default="pending")
+    parser.add_argument("--report", help="write the full JSON report to this file")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    use_cases = PropertyUseCases(MySQLRealEstateRepository())
+    with open(args.path, encoding="utf-8-sig", newline="") as f:
+        report = use_cases.import_listings(args.kind, f, fmt, args.status)
+
+    print(f"✅ Imported {report['inserted']} of {report['rows']} rows ({report['failed']} failed).")
+    for entry in report["errors"][:20]:
+        print(f"  row {entry['row']}: {'; '.join(entry['errors'])}")
+    if report["failed"] > 20:
+        print(f"  ... and {report['failed'] - 20} more")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
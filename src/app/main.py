@@ -4,7 +4,7 @@ from flask import Flask, jsonify, request, send_file, Response
 from flask_cors import CORS
 
 from src.utils.config import settings
-from src.utils.exceptions import RealEstatePlatformException, NotFoundError
+from src.utils.exceptions import RealEstatePlatformException, NotFoundError, TooManyRequestsError, InvalidOperationError
 from src.app.startup import user_use_cases, property_use_cases
 
 # Import Blueprints
@@ -41,6 +41,10 @@ def create_app():
         status_code = 500
         if isinstance(error, NotFoundError):
             status_code = 404
+        elif isinstance(error, InvalidOperationError):
+            status_code = 409
+        elif isinstance(error, TooManyRequestsError):
+            return jsonify({"detail": error.message}), 429, {"Retry-After": str(error.retry_after)}
         return jsonify({"detail": error.message}), status_code
 
     @app.errorhandler(404)
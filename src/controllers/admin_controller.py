@@ -1,9 +1,17 @@
-from flask import Blueprint, request, jsonify
+import io
+from datetime import datetime, timezone
+from flask import Blueprint, Response, request, jsonify
 from src.app.startup import user_use_cases, property_use_cases
 from src.domain.models.property_models import PropertyCreate, PropertyStatus
-from src.domain.models.car_models import CarCreate, CarStatus
+from src.domain.models.car_models import CarCreate, CarFilter, CarStatus, CarType
 from src.domain.models.user_models import UserRole
 from src.controllers.auth_controller import token_required
+from src.utils.auth_utils import password_pool
+from src.utils.config import settings
+from src.utils.http_cache import get_response_cache_stats
+from src.controllers.property_controller import _property_filter_from_args
+from src.use_cases.listing_import import IMPORT_FORMATS
+from src.use_cases.listing_export import EXPORT_FORMATS, EXPORT_MIMETYPES, export_lines
 
 # Create Blueprint
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -16,11 +24,46 @@ def require_admin(user):
         return False
     return True
 
+BULK_ACTIONS = ("approve", "reject", "mark_sold", "delete")
+
+def parse_bulk_request(data):
+    """Validates a bulk moderation body {"action", "ids", "reason"}; returns (action, ids, reason, error)."""
+    data = data or {}
+    action, ids, reason = data.get("action"), data.get("ids"), data.get("reason")
+    if action not in BULK_ACTIONS:
+        return None, None, None, f"action must be one of {', '.join(BULK_ACTIONS)}"
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, str) and i for i in ids):
+        return None, None, None, "ids must be a non-empty list of ids"
+    if len(ids) > settings.BULK_MODERATION_MAX_IDS:
+        return None, None, None, f"At most {settings.BULK_MODERATION_MAX_IDS} ids per request"
+    if action == "reject" and not reason:
+        return None, None, None, "A reason is required to reject"
+    return action, ids, reason, None
+
+IMPORT_KINDS = {"properties": "property", "cars": "car"}
+
+def import_source():
+    """The uploaded file (multipart "file") or the raw request body, as text lines, plus its format."""
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    fmt = request.args.get("format")
+    if not fmt:
+        name = (upload.filename or "") if upload else ""
+        mimetype = upload.mimetype if upload else request.mimetype
+        fmt = "ndjson" if name.endswith((".ndjson", ".jsonl")) or "json" in (mimetype or "") else "csv"
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""), fmt
+
+def bulk_response(action, outcomes):
+    counts = {"ok": 0, "not_found": 0, "conflict": 0}
+    for outcome in outcomes:
+        counts[outcome["outcome"]] += 1
+    return jsonify({"action": action, "counts": counts, "results": outcomes})
+
 # -------------------------
 # Property Management CRUD
 # -------------------------
 @admin_bp.route('/properties', methods=['GET'])
-@token_required
+@token_required(load_user=False)
 def get_all_properties(current_user):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
@@ -30,7 +73,7 @@ def get_all_properties(current_user):
     return jsonify([p.dict() for p in properties])
 
 @admin_bp.route('/users', methods=['GET'])
-@token_required
+@token_required(load_user=False)
 def list_users(current_user):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
@@ -76,7 +119,7 @@ def delete_user(current_user, uid):
     return jsonify({"detail": "User deleted"})
 
 @admin_bp.route('/properties/<property_id>', methods=['GET'])
-@token_required
+@token_required(load_user=False)
 def get_property_by_id(current_user, property_id):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
@@ -137,7 +180,7 @@ def delete_property_as_admin(current_user, property_id):
 # Approvals & Analytics
 # -------------------------
 @admin_bp.route('/pending', methods=['GET'])
-@token_required
+@token_required(load_user=False)
 def get_pending_properties(current_user):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
@@ -175,24 +218,140 @@ def mark_as_sold(current_user, property_id):
     prop = property_use_cases.mark_property_as_sold(property_id)
     return jsonify(prop.dict())
 
-@admin_bp.route('/analytics', methods=['GET'])
+@admin_bp.route('/properties/bulk', methods=['POST'])
+@token_required
+def bulk_moderate_properties(current_user):
+    if not require_admin(current_user):
+        return jsonify({"detail": "Admin privileges required"}), 403
+
+    action, ids, reason, error = parse_bulk_request(request.get_json(silent=True))
+    if error:
+        return jsonify({"detail": error}), 400
+    return bulk_response(action, property_use_cases.bulk_moderate_properties(action, ids, reason))
+
+@admin_bp.route('/import/<kind>', methods=['POST'])
 @token_required
+def import_listings(current_user, kind):
+    if not require_admin(current_user):
+        return jsonify({"detail": "Admin privileges required"}), 403
+    if kind not in IMPORT_KINDS:
+        return jsonify({"detail": "Import properties or cars"}), 404
+
+    status = request.args.get("status", "pending")
+    if status not in ("pending", "approved"):
+        return jsonify({"detail": "status must be pending or approved"}), 400
+    lines, fmt = import_source()
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"detail": f"format must be one of {', '.join(IMPORT_FORMATS)}"}), 400
+
+    report = property_use_cases.import_listings(IMPORT_KINDS[kind], lines, fmt, status)
+    return jsonify({"kind": IMPORT_KINDS[kind], "format": fmt, "status": status, **report})
+
+@admin_bp.route('/export/<kind>', methods=['GET'])
+@token_required(load_user=False)
+def export_data(current_user, kind):
+    """Streams properties, cars or users as NDJSON or CSV, filtered like the search endpoints."""
+    if not require_admin(current_user):
+        return jsonify({"detail": "Admin privileges required"}), 403
+
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"detail": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    status = request.args.get("status")
+    try:
+        if kind == "properties":
+            filters = _property_filter_from_args(request.args)
+            if status:
+                filters.status = PropertyStatus(status)
+            rows = property_use_cases.export_properties(filters)
+        elif kind == "cars":
+            car_type = request.args.get("car_type")
+            min_price, max_price = request.args.get("min_price"), request.args.get("max_price")
+            filters = CarFilter(
+                car_type=CarType(car_type) if car_type else None,
+                min_price=float(min_price) if min_price else None,
+                max_price=float(max_price) if max_price else None,
+            )
+            rows = property_use_cases.export_cars(filters, CarStatus(status) if status else None)
+        elif kind == "users":
+            role, active = request.args.get("role"), request.args.get("active")
+            rows = user_use_cases.export_users(
+                role=UserRole(role) if role else None,
+                active=active.lower() == "true" if active else None,
+            )
+        else:
+            return jsonify({"detail": "Export properties, cars or users"}), 404
+    except ValueError as e:
+        return jsonify({"detail": str(e)}), 400
+
+    filename = f"{kind}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{fmt}"
+    return Response(
+        export_lines(rows, fmt),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@admin_bp.route('/analytics', methods=['GET'])
+@token_required(load_user=False)
 def get_analytics(current_user):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
     
     return jsonify(property_use_cases.get_analytics_summary())
 
+@admin_bp.route('/analytics/timeseries', methods=['GET'])
+@token_required(load_user=False)
+def get_analytics_timeseries(current_user):
+    if not require_admin(current_user):
+        return jsonify({"detail": "Admin privileges required"}), 403
+
+    kind = request.args.get('kind', 'property')
+    interval = request.args.get('interval', 'day')
+    if kind not in ('property', 'car') or interval not in ('day', 'week'):
+        return jsonify({"detail": "kind must be property or car, interval must be day or week"}), 400
+    try:
+        days = int(request.args.get('days', 30))
+    except ValueError:
+        return jsonify({"detail": "days must be an integer"}), 400
+    if not 1 <= days <= 730:
+        return jsonify({"detail": "days must be between 1 and 730"}), 400
+
+    series = property_use_cases.get_activity_timeseries(
+        kind=kind,
+        interval=interval,
+        days=days,
+        site=request.args.get('site'),
+        by_site=request.args.get('by_site', 'true').lower() == 'true',
+    )
+    return jsonify({"kind": kind, "interval": interval, "days": days, "series": series})
+
+@admin_bp.route('/metrics', methods=['GET'])
+@token_required(load_user=False)
+def get_metrics(current_user):
+    if not require_admin(current_user):
+        return jsonify({"detail": "Admin privileges required"}), 403
+
+    return jsonify({
+        "user_cache": user_use_cases.get_user_cache_stats(),
+        "password_hashing": password_pool.stats(),
+        "query_cache": property_use_cases.get_query_cache_stats(),
+        "search_index": property_use_cases.get_search_index_stats(),
+        "text_index": property_use_cases.get_text_index_stats(),
+        "price_distribution": property_use_cases.get_price_distribution_stats(),
+        "analytics_cache": property_use_cases.get_analytics_cache_stats(),
+        "response_cache": get_response_cache_stats(),
+    })
+
 # -------------------------
 # Car Management
 # -------------------------
 @admin_bp.route('/cars', methods=['GET'])
-@token_required
+@token_required(load_user=False)
 def get_all_cars(current_user):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
     
-    cars = property_use_cases.repo.list_all_cars()
+    cars = property_use_cases.list_all_cars()
     return jsonify([c.dict() for c in cars])
 
 @admin_bp.route('/cars/approve/<car_id>', methods=['POST'])
@@ -201,7 +360,7 @@ def approve_car(current_user, car_id):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
     
-    car = property_use_cases.repo.update_car_status(car_id, CarStatus.APPROVED)
+    car = property_use_cases.update_car_status(car_id, CarStatus.APPROVED)
     return jsonify(car.dict())
 
 @admin_bp.route('/cars/reject/<car_id>', methods=['POST'])
@@ -210,7 +369,7 @@ def reject_car(current_user, car_id):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
     
-    car = property_use_cases.repo.update_car_status(car_id, CarStatus.REJECTED)
+    car = property_use_cases.update_car_status(car_id, CarStatus.REJECTED)
     return jsonify(car.dict())
 
 @admin_bp.route('/cars/mark-sold/<car_id>', methods=['POST'])
@@ -219,9 +378,20 @@ def mark_car_sold(current_user, car_id):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
     
-    car = property_use_cases.repo.update_car_status(car_id, CarStatus.SOLD)
+    car = property_use_cases.update_car_status(car_id, CarStatus.SOLD)
     return jsonify(car.dict())
 
+@admin_bp.route('/cars/bulk', methods=['POST'])
+@token_required
+def bulk_moderate_cars(current_user):
+    if not require_admin(current_user):
+        return jsonify({"detail": "Admin privileges required"}), 403
+
+    action, ids, reason, error = parse_bulk_request(request.get_json(silent=True))
+    if error:
+        return jsonify({"detail": error}), 400
+    return bulk_response(action, property_use_cases.bulk_moderate_cars(action, ids, reason))
+
 @admin_bp.route('/cars', methods=['POST'])
 @token_required
 def create_car_as_admin(current_user):
@@ -242,5 +412,5 @@ def delete_car_as_admin(current_user, car_id):
     if not require_admin(current_user):
         return jsonify({"detail": "Admin privileges required"}), 403
     
-    property_use_cases.repo.delete_car(car_id)
+    property_use_cases.delete_car(car_id)
     return jsonify({"detail": "Car deleted successfully"})
\ No newline at end of file
@@ -2,9 +2,11 @@ from flask import Blueprint, request, jsonify
 from functools import wraps
 from jose import jwt, JWTError
 from src.app.startup import user_use_cases
-from src.domain.models.user_models import UserCreate, UserRole
-from src.utils.auth_utils import create_access_token
+from src.domain.models.user_models import UserCreate, UserRole, TokenUser
+from src.utils.auth_utils import create_user_access_token
+from src.utils.exceptions import UserNotFoundError, TooManyRequestsError
 from src.utils.config import settings
+from src.utils.rate_limit import rate_limit
 from pydantic import BaseModel
 from typing import Optional
 
@@ -13,7 +15,19 @@ auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 # -------------------------
 # Decorators & Helpers
 # -------------------------
-def token_required(f):
+def token_required(f=None, *, load_user: bool = True):
+    """
+    Authenticates the bearer token and passes the caller as the first argument.
+
+    With load_user=False the caller is a TokenUser built from the token claims alone
+    (uid, roles, active flag), which is enough for read-only endpoints that only check
+    roles. Otherwise the full User is loaded (from the user cache when possible).
+    Tokens whose version is older than the user's current one are rejected; the version
+    check reads through is_token_current, never the (possibly stale) cached user.
+    """
+    if f is None:
+        return lambda func: token_required(func, load_user=load_user)
+
     @wraps(f)
     def decorated(*args, **kwargs):
         token = None
@@ -32,14 +46,32 @@ def token_required(f):
             uid = payload.get("sub")
             if uid is None:
                  return jsonify({'detail': 'Invalid token payload'}), 401
-            
-            # Fetch user synchronously
-            current_user = user_use_cases.get_user_by_id(uid)
-            if not current_user:
-                return jsonify({'detail': 'User not found'}), 401
+
+            token_version = payload.get("ver", 0)
+            if not user_use_cases.is_token_current(uid, token_version):
+                return jsonify({'detail': 'Token has been revoked'}), 401
+            if payload.get("active") is False:
+                return jsonify({'detail': 'Account is disabled'}), 403
+
+            if not load_user and "roles" in payload:
+                current_user = TokenUser(
+                    uid=uid,
+                    roles=payload["roles"],
+                    active=payload.get("active", True),
+                    token_version=token_version
+                )
+            else:
+                # Fetch user synchronously
+                current_user = user_use_cases.get_user_by_id(uid)
+                if not current_user:
+                    return jsonify({'detail': 'User not found'}), 401
+                if not current_user.active:
+                    return jsonify({'detail': 'Account is disabled'}), 403
                 
         except JWTError:
             return jsonify({'detail': 'Token is invalid'}), 401
+        except UserNotFoundError:
+            return jsonify({'detail': 'User not found'}), 401
         except Exception as e:
             return jsonify({'detail': f'Authentication error: {str(e)}'}), 500
 
@@ -73,6 +105,7 @@ class ChangePasswordRequest(BaseModel):
 # Routes
 # -------------------------
 @auth_bp.route('/signup', methods=['POST'])
+@rate_limit(capacity=5, per_seconds=600)
 def signup():
     data = request.get_json()
     try:
@@ -96,6 +129,7 @@ def signup():
     return jsonify({"detail": "User created successfully", "user_id": new_user.uid})
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit(capacity=10, per_seconds=60)
 def login():
     data = request.get_json()
     # Handle form-data logic if needed, but JSON is standard here
@@ -107,8 +141,10 @@ def login():
     user = user_use_cases.authenticate_user(req.phone_number, req.password)
     if not user:
         return jsonify({"detail": "Incorrect phone number or password"}), 401
+    if not user.active:
+        return jsonify({"detail": "Account is disabled"}), 403
         
-    access_token = create_access_token(data={"sub": user.uid})
+    access_token = create_user_access_token(user)
     return jsonify({"access_token": access_token, "token_type": "bearer"})
 
 @auth_bp.route('/me', methods=['GET'])
@@ -129,6 +165,7 @@ def update_profile_endpoint(current_user):
     return jsonify(user.dict())
 
 @auth_bp.route('/users/change-password', methods=['POST'])
+@rate_limit(capacity=5, per_seconds=600, scope="user")
 @token_required
 def change_password_endpoint(current_user):
     data = request.get_json()
@@ -138,7 +175,10 @@ def change_password_endpoint(current_user):
         return jsonify({"detail": str(e)}), 400
         
     try:
-        user_use_cases.change_password(current_user.uid, req.current_password, req.new_password)
-        return jsonify({"detail": "Password changed"})
+        user = user_use_cases.change_password(current_user.uid, req.current_password, req.new_password)
+        # Older tokens are revoked by the change, so hand back a fresh one
+        return jsonify({"detail": "Password changed", "access_token": create_user_access_token(user), "token_type": "bearer"})
+    except TooManyRequestsError:
+        raise
     except Exception as e:
         return jsonify({"detail": str(e)}), 400
\ No newline at end of file
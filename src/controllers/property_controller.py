@@ -4,20 +4,35 @@ from src.domain.models.property_models import PropertyCreate, PropertyFilter, Pr
 from src.domain.models.car_models import CarCreate, CarFilter, CarType
 from src.domain.models.user_models import UserRole
 from src.controllers.auth_controller import token_required
+from src.utils.rate_limit import rate_limit
+from src.utils.http_cache import conditional_get
+from src.utils.config import settings
+from src.use_cases.listing_fields import parse_fields, project
+from src.infrastructure.search.text_index import search_terms
 import uuid
 
 # Define Blueprints
 property_bp = Blueprint('properties', __name__, url_prefix='/properties')
 car_bp = Blueprint('cars', __name__, url_prefix='/cars')
 
+def _ids_from_args(args):
+    """
+    Listing ids from `?ids=a,b,c` (or repeated `ids=`), in order without duplicates.
+    Returns (ids, error message).
+    """
+    ids = [i.strip() for value in args.getlist('ids') for i in value.split(',') if i.strip()]
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return None, "ids must name at least one listing"
+    if len(ids) > settings.LISTING_BATCH_MAX_IDS:
+        return None, f"At most {settings.LISTING_BATCH_MAX_IDS} ids per request"
+    return ids, None
+
 # -------------------------
 # Property Endpoints
 # -------------------------
-@property_bp.route('/', methods=['GET'])
-def find_properties_endpoint():
-    # Extract query params
-    args = request.args
-    
+def _property_filter_from_args(args) -> PropertyFilter:
+    """Builds a PropertyFilter from search query params."""
     # Helper to convert "true"/"false" strings to bool
     def get_bool(key):
         val = args.get(key)
@@ -33,37 +48,83 @@ def find_properties_endpoint():
     
     # Enum handling: simple string pass-through, pydantic validates later or we map here
     # PropertyFilter likely expects Enums or compatible strings if configured
+    property_type_val = args.get('property_type')
+    condo_scheme_val = args.get('condominium_scheme')
     
+    return PropertyFilter(
+        property_type=PropertyType(property_type_val) if property_type_val else None,
+        min_bedrooms=get_val('min_bedrooms', int),
+        max_bedrooms=get_val('max_bedrooms', int),
+        min_price=get_val('min_price', float),
+        max_price=get_val('max_price', float),
+        min_size_sqm=get_val('min_size_sqm', float),
+        max_size_sqm=get_val('max_size_sqm', float),
+        condominium_scheme=CondoScheme(condo_scheme_val) if condo_scheme_val else None,
+        location_region=args.get('location_region'),
+        location_site=args.get('location_site'),
+        min_floor_level=get_val('min_floor_level', int),
+        furnishing_status=args.get('furnishing_status'),
+        filter_is_commercial=get_bool('filter_is_commercial'),
+        filter_has_elevator=get_bool('filter_has_elevator'),
+        filter_has_private_rooftop=get_bool('filter_has_private_rooftop'),
+        filter_is_two_story_penthouse=get_bool('filter_is_two_story_penthouse'),
+        filter_has_private_entrance=get_bool('filter_has_private_entrance'),
+        # A query without any word (e.g. "!!!") is no keyword filter, whichever backend answers it
+        q=(args.get('q') or '').strip() if search_terms(args.get('q') or '') else None
+    )
+
+@property_bp.route('/', methods=['GET'])
+@conditional_get(property_use_cases.listing_version, "property")
+def find_properties_endpoint():
+    """
+    Searches approved properties, or fetches the ones named by `ids`. `fields=` picks the
+    shape: "summary" (the default for searches), "full" (the default for `ids`) or a
+    comma-separated list of field names.
+    """
+    if 'ids' in request.args:
+        # Several listings by id (favorites, compare, shared links); unknown ids are left out
+        ids, error = _ids_from_args(request.args)
+        if error:
+            return jsonify({"detail": error}), 400
+        try:
+            fields = parse_fields(request.args.get('fields'), "property", default="full")
+        except ValueError as e:
+            return jsonify({"detail": str(e)}), 400
+        properties = property_use_cases.get_properties_by_ids(ids)
+        if fields:
+            return jsonify([project(p, fields, "property") for p in properties])
+        return jsonify([p.dict() for p in properties])
     try:
-        property_type_val = args.get('property_type')
-        condo_scheme_val = args.get('condominium_scheme')
-        
-        filters = PropertyFilter(
-            property_type=PropertyType(property_type_val) if property_type_val else None,
-            min_bedrooms=get_val('min_bedrooms', int),
-            max_bedrooms=get_val('max_bedrooms', int),
-            min_price=get_val('min_price', float),
-            max_price=get_val('max_price', float),
-            min_size_sqm=get_val('min_size_sqm', float),
-            max_size_sqm=get_val('max_size_sqm', float),
-            condominium_scheme=CondoScheme(condo_scheme_val) if condo_scheme_val else None,
-            location_region=args.get('location_region'),
-            location_site=args.get('location_site'),
-            min_floor_level=get_val('min_floor_level', int),
-            furnishing_status=args.get('furnishing_status'),
-            filter_is_commercial=get_bool('filter_is_commercial'),
-            filter_has_elevator=get_bool('filter_has_elevator'),
-            filter_has_private_rooftop=get_bool('filter_has_private_rooftop'),
-            filter_is_two_story_penthouse=get_bool('filter_is_two_story_penthouse'),
-            filter_has_private_entrance=get_bool('filter_has_private_entrance')
-        )
+        filters = _property_filter_from_args(request.args)
+        fields = parse_fields(request.args.get('fields'), "property")
+        if fields:
+            return jsonify(property_use_cases.find_property_fields(filters, fields))
         properties = property_use_cases.find_properties(filters)
         return jsonify([p.dict() for p in properties])
     except Exception as e:
         return jsonify({"detail": str(e)}), 400
 
+@property_bp.route('/facets', methods=['GET'])
+def property_facets_endpoint():
+    """Listing counts per type, site, scheme, furnishing, bedrooms and price bucket for the given filters."""
+    try:
+        filters = _property_filter_from_args(request.args)
+    except Exception as e:
+        return jsonify({"detail": str(e)}), 400
+    return jsonify(property_use_cases.get_property_facets(filters))
+
+@property_bp.route('/price-buckets', methods=['GET'])
+def property_price_buckets_endpoint():
+    """Price ranges cut at quantiles of approved listings, optionally for one property type."""
+    property_type_val = request.args.get('property_type')
+    try:
+        property_type = PropertyType(property_type_val) if property_type_val else None
+    except ValueError as e:
+        return jsonify({"detail": str(e)}), 400
+    return jsonify(property_use_cases.get_price_buckets(property_type))
+
 @property_bp.route('/me', methods=['GET'])
-@token_required
+@token_required(load_user=False)
 def get_my_properties(current_user):
     if UserRole.BROKER not in current_user.roles:
         return jsonify({"detail": "Only brokers can view their listings"}), 403
@@ -72,6 +133,7 @@ def get_my_properties(current_user):
     return jsonify([p.dict() for p in props])
 
 @property_bp.route('/', methods=['POST'])
+@rate_limit(capacity=20, per_seconds=3600, scope="user")
 @token_required
 def submit_property_endpoint(current_user):
     if UserRole.BROKER not in current_user.roles:
@@ -92,6 +154,7 @@ def submit_property_endpoint(current_user):
         return jsonify({"detail": str(e)}), 400
 
 @property_bp.route('/<property_id>', methods=['GET'])
+@conditional_get(property_use_cases.listing_version, "property")
 def get_property_by_id_endpoint(property_id):
     try:
         prop = property_use_cases.get_property_details(property_id)
@@ -100,6 +163,7 @@ def get_property_by_id_endpoint(property_id):
         return jsonify({"detail": str(e)}), 404
 
 @property_bp.route('/upload-images', methods=['POST'])
+@rate_limit(capacity=30, per_seconds=600, scope="user")
 @token_required
 def upload_images(current_user):
     if 'images' not in request.files:
@@ -132,6 +196,7 @@ def upload_images(current_user):
     return jsonify({"urls": uploaded_urls})
 
 @property_bp.route('/convert-telegram-images', methods=['POST'])
+@rate_limit(capacity=30, per_seconds=600, scope="user")
 @token_required
 def convert_telegram_images(current_user):
     data = request.get_json()
@@ -151,8 +216,21 @@ def convert_telegram_images(current_user):
 # Car Endpoints
 # -------------------------
 @car_bp.route('/', methods=['GET'])
+@conditional_get(property_use_cases.listing_version, "car")
 def find_cars_endpoint():
     args = request.args
+    if 'ids' in args:
+        ids, error = _ids_from_args(args)
+        if error:
+            return jsonify({"detail": error}), 400
+        try:
+            fields = parse_fields(args.get('fields'), "car", default="full")
+        except ValueError as e:
+            return jsonify({"detail": str(e)}), 400
+        cars = property_use_cases.get_cars_by_ids(ids)
+        if fields:
+            return jsonify([project(c, fields, "car") for c in cars])
+        return jsonify([c.dict() for c in cars])
     
     def get_val(key, type_func):
         val = args.get(key)
@@ -167,13 +245,16 @@ def find_cars_endpoint():
             min_price=get_val('min_price', float),
             max_price=get_val('max_price', float)
         )
+        fields = parse_fields(args.get('fields'), "car")
+        if fields:
+            return jsonify(property_use_cases.find_car_fields(filters, fields))
         cars = property_use_cases.find_cars(filters)
         return jsonify([c.dict() for c in cars])
     except Exception as e:
          return jsonify({"detail": str(e)}), 400
 
 @car_bp.route('/me', methods=['GET'])
-@token_required
+@token_required(load_user=False)
 def get_my_cars(current_user):
     if UserRole.BROKER not in current_user.roles:
         return jsonify({"detail": "Only brokers can view their car listings"}), 403
@@ -182,6 +263,7 @@ def get_my_cars(current_user):
     return jsonify([c.dict() for c in cars])
 
 @car_bp.route('/', methods=['POST'])
+@rate_limit(capacity=20, per_seconds=3600, scope="user")
 @token_required
 def submit_car_endpoint(current_user):
     if UserRole.BROKER not in current_user.roles:
@@ -200,6 +282,7 @@ def submit_car_endpoint(current_user):
         return jsonify({"detail": str(e)}), 400
 
 @car_bp.route('/<car_id>', methods=['GET'])
+@conditional_get(property_use_cases.listing_version, "car")
 def get_car_by_id_endpoint(car_id):
     try:
         car = property_use_cases.get_car_details(car_id)
@@ -208,6 +291,7 @@ def get_car_by_id_endpoint(car_id):
         return jsonify({"detail": str(e)}), 404
 
 @car_bp.route('/upload-images', methods=['POST'])
+@rate_limit(capacity=30, per_seconds=600, scope="user")
 @token_required
 def upload_car_images(current_user):
     if 'images' not in request.files:
@@ -79,3 +79,4 @@ class PropertyFilter(BaseModel):
     filter_has_private_rooftop: Optional[bool] = None
     filter_is_two_story_penthouse: Optional[bool] = None
     filter_has_private_entrance: Optional[bool] = None
+    q: Optional[str] = None  # Keywords matched against description, region and site
@@ -19,7 +19,17 @@ class UserInDB(UserBase):
     created_at: datetime
     updated_at: datetime
     hashed_password: Optional[str] = None
+    active: bool = True
+    # Bumped whenever roles, active flag or password change; older tokens stop being accepted
+    token_version: int = 0
 
 class User(UserInDB):
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TokenUser(BaseModel):
+    """The identity carried in an access token, used when an endpoint needs no more than that."""
+    uid: str
+    roles: List[UserRole] = Field(default_factory=list)
+    active: bool = True
+    token_version: int = 0
\ No newline at end of file
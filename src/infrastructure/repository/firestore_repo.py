@@ -1,14 +1,18 @@
 import uuid
-from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from google.cloud import firestore
-from google.api_core.exceptions import GoogleAPICallError
+from google.api_core.exceptions import FailedPrecondition, GoogleAPICallError
 from src.domain.models.user_models import User, UserCreate, UserInDB, UserRole
 from google.cloud.firestore_v1.base_query import FieldFilter
 from src.domain.models.property_models import Property, PropertyCreate, PropertyInDB, PropertyFilter, PropertyStatus
 from src.utils.config import settings
+from src.utils.constants import BROKER_NOTIFIED_EVENTS
 from src.domain.models.car_models import Car, CarCreate, CarInDB, CarFilter, CarStatus
-from src.utils.exceptions import DatabaseError, UserNotFoundError, PropertyNotFoundError
+from src.utils.exceptions import DatabaseError, UserNotFoundError, PropertyNotFoundError, InvalidOperationError
+from src.infrastructure.search.text_index import InvertedIndex, property_text
+from src.infrastructure.search.facets import count_facets
+from src.infrastructure.search.filters import matches_filter
 from src.utils.auth_utils import hash_password ,verify_password, create_access_token
 
 
@@ -18,6 +22,9 @@ class RealEstateRepository:
         self.users_collection = self.db.collection('users')
         self.properties_collection = self.db.collection('properties')
         self.cars_collection = self.db.collection('cars')
+        self.activity_collection = self.db.collection('listing_activity_daily')
+        self.activity_prices_collection = self.db.collection('listing_activity_prices')
+        self.notifications_collection = self.db.collection('broker_notifications')
 
     # --- User Methods (Unchanged) ---
     async def get_user_by_telegram_id(self, telegram_id: int) -> Optional[User]:
@@ -39,6 +46,21 @@ class RealEstateRepository:
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while getting user by ID: {e}")
         
+    async def get_users_by_ids(self, uids: List[str]) -> Dict[str, User]:
+        """Loads several users in one batched read. Unknown ids are simply absent from the result."""
+        unique_ids = list(dict.fromkeys(uid for uid in uids if uid))
+        if not unique_ids:
+            return {}
+        try:
+            refs = [self.users_collection.document(uid) for uid in unique_ids]
+            users = {}
+            async for doc in self.db.get_all(refs):
+                if doc.exists:
+                    users[doc.id] = User(**doc.to_dict())
+            return users
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while getting users by IDs: {e}")
+
     async def get_user_by_phone_number(self, phone_number: str) -> Optional[User]:
         """Finds a user by their phone number."""
         try:
@@ -59,7 +81,7 @@ class RealEstateRepository:
                 **user_data.model_dump(exclude={"password"})
             }
             if user_data.password:
-                user_in_db_dict["hashed_password"] = hash_password(user_data.password)
+                user_in_db_dict["hashed_password"] = hash_password(user_data.password, label="create_user")
             user_in_db = UserInDB(**user_in_db_dict)
             try:
                 await self.users_collection.document(uid).set(user_in_db.model_dump())
@@ -124,6 +146,17 @@ class RealEstateRepository:
     async def set_user_active(self, uid: str, active: bool) -> User:
         return await self.update_user(uid, {"active": active})
 
+    async def bump_token_version(self, uid: str) -> User:
+        """Invalidates every access token issued to the user so far."""
+        return await self.update_user(uid, {"token_version": firestore.Increment(1)})
+
+    async def get_token_version(self, uid: str) -> Optional[int]:
+        try:
+            doc = await self.users_collection.document(uid).get()
+            return doc.to_dict().get('token_version', 0) if doc.exists else None
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while reading token version: {e}")
+
     async def delete_user(self, uid: str) -> None:
         try:
             await self.users_collection.document(uid).delete()
@@ -141,7 +174,10 @@ class RealEstateRepository:
             **property_data.model_dump()
         )
         try:
-            await self.properties_collection.document(pid).set(prop_in_db.model_dump())
+            batch = self.db.batch()
+            batch.set(self.properties_collection.document(pid), prop_in_db.model_dump())
+            self._count_activity(batch, 'property', 'submitted', property_data.location.site, prop_in_db.price_etb, now)
+            await batch.commit()
             return Property(**prop_in_db.model_dump())
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while creating property: {e}")
@@ -158,31 +194,97 @@ class RealEstateRepository:
     async def update_property(self, pid: str, updates: Dict[str, Any]) -> Property:
         doc_ref = self.properties_collection.document(pid)
         try:
-            if not (await doc_ref.get()).exists:
+            snapshot = await doc_ref.get()
+            if not snapshot.exists:
                 raise PropertyNotFoundError(identifier=pid)
             
             updates['updated_at'] = datetime.now(timezone.utc)
-            await doc_ref.update(updates)
+            batch = self.db.batch()
+            batch.update(doc_ref, updates)
+            data = snapshot.to_dict()
+            status = getattr(updates.get('status'), 'value', updates.get('status'))
+            if status is not None and status != data.get('status'):
+                site = (updates.get('location') or data.get('location') or {}).get('site')
+                self._count_activity(batch, 'property', status, site, updates.get('price_etb', data['price_etb']), updates['updated_at'])
+            await batch.commit()
             updated_doc = await doc_ref.get()
             return Property(**updated_doc.to_dict())
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while updating property: {e}")
 
-    async def get_properties_by_status(self, status: PropertyStatus) -> List[Property]:
+    async def _transition_status(self, doc_ref, kind: str, allowed: Optional[List[str]], changes: Dict[str, Any]) -> dict:
+        """
+        Applies `changes` only if the document's status is in `allowed` (None: any) and the
+        document is unchanged since it was read (a last-update-time precondition), and
+        counts the transition in the activity rollup in the same batch.
+        """
+        snapshot = await doc_ref.get()
+        if not snapshot.exists:
+            raise PropertyNotFoundError(identifier=doc_ref.id)
+        data = snapshot.to_dict()
+        if allowed is not None and data.get('status') not in allowed:
+            raise InvalidOperationError(
+                f"Cannot change {kind} status to '{changes['status']}'. Current status is '{data.get('status')}'."
+            )
+        batch = self.db.batch()
+        batch.update(doc_ref, changes, option=self.db.write_option(last_update_time=snapshot.update_time))
+        if changes['status'] != data.get('status'):
+            site = (data.get('location') or {}).get('site') if kind == 'property' else None
+            self._count_activity(batch, kind, changes['status'], site, changes.get('price_etb', data['price_etb']), changes['updated_at'])
+        try:
+            await batch.commit()
+        except FailedPrecondition:
+            raise InvalidOperationError(f"Cannot change {kind} status to '{changes['status']}'. It was changed by someone else.")
+        return {**data, **changes}
+
+    async def transition_property_status(self, pid: str, from_statuses: List[PropertyStatus], to_status: PropertyStatus,
+                                         updates: Optional[Dict[str, Any]] = None) -> Property:
+        changes = {'status': to_status.value, **(updates or {}), 'updated_at': datetime.now(timezone.utc)}
         try:
-            docs = self.properties_collection.where('status', '==', status.value).stream()
+            data = await self._transition_status(
+                self.properties_collection.document(pid), 'property', [s.value for s in from_statuses], changes
+            )
+            return Property(**data)
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while changing property status: {e}")
+
+    async def get_properties_by_status(self, status: PropertyStatus, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
+        try:
+            query = self.properties_collection.where('status', '==', status.value)
+            if limit is not None:
+                query = query.offset(offset).limit(limit)
+            docs = query.stream()
             return [Property(**doc.to_dict()) async for doc in docs]
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while getting properties by status: {e}")
 
-    async def get_properties_by_broker_id(self, broker_id: str) -> List[Property]:
+    async def get_properties_by_broker_id(self, broker_id: str, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
         try:
-            docs = self.properties_collection.where('broker_id', '==', broker_id).stream()
+            query = self.properties_collection.where('broker_id', '==', broker_id)
+            if limit is not None:
+                query = query.offset(offset).limit(limit)
+            docs = query.stream()
             return [Property(**doc.to_dict()) async for doc in docs]
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while getting properties by broker ID: {e}")
 
-    async def query_properties(self, filters: PropertyFilter) -> List[Property]:
+    async def get_properties_updated_since(self, since: datetime) -> List[Property]:
+        """Properties of any status changed at or after `since`, for syncing in-memory indexes."""
+        try:
+            docs = self.properties_collection.where(filter=FieldFilter('updated_at', '>=', since)).stream()
+            return [Property(**doc.to_dict()) async for doc in docs]
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while getting updated properties: {e}")
+
+    async def get_property_facets(self, filters: PropertyFilter, price_bounds: List[float]) -> Dict[str, Any]:
+        """Firestore has no grouped counts; the matching listings are counted in Python."""
+        return count_facets(await self.query_properties(filters), price_bounds)
+
+    def supports_fulltext(self) -> bool:
+        """Firestore has no full-text index; keyword search is matched in Python."""
+        return False
+
+    async def query_properties(self, filters: PropertyFilter, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
         # --- UPDATED ---
         try:
             status_to_query = filters.status.value if filters.status else PropertyStatus.APPROVED.value
@@ -223,12 +325,20 @@ class RealEstateRepository:
 
             # --- POST-QUERY FILTERING IN PYTHON (Unchanged) ---
             if filters.min_floor_level is not None:
-                final_results = [
+                all_results = [
                     prop for prop in all_results 
                     if prop.floor_level is not None and prop.floor_level >= filters.min_floor_level
                 ]
-                return final_results
-
+            if filters.q:
+                text_index = InvertedIndex()
+                for prop in all_results:
+                    text_index.add(prop.pid, property_text(prop))
+                matching = text_index.search(filters.q)
+                all_results = [prop for prop in all_results if prop.pid in matching]
+
+            # Paging happens after the floor filter, which Firestore can't express
+            if limit is not None:
+                return all_results[offset:offset + limit]
             return all_results
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while querying properties: {e}")
@@ -245,31 +355,39 @@ class RealEstateRepository:
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while deleting property: {e}")
 
-    async def count_properties_by_status(self) -> dict[PropertyStatus, int]:
-        """Counts all properties grouped by their status using efficient aggregation."""
-        counts = {status: 0 for status in PropertyStatus}
+    async def _price_groups(self, collection, fields: List[str]) -> List[Dict[str, Any]]:
+        """Streams only the grouping fields of every document once and counts each combination."""
+        counts: Dict[tuple, int] = {}
+        async for doc in collection.select([*fields, 'price_etb']).stream():
+            data = doc.to_dict()
+            values = []
+            for field in fields:
+                value = data
+                for part in field.split('.'):
+                    value = value.get(part) if isinstance(value, dict) else None
+                values.append(value)
+            key = (*values, data.get('price_etb'))
+            counts[key] = counts.get(key, 0) + 1
+        names = [field.split('.')[-1] for field in fields]
+        return [
+            {**dict(zip(names, key[:-1])), 'price_etb': key[-1], 'n': n}
+            for key, n in counts.items()
+        ]
+
+    async def get_property_price_groups(self) -> List[Dict[str, Any]]:
         try:
-            for status in PropertyStatus:
-                query = self.properties_collection.where('status', '==', status.value)
-                count_query = query.count()
-                query_result = await count_query.get()
-                counts[status] = query_result[0][0].value
-            return counts
+            rows = await self._price_groups(self.properties_collection, ['status', 'property_type', 'location.site'])
+            for row in rows:
+                row['location_site'] = row.pop('site')
+            return rows
         except GoogleAPICallError as e:
-            raise DatabaseError(f"Firestore error while counting properties: {e}")
+            raise DatabaseError(f"Firestore error while grouping properties: {e}")
 
-    async def count_cars_by_status(self) -> dict[CarStatus, int]:
-        """Counts all cars grouped by their status using efficient aggregation."""
-        counts = {status: 0 for status in CarStatus}
+    async def get_car_price_groups(self) -> List[Dict[str, Any]]:
         try:
-            for status in CarStatus:
-                query = self.cars_collection.where('status', '==', status.value)
-                count_query = query.count()
-                query_result = await count_query.get()
-                counts[status] = query_result[0][0].value
-            return counts
+            return await self._price_groups(self.cars_collection, ['status', 'car_type'])
         except GoogleAPICallError as e:
-            raise DatabaseError(f"Firestore error while counting cars: {e}")
+            raise DatabaseError(f"Firestore error while grouping cars: {e}")
 
     # --- Car Methods ---
     async def create_car(self, car_data: CarCreate) -> Car:
@@ -282,7 +400,10 @@ class RealEstateRepository:
             **car_data.model_dump()
         )
         try:
-            await self.cars_collection.document(cid).set(car_in_db.model_dump())
+            batch = self.db.batch()
+            batch.set(self.cars_collection.document(cid), car_in_db.model_dump())
+            self._count_activity(batch, 'car', 'submitted', None, car_in_db.price_etb, now)
+            await batch.commit()
             return Car(**car_in_db.model_dump())
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while creating car: {e}")
@@ -330,17 +451,12 @@ class RealEstateRepository:
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while deleting car: {e}")
 
-    async def update_car_status(self, cid: str, status: CarStatus) -> Car:
-        doc_ref = self.cars_collection.document(cid)
+    async def update_car_status(self, cid: str, status: CarStatus, from_statuses: Optional[List[CarStatus]] = None) -> Car:
+        changes = {'status': status.value, 'updated_at': datetime.now(timezone.utc)}
+        allowed = [s.value for s in from_statuses] if from_statuses is not None else None
         try:
-            if not (await doc_ref.get()).exists:
-                raise PropertyNotFoundError(identifier=cid)
-            await doc_ref.update({
-                'status': status.value,
-                'updated_at': datetime.now(timezone.utc)
-            })
-            updated_doc = await doc_ref.get()
-            return Car(**updated_doc.to_dict())
+            data = await self._transition_status(self.cars_collection.document(cid), 'car', allowed, changes)
+            return Car(**data)
         except GoogleAPICallError as e:
             raise DatabaseError(f"Firestore error while updating car status: {e}")
 
@@ -350,4 +466,336 @@ class RealEstateRepository:
             docs_stream = self.cars_collection.stream()
             return [Car(**doc.to_dict()) async for doc in docs_stream]
         except GoogleAPICallError as e:
-            raise DatabaseError(f"Firestore error while listing cars: {e}")
\ No newline at end of file
+            raise DatabaseError(f"Firestore error while listing cars: {e}")
+
+    # --- Bulk Import & Moderation ---
+    async def _insert_listings(self, collection, kind: str, docs: Dict[str, dict]) -> None:
+        """
+        Writes new listing documents in batches, each with its activity rollup counts. A batch
+        holds at most 500 writes; 100 listings need at most 400 (document, count, price).
+        """
+        ids = list(docs)
+        for start in range(0, len(ids), 100):
+            batch = self.db.batch()
+            for doc_id in ids[start:start + 100]:
+                data = docs[doc_id]
+                batch.set(collection.document(doc_id), data)
+                site = (data.get('location') or {}).get('site') if kind == 'property' else None
+                self._count_activity(batch, kind, 'submitted', site, data['price_etb'], data['created_at'])
+                if data['status'] == 'approved':
+                    self._count_activity(batch, kind, 'approved', site, data['price_etb'], data['created_at'])
+            await batch.commit()
+
+    async def create_properties(self, items: List[PropertyCreate], status: PropertyStatus = PropertyStatus.PENDING) -> List[Property]:
+        if not items:
+            return []
+        now = datetime.now(timezone.utc)
+        docs = {}
+        for item in items:
+            pid = str(uuid.uuid4())
+            docs[pid] = PropertyInDB(pid=pid, status=status, created_at=now, updated_at=now, **item.model_dump()).model_dump()
+        try:
+            await self._insert_listings(self.properties_collection, 'property', docs)
+            return [Property(**data) for data in docs.values()]
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while creating properties: {e}")
+
+    async def create_cars(self, items: List[CarCreate], status: CarStatus = CarStatus.PENDING) -> List[Car]:
+        if not items:
+            return []
+        now = datetime.now(timezone.utc)
+        docs = {}
+        for item in items:
+            cid = str(uuid.uuid4())
+            docs[cid] = CarInDB(cid=cid, created_at=now, updated_at=now, **{**item.model_dump(), 'status': status}).model_dump()
+        try:
+            await self._insert_listings(self.cars_collection, 'car', docs)
+            return [Car(**data) for data in docs.values()]
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while creating cars: {e}")
+
+    async def _bulk_transition(self, collection, kind: str, ids: List[str], from_statuses: List[str],
+                               changes: Dict[str, Any], reason: Optional[str]) -> Tuple[List[dict], Dict[str, str]]:
+        """
+        Applies `changes` to every listing in `ids` whose status is in `from_statuses`, together with
+        their broker notifications, in one batch guarded by last-update-time preconditions.
+        """
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        async for snapshot in self.db.get_all([collection.document(i) for i in ids]):
+            if snapshot.exists:
+                found[snapshot.id] = snapshot
+        statuses = {i: snapshot.to_dict().get('status') for i, snapshot in found.items()}
+        moved = [i for i in ids if statuses.get(i) in from_statuses]
+        if not moved:
+            return [], statuses
+
+        changed = [{**found[i].to_dict(), **changes} for i in moved]
+        batch = self.db.batch()
+        for i, data in zip(moved, changed):
+            batch.update(found[i].reference, changes, option=self.db.write_option(last_update_time=found[i].update_time))
+            if changes['status'] in BROKER_NOTIFIED_EVENTS and data.get('broker_id'):
+                batch.set(self.notifications_collection.document(), {
+                    'broker_id': data['broker_id'], 'kind': kind, 'listing_id': i, 'event': changes['status'],
+                    'reason': reason, 'created_at': changes['updated_at'], 'sent_at': None,
+                })
+            site = (data.get('location') or {}).get('site') if kind == 'property' else None
+            self._count_activity(batch, kind, changes['status'], site, data['price_etb'], changes['updated_at'])
+        try:
+            await batch.commit()
+        except FailedPrecondition:
+            raise InvalidOperationError(f"Some of these {kind} listings were changed by someone else. Nothing was changed.")
+        return changed, statuses
+
+    async def bulk_transition_properties(self, pids: List[str], from_statuses: List[PropertyStatus], to_status: PropertyStatus,
+                                         updates: Optional[Dict[str, Any]] = None,
+                                         reason: Optional[str] = None) -> Tuple[List[Property], Dict[str, str]]:
+        changes = {'status': to_status.value, **(updates or {}), 'updated_at': datetime.now(timezone.utc)}
+        try:
+            changed, statuses = await self._bulk_transition(
+                self.properties_collection, 'property', pids, [s.value for s in from_statuses], changes, reason
+            )
+            return [Property(**data) for data in changed], statuses
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while changing property statuses: {e}")
+
+    async def bulk_transition_cars(self, cids: List[str], from_statuses: List[CarStatus], to_status: CarStatus,
+                                   reason: Optional[str] = None) -> Tuple[List[Car], Dict[str, str]]:
+        changes = {'status': to_status.value, 'updated_at': datetime.now(timezone.utc)}
+        try:
+            changed, statuses = await self._bulk_transition(
+                self.cars_collection, 'car', cids, [s.value for s in from_statuses], changes, reason
+            )
+            return [Car(**data) for data in changed], statuses
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while changing car statuses: {e}")
+
+    async def _bulk_delete(self, collection, ids: List[str]) -> List[str]:
+        ids = list(dict.fromkeys(ids))
+        found = set()
+        async for snapshot in self.db.get_all([collection.document(i) for i in ids]):
+            if snapshot.exists:
+                found.add(snapshot.id)
+        batch = self.db.batch()
+        for i in found:
+            batch.delete(collection.document(i))
+        await batch.commit()
+        return [i for i in ids if i in found]
+
+    async def delete_properties(self, pids: List[str]) -> List[str]:
+        try:
+            return await self._bulk_delete(self.properties_collection, pids)
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while deleting properties: {e}")
+
+    async def delete_cars(self, cids: List[str]) -> List[str]:
+        try:
+            return await self._bulk_delete(self.cars_collection, cids)
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while deleting cars: {e}")
+
+    async def get_pending_broker_notifications(self, limit: int = 100) -> List[Dict[str, Any]]:
+        try:
+            query = self.notifications_collection.where(filter=FieldFilter('sent_at', '==', None)).limit(limit)
+            return [{**doc.to_dict(), 'id': doc.id} async for doc in query.stream()]
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while reading broker notifications: {e}")
+
+    async def mark_broker_notifications_sent(self, ids: List[str]) -> None:
+        if not ids:
+            return
+        try:
+            batch = self.db.batch()
+            now = datetime.now(timezone.utc)
+            for i in ids:
+                batch.update(self.notifications_collection.document(i), {'sent_at': now})
+            await batch.commit()
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while marking broker notifications sent: {e}")
+
+    # --- Projected Queries ---
+    @staticmethod
+    def _listing_columns(listing, columns: List[str], img_field: str) -> Dict[str, Any]:
+        """A listing as the flat row MySQL would return for `columns`."""
+        data = listing.model_dump()
+        location = data.pop('location', None) or {}
+        for key in ('region', 'city', 'site'):
+            data[f'location_{key}'] = location.get(key)
+        data['cover_image'] = data[img_field][0] if data.get(img_field) else None
+        return {column: data.get(column) for column in columns}
+
+    async def query_property_columns(self, filters: PropertyFilter, columns: List[str],
+                                     limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        # Documents are read whole anyway, since some filters run after the query
+        props = await self.query_properties(filters, limit=limit, offset=offset)
+        return [self._listing_columns(prop, columns, 'image_urls') for prop in props]
+
+    async def query_car_columns(self, filters: CarFilter, columns: List[str]) -> List[Dict[str, Any]]:
+        cars = await self.query_cars(filters)
+        return [self._listing_columns(car, columns, 'images') for car in cars]
+
+    # --- Listing Versions ---
+    async def get_listing_stamp(self, kind: str) -> Dict[str, Any]:
+        collection = self.properties_collection if kind == "property" else self.cars_collection
+        try:
+            updated_at = None
+            async for doc in collection.order_by('updated_at', direction=firestore.Query.DESCENDING).limit(1).stream():
+                updated_at = doc.to_dict().get('updated_at')
+            counts = await collection.count().get()
+            return {"updated_at": updated_at, "n": counts[0][0].value}
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while reading the {kind} version: {e}")
+
+    # --- Batch Fetch ---
+    async def _docs_by_ids(self, collection, ids: List[str]) -> List[dict]:
+        """The documents for `ids` from one batched read, in the requested order."""
+        ids = list(dict.fromkeys(i for i in ids if i))
+        if not ids:
+            return []
+        docs = {}
+        async for doc in self.db.get_all([collection.document(i) for i in ids]):
+            if doc.exists:
+                docs[doc.id] = doc.to_dict()
+        return [docs[i] for i in ids if i in docs]
+
+    async def get_properties_by_ids(self, pids: List[str]) -> List[Property]:
+        try:
+            return [Property(**data) for data in await self._docs_by_ids(self.properties_collection, pids)]
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while getting properties by IDs: {e}")
+
+    async def get_cars_by_ids(self, cids: List[str]) -> List[Car]:
+        try:
+            return [Car(**data) for data in await self._docs_by_ids(self.cars_collection, cids)]
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while getting cars by IDs: {e}")
+
+    # --- Streaming Export ---
+    async def stream_properties(self, filters: PropertyFilter) -> AsyncIterator[Dict[str, Any]]:
+        """Flat property rows shaped like the MySQL export (location_* columns, "|"-joined image URLs)."""
+        query = self.properties_collection
+        if filters.status:
+            query = query.where(filter=FieldFilter('status', '==', filters.status.value))
+        try:
+            async for doc in query.stream():
+                prop = Property(**doc.to_dict())
+                if not matches_filter(prop, filters):
+                    continue
+                row = prop.model_dump(mode='json', exclude={'location', 'image_urls'})
+                row.update({
+                    'location_region': prop.location.region,
+                    'location_city': prop.location.city,
+                    'location_site': prop.location.site,
+                    'image_urls': '|'.join(prop.image_urls),
+                })
+                yield row
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while streaming properties: {e}")
+
+    async def stream_cars(self, filters: CarFilter, status: Optional[CarStatus] = None) -> AsyncIterator[Dict[str, Any]]:
+        query = self.cars_collection
+        if status:
+            query = query.where(filter=FieldFilter('status', '==', status.value))
+        if filters.car_type:
+            query = query.where(filter=FieldFilter('car_type', '==', filters.car_type.value))
+        try:
+            async for doc in query.stream():
+                row = doc.to_dict()
+                price = row.get('price_etb') or 0
+                if (filters.min_price and price < filters.min_price) or (filters.max_price and price > filters.max_price):
+                    continue
+                yield {**row, 'images': '|'.join(row.get('images') or [])}
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while streaming cars: {e}")
+
+    async def stream_users(self, role: Optional[UserRole] = None, active: Optional[bool] = None) -> AsyncIterator[Dict[str, Any]]:
+        query = self.users_collection
+        if role:
+            query = query.where(filter=FieldFilter('roles', 'array_contains', role.value))
+        if active is not None:
+            query = query.where(filter=FieldFilter('active', '==', active))
+        try:
+            async for doc in query.stream():
+                row = doc.to_dict()
+                row.pop('hashed_password', None)
+                yield {**row, 'roles': '|'.join(row.get('roles') or [])}
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while streaming users: {e}")
+
+    # --- Activity Rollups ---
+    @staticmethod
+    def _activity_doc_id(kind: str, day: str, site: str, event: str, price_etb: Optional[float] = None) -> str:
+        key = f"{kind}|{day}|{site}|{event}" + (f"|{price_etb}" if price_etb is not None else "")
+        return key.replace('/', '_')
+
+    def _count_activity(self, batch, kind: str, event: str, site: Optional[str], price_etb: float, at: datetime, n: int = 1) -> None:
+        """
+        Adds `n` submissions/approvals/rejections/sales to the rollup within `batch`, so they
+        commit with the listing change; approvals and sales also count their price.
+        """
+        event = getattr(event, 'value', event)
+        if event not in ('submitted', 'approved', 'rejected', 'sold'):
+            return
+        day, site = at.date().isoformat(), site or ''
+        batch.set(self.activity_collection.document(self._activity_doc_id(kind, day, site, event)), {
+            'kind': kind, 'day': day, 'location_site': site, 'event': event, 'n': firestore.Increment(n),
+        }, merge=True)
+        if event in ('approved', 'sold'):
+            batch.set(self.activity_prices_collection.document(self._activity_doc_id(kind, day, site, event, price_etb)), {
+                'kind': kind, 'day': day, 'location_site': site, 'event': event,
+                'price_etb': price_etb, 'n': firestore.Increment(n),
+            }, merge=True)
+
+    async def get_listing_activity(self, kind: str, since, site: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self._read_activity(self.activity_collection, kind, since, site)
+
+    async def get_listing_activity_prices(self, kind: str, since, site: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self._read_activity(self.activity_prices_collection, kind, since, site)
+
+    async def _read_activity(self, collection, kind: str, since, site: Optional[str]) -> List[Dict[str, Any]]:
+        try:
+            query = collection.where(filter=FieldFilter('kind', '==', kind)) \
+                .where(filter=FieldFilter('day', '>=', since.isoformat()))
+            if site is not None:
+                query = query.where(filter=FieldFilter('location_site', '==', site))
+            rows = []
+            async for doc in query.stream():
+                row = doc.to_dict()
+                row['day'] = date.fromisoformat(row['day'])
+                rows.append(row)
+            return rows
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while reading listing activity: {e}")
+
+    async def rebuild_listing_activity(self) -> int:
+        """Recomputes the rollup from the listing collections (see the MySQL repo for the dating rules)."""
+        try:
+            counts: Dict[tuple, int] = {}
+            prices: Dict[tuple, int] = {}
+            sources = [('property', self.properties_collection), ('car', self.cars_collection)]
+            for kind, collection in sources:
+                async for doc in collection.stream():
+                    data = doc.to_dict()
+                    site = (data.get('location') or {}).get('site') or '' if kind == 'property' else ''
+                    events = [('submitted', data['created_at'])]
+                    if data.get('status') in ('approved', 'rejected', 'sold'):
+                        events.append((data['status'], data['updated_at']))
+                    for event, at in events:
+                        key = (kind, at.date().isoformat(), site, event)
+                        counts[key] = counts.get(key, 0) + 1
+                        if event in ('approved', 'sold'):
+                            prices[(*key, data['price_etb'])] = prices.get((*key, data['price_etb']), 0) + 1
+            for collection in (self.activity_collection, self.activity_prices_collection):
+                async for doc in collection.stream():
+                    await doc.reference.delete()
+            for (kind, day, site, event), n in counts.items():
+                await self.activity_collection.document(self._activity_doc_id(kind, day, site, event)).set({
+                    'kind': kind, 'day': day, 'location_site': site, 'event': event, 'n': n,
+                })
+            for (kind, day, site, event, price_etb), n in prices.items():
+                await self.activity_prices_collection.document(self._activity_doc_id(kind, day, site, event, price_etb)).set({
+                    'kind': kind, 'day': day, 'location_site': site, 'event': event, 'price_etb': price_etb, 'n': n,
+                })
+            return len(counts)
+        except GoogleAPICallError as e:
+            raise DatabaseError(f"Firestore error while rebuilding listing activity: {e}")
@@ -1,14 +1,92 @@
+import logging
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from decimal import Decimal, ROUND_HALF_UP
+from itertools import islice
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 import pymysql
 import pymysql.cursors
 from src.domain.models.user_models import User, UserCreate, UserRole
 from src.domain.models.property_models import Property, PropertyCreate, PropertyFilter, PropertyStatus
 from src.domain.models.car_models import Car, CarCreate, CarFilter, CarStatus
-from src.utils.exceptions import DatabaseError, UserNotFoundError, PropertyNotFoundError
+from src.utils.exceptions import DatabaseError, UserNotFoundError, PropertyNotFoundError, InvalidOperationError
 from src.utils.auth_utils import hash_password
+from src.infrastructure.search.text_index import search_terms
+from src.infrastructure.search.facets import empty_facets, add_facet_row
 from src.utils.config import settings
+from src.utils.constants import BROKER_NOTIFIED_EVENTS
+
+logger = logging.getLogger(__name__)
+
+
+def _db_now() -> datetime:
+    """The current UTC time as a TIMESTAMP column stores and returns it (naive, whole seconds)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+# kind -> (table, id column, image table, image foreign key, image model field, rollup site expression)
+_LISTING_TABLES = {
+    "property": ("properties", "pid", "property_images", "property_id", "image_urls", "COALESCE(location_site, '')"),
+    "car": ("cars", "cid", "car_images", "car_id", "images", "''"),
+}
+# Events counted in the activity rollup; approvals and sales also keep their prices, for medians
+_ACTIVITY_EVENTS = ("submitted", "approved", "rejected", "sold")
+_PRICED_EVENTS = ("approved", "sold")
+
+
+# Single-row INSERTs; executemany() turns them into one multi-row INSERT per batch
+_PROPERTY_INSERT = """
+    INSERT INTO properties (
+        pid, property_type, location_region, location_city, location_site,
+        bedrooms, bathrooms, size_sqm, price_etb, description,
+        furnishing_status, condominium_scheme, floor_level, debt_status,
+        structure_type, plot_size_sqm, title_deed, kitchen_type,
+        living_rooms, water_tank, parking_spaces, is_commercial,
+        total_floors, total_units, has_elevator, has_private_rooftop,
+        is_two_story_penthouse, has_private_entrance, broker_id,
+        broker_name, broker_phone, status, created_at, updated_at
+    ) VALUES (
+        %(pid)s, %(property_type)s, %(location_region)s, %(location_city)s, %(location_site)s,
+        %(bedrooms)s, %(bathrooms)s, %(size_sqm)s, %(price_etb)s, %(description)s,
+        %(furnishing_status)s, %(condominium_scheme)s, %(floor_level)s, %(debt_status)s,
+        %(structure_type)s, %(plot_size_sqm)s, %(title_deed)s, %(kitchen_type)s,
+        %(living_rooms)s, %(water_tank)s, %(parking_spaces)s, %(is_commercial)s,
+        %(total_floors)s, %(total_units)s, %(has_elevator)s, %(has_private_rooftop)s,
+        %(is_two_story_penthouse)s, %(has_private_entrance)s, %(broker_id)s,
+        %(broker_name)s, %(broker_phone)s, %(status)s, %(created_at)s, %(updated_at)s
+    )
+"""
+
+_CAR_INSERT = """
+    INSERT INTO cars (
+        cid, car_type, price_etb, manufacturer, model_name, model_year,
+        color, plate, engine, power_hp, transmission, fuel_efficiency_kmpl,
+        motor_type, mileage_km, description, broker_id, broker_name,
+        broker_phone, status, created_at, updated_at
+    ) VALUES (
+        %(cid)s, %(car_type)s, %(price_etb)s, %(manufacturer)s, %(model_name)s, %(model_year)s,
+        %(color)s, %(plate)s, %(engine)s, %(power_hp)s, %(transmission)s, %(fuel_efficiency_kmpl)s,
+        %(motor_type)s, %(mileage_km)s, %(description)s, %(broker_id)s, %(broker_name)s,
+        %(broker_phone)s, %(status)s, %(created_at)s, %(updated_at)s
+    )
+"""
+
+
+def _decimal(value: Optional[float]) -> Optional[float]:
+    """A float as a DECIMAL(_, 2) column stores it (MySQL rounds halves away from zero)."""
+    if value is None:
+        return None
+    return float(Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+# DECIMAL(_, 2) columns, whose written values are rounded the same way in returned models
+_DECIMAL_COLUMNS = {"size_sqm", "price_etb", "plot_size_sqm", "fuel_efficiency_kmpl", "mileage_km"}
+
+
+def _column_values(updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Update values as the columns will store them."""
+    return {key: _decimal(value) if key in _DECIMAL_COLUMNS else value for key, value in updates.items()}
 
 
 class MySQLRealEstateRepository:
@@ -51,6 +129,39 @@ class MySQLRealEstateRepository:
         finally:
             conn.close()
 
+    @contextmanager
+    def _transaction(self):
+        """Yields a cursor whose statements commit together, or roll back if the block raises."""
+        conn = self._get_connection()
+        try:
+            conn.begin()
+            with conn.cursor() as cursor:
+                yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _property_from_row(row: Dict[str, Any], image_urls: List[str]) -> Property:
+        prop_dict = dict(row)
+        prop_dict['image_urls'] = image_urls
+        prop_dict['location'] = {
+            'region': prop_dict['location_region'],
+            'city': prop_dict['location_city'],
+            'site': prop_dict['location_site']
+        }
+        return Property(**prop_dict)
+
+    @staticmethod
+    def _page_clause(limit: Optional[int], offset: int = 0):
+        """Returns the LIMIT/OFFSET fragment and its params for paged listing queries."""
+        if limit is None:
+            return "", ()
+        return " LIMIT %s OFFSET %s", (limit, offset)
+
     # --- Image Blob Methods ---
     def _ensure_images_table(self):
         """Create images table if it does not exist."""
@@ -116,6 +227,30 @@ class MySQLRealEstateRepository:
         except Exception as e:
             raise DatabaseError(f"MySQL error while getting user by ID: {e}")
 
+    def get_users_by_ids(self, uids: List[str]) -> Dict[str, User]:
+        """Loads several users in one query. Unknown ids are simply absent from the result."""
+        unique_ids = list(dict.fromkeys(uid for uid in uids if uid))
+        if not unique_ids:
+            return {}
+        try:
+            placeholders = ", ".join(["%s"] * len(unique_ids))
+            query = f"""
+                SELECT u.*, GROUP_CONCAT(ur.role) as roles
+                FROM users u
+                LEFT JOIN user_roles ur ON u.uid = ur.user_id
+                WHERE u.uid IN ({placeholders})
+                GROUP BY u.uid
+            """
+            results = self._execute_query(query, tuple(unique_ids), fetch_all=True)
+            users = {}
+            for result in results:
+                roles = result['roles'].split(',') if result.get('roles') else []
+                result['roles'] = [UserRole(role) for role in roles if role]
+                users[result['uid']] = User(**result)
+            return users
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while getting users by IDs: {e}")
+
     def get_user_by_phone_number(self, phone_number: str) -> Optional[User]:
         try:
             query = """
@@ -135,9 +270,11 @@ class MySQLRealEstateRepository:
             raise DatabaseError(f"MySQL error while getting user by phone: {e}")
 
     def create_user(self, user_data: UserCreate) -> User:
+        # Hashed before the try so a busy password pool surfaces as 429, not a DatabaseError
+        hashed_password = hash_password(user_data.password, label="create_user") if user_data.password else None
         try:
             uid = str(uuid.uuid4())
-            now = datetime.now(timezone.utc)
+            now = _db_now()
             
             user_dict = {
                 "uid": uid,
@@ -145,7 +282,7 @@ class MySQLRealEstateRepository:
                 "telegram_id": user_data.telegram_id,
                 "display_name": user_data.display_name,
                 "language": user_data.language,
-                "hashed_password": hash_password(user_data.password) if user_data.password else None,
+                "hashed_password": hashed_password,
                 "active": True,
                 "created_at": now,
                 "updated_at": now
@@ -155,40 +292,49 @@ class MySQLRealEstateRepository:
                 INSERT INTO users (uid, phone_number, telegram_id, display_name, language, hashed_password, active, created_at, updated_at)
                 VALUES (%(uid)s, %(phone_number)s, %(telegram_id)s, %(display_name)s, %(language)s, %(hashed_password)s, %(active)s, %(created_at)s, %(updated_at)s)
             """
-            self._execute_query(user_query, user_dict)
-            
-            if user_data.roles:
-                for role in user_data.roles:
-                    role_query = "INSERT INTO user_roles (user_id, role) VALUES (%s, %s)"
-                    self._execute_query(role_query, (uid, role.value))
+            with self._transaction() as cursor:
+                cursor.execute(user_query, user_dict)
+                if user_data.roles:
+                    cursor.executemany(
+                        "INSERT INTO user_roles (user_id, role) VALUES (%s, %s)",
+                        [(uid, role.value) for role in user_data.roles]
+                    )
             
-            return self.get_user_by_id(uid)
+            # Everything else is the column defaults, so there is no need to read the row back
+            return User(**user_dict, roles=user_data.roles, token_version=0)
         except Exception as e:
             raise DatabaseError(f"MySQL error while creating user: {e}")
 
     def update_user(self, uid: str, updates: Dict[str, Any]) -> User:
+        """Applies the updates in one transaction and returns the locked row with them applied."""
+        columns = {key: value for key, value in updates.items() if key != 'roles'}
         try:
-            set_clauses = []
-            params = []
-            
-            for key, value in updates.items():
-                if key != 'roles':
-                    set_clauses.append(f"{key} = %s")
-                    params.append(value)
-            
-            if set_clauses:
-                params.append(datetime.now(timezone.utc))
-                params.append(uid)
-                query = f"UPDATE users SET {', '.join(set_clauses)}, updated_at = %s WHERE uid = %s"
-                self._execute_query(query, tuple(params))
-            
-            if 'roles' in updates:
-                self._execute_query("DELETE FROM user_roles WHERE user_id = %s", (uid,))
-                for role in updates['roles']:
-                    role_query = "INSERT INTO user_roles (user_id, role) VALUES (%s, %s)"
-                    self._execute_query(role_query, (uid, role.value if hasattr(role, 'value') else role))
+            with self._transaction() as cursor:
+                cursor.execute("SELECT * FROM users WHERE uid = %s FOR UPDATE", (uid,))
+                row = cursor.fetchone()
+                if not row:
+                    raise UserNotFoundError(identifier=uid)
+                
+                if columns:
+                    columns['updated_at'] = _db_now()
+                    set_sql = ", ".join(f"{key} = %s" for key in columns)
+                    cursor.execute(f"UPDATE users SET {set_sql} WHERE uid = %s", (*columns.values(), uid))
+                
+                if 'roles' in updates:
+                    roles = [UserRole(role) for role in updates['roles']]
+                    cursor.execute("DELETE FROM user_roles WHERE user_id = %s", (uid,))
+                    if roles:
+                        cursor.executemany(
+                            "INSERT INTO user_roles (user_id, role) VALUES (%s, %s)",
+                            [(uid, role.value) for role in roles]
+                        )
+                else:
+                    cursor.execute("SELECT role FROM user_roles WHERE user_id = %s", (uid,))
+                    roles = [UserRole(r['role']) for r in cursor.fetchall()]
             
-            return self.get_user_by_id(uid)
+            return User(**{**row, **columns, 'roles': roles})
+        except UserNotFoundError:
+            raise
         except Exception as e:
             raise DatabaseError(f"MySQL error while updating user: {e}")
 
@@ -260,6 +406,39 @@ class MySQLRealEstateRepository:
     def set_user_active(self, uid: str, active: bool) -> User:
         return self.update_user(uid, {"active": active})
 
+    def _ensure_token_version_column(self):
+        """Adds users.token_version on databases created before it existed."""
+        if getattr(self, '_token_version_checked', False):
+            return
+        column = self._execute_query(
+            "SELECT COUNT(*) AS n FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'users' AND COLUMN_NAME = 'token_version'",
+            fetch_one=True
+        )
+        if not column or not column['n']:
+            self._execute_query("ALTER TABLE users ADD COLUMN token_version INT NOT NULL DEFAULT 0")
+        self._token_version_checked = True
+
+    def bump_token_version(self, uid: str) -> User:
+        """Invalidates every access token issued to the user so far."""
+        try:
+            self._ensure_token_version_column()
+            self._execute_query("UPDATE users SET token_version = token_version + 1 WHERE uid = %s", (uid,))
+            return self.get_user_by_id(uid)
+        except UserNotFoundError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while bumping token version: {e}")
+
+    def get_token_version(self, uid: str) -> Optional[int]:
+        """The user's current token version (one primary-key read), or None if there is no such user."""
+        try:
+            self._ensure_token_version_column()
+            row = self._execute_query("SELECT token_version FROM users WHERE uid = %s", (uid,), fetch_one=True)
+            return row['token_version'] if row else None
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while reading token version: {e}")
+
     def delete_user(self, uid: str) -> None:
         try:
             self._execute_query("DELETE FROM users WHERE uid = %s", (uid,))
@@ -267,76 +446,62 @@ class MySQLRealEstateRepository:
             raise DatabaseError(f"MySQL error while deleting user: {e}")
 
     # --- Property Methods ---
+    @staticmethod
+    def _property_row(property_data: PropertyCreate, pid: str, status: PropertyStatus, now: datetime) -> Dict[str, Any]:
+        """The properties row for a new listing."""
+        return {
+            "pid": pid,
+            "property_type": property_data.property_type.value,
+            "location_region": property_data.location.region,
+            "location_city": property_data.location.city,
+            "location_site": property_data.location.site,
+            "bedrooms": property_data.bedrooms,
+            "bathrooms": property_data.bathrooms,
+            "size_sqm": _decimal(property_data.size_sqm),
+            "price_etb": _decimal(property_data.price_etb),
+            "description": property_data.description,
+            "furnishing_status": property_data.furnishing_status.value if property_data.furnishing_status else None,
+            "condominium_scheme": property_data.condominium_scheme.value if property_data.condominium_scheme else None,
+            "floor_level": property_data.floor_level,
+            "debt_status": property_data.debt_status,
+            "structure_type": property_data.structure_type,
+            "plot_size_sqm": _decimal(property_data.plot_size_sqm),
+            "title_deed": property_data.title_deed,
+            "kitchen_type": property_data.kitchen_type,
+            "living_rooms": property_data.living_rooms,
+            "water_tank": property_data.water_tank,
+            "parking_spaces": property_data.parking_spaces,
+            "is_commercial": property_data.is_commercial,
+            "total_floors": property_data.total_floors,
+            "total_units": property_data.total_units,
+            "has_elevator": property_data.has_elevator,
+            "has_private_rooftop": property_data.has_private_rooftop,
+            "is_two_story_penthouse": property_data.is_two_story_penthouse,
+            "has_private_entrance": property_data.has_private_entrance,
+            "broker_id": property_data.broker_id,
+            "broker_name": property_data.broker_name,
+            "broker_phone": property_data.broker_phone,
+            "status": status.value,
+            "created_at": now,
+            "updated_at": now
+        }
+
     def create_property(self, property_data: PropertyCreate) -> Property:
         try:
             pid = str(uuid.uuid4())
-            now = datetime.now(timezone.utc)
-            
-            prop_dict = {
-                "pid": pid,
-                "property_type": property_data.property_type.value,
-                "location_region": property_data.location.region,
-                "location_city": property_data.location.city,
-                "location_site": property_data.location.site,
-                "bedrooms": property_data.bedrooms,
-                "bathrooms": property_data.bathrooms,
-                "size_sqm": property_data.size_sqm,
-                "price_etb": property_data.price_etb,
-                "description": property_data.description,
-                "furnishing_status": property_data.furnishing_status.value if property_data.furnishing_status else None,
-                "condominium_scheme": property_data.condominium_scheme.value if property_data.condominium_scheme else None,
-                "floor_level": property_data.floor_level,
-                "debt_status": property_data.debt_status,
-                "structure_type": property_data.structure_type,
-                "plot_size_sqm": property_data.plot_size_sqm,
-                "title_deed": property_data.title_deed,
-                "kitchen_type": property_data.kitchen_type,
-                "living_rooms": property_data.living_rooms,
-                "water_tank": property_data.water_tank,
-                "parking_spaces": property_data.parking_spaces,
-                "is_commercial": property_data.is_commercial,
-                "total_floors": property_data.total_floors,
-                "total_units": property_data.total_units,
-                "has_elevator": property_data.has_elevator,
-                "has_private_rooftop": property_data.has_private_rooftop,
-                "is_two_story_penthouse": property_data.is_two_story_penthouse,
-                "has_private_entrance": property_data.has_private_entrance,
-                "broker_id": property_data.broker_id,
-                "broker_name": property_data.broker_name,
-                "broker_phone": property_data.broker_phone,
-                "status": PropertyStatus.PENDING.value,
-                "created_at": now,
-                "updated_at": now
-            }
-            
-            prop_query = """
-                INSERT INTO properties (
-                    pid, property_type, location_region, location_city, location_site,
-                    bedrooms, bathrooms, size_sqm, price_etb, description,
-                    furnishing_status, condominium_scheme, floor_level, debt_status,
-                    structure_type, plot_size_sqm, title_deed, kitchen_type,
-                    living_rooms, water_tank, parking_spaces, is_commercial,
-                    total_floors, total_units, has_elevator, has_private_rooftop,
-                    is_two_story_penthouse, has_private_entrance, broker_id,
-                    broker_name, broker_phone, status, created_at, updated_at
-                ) VALUES (
-                    %(pid)s, %(property_type)s, %(location_region)s, %(location_city)s, %(location_site)s,
-                    %(bedrooms)s, %(bathrooms)s, %(size_sqm)s, %(price_etb)s, %(description)s,
-                    %(furnishing_status)s, %(condominium_scheme)s, %(floor_level)s, %(debt_status)s,
-                    %(structure_type)s, %(plot_size_sqm)s, %(title_deed)s, %(kitchen_type)s,
-                    %(living_rooms)s, %(water_tank)s, %(parking_spaces)s, %(is_commercial)s,
-                    %(total_floors)s, %(total_units)s, %(has_elevator)s, %(has_private_rooftop)s,
-                    %(is_two_story_penthouse)s, %(has_private_entrance)s, %(broker_id)s,
-                    %(broker_name)s, %(broker_phone)s, %(status)s, %(created_at)s, %(updated_at)s
-                )
-            """
-            self._execute_query(prop_query, prop_dict)
+            prop_dict = self._property_row(property_data, pid, PropertyStatus.PENDING, _db_now())
+            self._ensure_activity_table()
+            with self._transaction() as cursor:
+                cursor.execute(_PROPERTY_INSERT, prop_dict)
+                if property_data.image_urls:
+                    cursor.executemany(
+                        "INSERT INTO property_images (property_id, image_url, image_order) VALUES (%s, %s, %s)",
+                        [(pid, image_url, i) for i, image_url in enumerate(property_data.image_urls)]
+                    )
+                self._count_activity(cursor, "property", "submitted", [pid], prop_dict["created_at"].date())
             
-            for i, image_url in enumerate(property_data.image_urls):
-                img_query = "INSERT INTO property_images (property_id, image_url, image_order) VALUES (%s, %s, %s)"
-                self._execute_query(img_query, (pid, image_url, i))
-            
-            return self.get_property_by_id(pid)
+            # Every column was written explicitly, so the inserted values are what a read would return
+            return self._property_from_row(prop_dict, list(property_data.image_urls))
         except Exception as e:
             raise DatabaseError(f"MySQL error while creating property: {e}")
 
@@ -366,34 +531,103 @@ class MySQLRealEstateRepository:
             raise DatabaseError(f"MySQL error while getting property by ID: {e}")
 
     def update_property(self, pid: str, updates: Dict[str, Any]) -> Property:
+        """
+        Applies the updates in one transaction and returns the locked row with them applied.
+        A status change is counted in the activity rollup in the same transaction.
+        """
         try:
-            set_clauses = []
-            params = []
-            
-            for key, value in updates.items():
-                set_clauses.append(f"{key} = %s")
-                params.append(value)
-            
-            if set_clauses:
-                params.append(datetime.now(timezone.utc))
-                params.append(pid)
-                query = f"UPDATE properties SET {', '.join(set_clauses)}, updated_at = %s WHERE pid = %s"
-                self._execute_query(query, tuple(params))
+            self._ensure_activity_table()
+            with self._transaction() as cursor:
+                cursor.execute("SELECT * FROM properties WHERE pid = %s FOR UPDATE", (pid,))
+                row = cursor.fetchone()
+                if not row:
+                    raise PropertyNotFoundError(identifier=pid)
+                cursor.execute(
+                    "SELECT image_url FROM property_images WHERE property_id = %s ORDER BY image_order", (pid,)
+                )
+                image_urls = [img['image_url'] for img in cursor.fetchall()]
+                
+                changes = _column_values(updates)
+                if changes:
+                    changes['updated_at'] = _db_now()
+                    set_sql = ", ".join(f"{key} = %s" for key in changes)
+                    cursor.execute(f"UPDATE properties SET {set_sql} WHERE pid = %s", (*changes.values(), pid))
+                    if 'status' in changes and changes['status'] != row['status']:
+                        self._count_activity(cursor, "property", changes['status'], [pid], changes['updated_at'].date())
             
-            return self.get_property_by_id(pid)
+            return self._property_from_row({**row, **changes}, image_urls)
+        except PropertyNotFoundError:
+            raise
         except Exception as e:
             raise DatabaseError(f"MySQL error while updating property: {e}")
 
-    def get_properties_by_status(self, status: PropertyStatus) -> List[Property]:
+    def _transition_one(self, cursor, kind: str, listing_id: str, from_statuses: List[str],
+                        changes: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[str], bool]:
+        """
+        Applies `changes` (which include the new status) to one listing with a single UPDATE
+        guarded by `status IN from_statuses`, so the write is conditional in its own right, then
+        reads the row and its images back in one ordered join on the same transaction.
+        Returns (row or None if the listing doesn't exist, image URLs, whether it was updated).
+        """
+        table, id_col, img_table, img_fk = _LISTING_TABLES[kind][:4]
+        set_sql = ", ".join(f"{key} = %s" for key in changes)
+        cursor.execute(
+            f"UPDATE {table} SET {set_sql} WHERE {id_col} = %s AND status IN ({', '.join(['%s'] * len(from_statuses))})",
+            (*changes.values(), listing_id, *from_statuses)
+        )
+        updated = cursor.rowcount == 1
+        cursor.execute(
+            f"SELECT t.*, i.image_url AS listing_image_url FROM {table} t "
+            f"LEFT JOIN {img_table} i ON i.{img_fk} = t.{id_col} WHERE t.{id_col} = %s ORDER BY i.image_order",
+            (listing_id,)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return None, [], False
+        images = [row.pop('listing_image_url') for row in rows]
+        return rows[0], [url for url in images if url is not None], updated
+
+    def transition_property_status(self, pid: str, from_statuses: List[PropertyStatus], to_status: PropertyStatus,
+                                   updates: Optional[Dict[str, Any]] = None) -> Property:
+        """
+        Moves a property to `to_status` only if it is currently in one of `from_statuses`.
+
+        The UPDATE itself carries the status condition, so of two concurrent transitions only
+        one changes the row; the other matches nothing and is refused. The transition is
+        counted in the activity rollup in the same transaction.
+        """
+        allowed = [status.value for status in from_statuses]
+        changes = {"status": to_status.value, **_column_values(updates or {}), "updated_at": _db_now()}
         try:
-            query = """
+            self._ensure_activity_table()
+            with self._transaction() as cursor:
+                row, image_urls, updated = self._transition_one(cursor, "property", pid, allowed, changes)
+                if row is None:
+                    raise PropertyNotFoundError(identifier=pid)
+                if not updated:
+                    raise InvalidOperationError(
+                        f"Cannot change property status to '{to_status.value}'. Current status is '{row['status']}'."
+                    )
+                self._count_activity(cursor, "property", to_status.value, [pid], changes['updated_at'].date())
+
+            return self._property_from_row(row, image_urls)
+        except (PropertyNotFoundError, InvalidOperationError):
+            raise
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while changing property status: {e}")
+
+    def get_properties_by_status(self, status: PropertyStatus, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
+        try:
+            page_sql, page_params = self._page_clause(limit, offset)
+            query = f"""
                 SELECT p.*, GROUP_CONCAT(pi.image_url ORDER BY pi.image_order) as image_urls
                 FROM properties p
                 LEFT JOIN property_images pi ON p.pid = pi.property_id
                 WHERE p.status = %s
                 GROUP BY p.pid
+                ORDER BY p.created_at DESC, p.pid{page_sql}
             """
-            results = self._execute_query(query, (status.value,), fetch_all=True)
+            results = self._execute_query(query, (status.value, *page_params), fetch_all=True)
             properties = []
             for result in results:
                 prop_dict = dict(result)
@@ -408,16 +642,18 @@ class MySQLRealEstateRepository:
         except Exception as e:
             raise DatabaseError(f"MySQL error while getting properties by status: {e}")
 
-    def get_properties_by_broker_id(self, broker_id: str) -> List[Property]:
+    def get_properties_by_broker_id(self, broker_id: str, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
         try:
-            query = """
+            page_sql, page_params = self._page_clause(limit, offset)
+            query = f"""
                 SELECT p.*, GROUP_CONCAT(pi.image_url ORDER BY pi.image_order) as image_urls
                 FROM properties p
                 LEFT JOIN property_images pi ON p.pid = pi.property_id
                 WHERE p.broker_id = %s
                 GROUP BY p.pid
+                ORDER BY p.created_at DESC, p.pid{page_sql}
             """
-            results = self._execute_query(query, (broker_id,), fetch_all=True)
+            results = self._execute_query(query, (broker_id, *page_params), fetch_all=True)
             properties = []
             for result in results:
                 prop_dict = dict(result)
@@ -432,49 +668,180 @@ class MySQLRealEstateRepository:
         except Exception as e:
             raise DatabaseError(f"MySQL error while getting properties by broker ID: {e}")
 
-    def query_properties(self, filters: PropertyFilter) -> List[Property]:
+    def get_properties_updated_since(self, since: datetime) -> List[Property]:
+        """Properties of any status changed at or after `since`, for syncing in-memory indexes."""
+        try:
+            query = """
+                SELECT p.*, GROUP_CONCAT(pi.image_url ORDER BY pi.image_order) as image_urls
+                FROM properties p
+                LEFT JOIN property_images pi ON p.pid = pi.property_id
+                WHERE p.updated_at >= %s
+                GROUP BY p.pid
+            """
+            results = self._execute_query(query, (since,), fetch_all=True)
+            properties = []
+            for result in results:
+                prop_dict = dict(result)
+                prop_dict['image_urls'] = result['image_urls'].split(',') if result.get('image_urls') else []
+                prop_dict['location'] = {
+                    'region': prop_dict['location_region'],
+                    'city': prop_dict['location_city'],
+                    'site': prop_dict['location_site']
+                }
+                properties.append(Property(**prop_dict))
+            return properties
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while getting updated properties: {e}")
+
+    def supports_fulltext(self) -> bool:
+        """True when the properties table has ft_property_text, the FULLTEXT index used for keyword search."""
+        if getattr(self, '_fulltext_supported', None) is None:
+            result = self._execute_query(
+                "SELECT COUNT(*) AS n FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'properties' AND INDEX_NAME = 'ft_property_text'",
+                fetch_one=True
+            )
+            self._fulltext_supported = bool(result and result['n'])
+            if self._fulltext_supported:
+                self._ft_min_token_size, self._ft_stopwords = self._fulltext_token_rules()
+        return self._fulltext_supported
+
+    def _fulltext_token_rules(self) -> Tuple[int, frozenset]:
+        """
+        The server's InnoDB minimum token size and stopwords. Such words are never indexed,
+        so a required +word* term made of one matches nothing.
+        """
+        min_size, stopwords = 3, frozenset()
         try:
+            config = self._execute_query(
+                "SELECT @@innodb_ft_min_token_size AS min_size, @@innodb_ft_enable_stopword AS enabled, "
+                "@@innodb_ft_server_stopword_table AS stopword_table",
+                fetch_one=True
+            )
+            min_size = int(config['min_size'])
+            if config['enabled']:
+                table = "information_schema.INNODB_FT_DEFAULT_STOPWORD"
+                if config['stopword_table']:
+                    db_name, table_name = config['stopword_table'].split('/', 1)
+                    table = f"`{db_name}`.`{table_name}`"
+                rows = self._execute_query(f"SELECT value FROM {table}", fetch_all=True)
+                stopwords = frozenset(row['value'].lower() for row in rows)
+        except Exception as e:
+            logger.warning(f"Could not read the FULLTEXT token settings ({e}); assuming the defaults.")
+        return min_size, stopwords
+
+    def _keyword_conditions(self, terms: List[str]) -> Tuple[List[str], List[Any]]:
+        """
+        Conditions matching listings that contain every term. Terms the FULLTEXT index can
+        hold go into one MATCH; too-short words and stopwords are matched with LIKE.
+        """
+        conditions, params = [], []
+        like_terms = terms
+        if self.supports_fulltext():
+            indexed = [term for term in terms
+                       if len(term) >= self._ft_min_token_size and term not in self._ft_stopwords]
+            if indexed:
+                conditions.append(
+                    "MATCH(p.description, p.location_site, p.location_region) AGAINST (%s IN BOOLEAN MODE)"
+                )
+                params.append(" ".join(f"+{term}*" for term in indexed))
+            like_terms = [term for term in terms if term not in indexed]
+        for term in like_terms:
+            conditions.append("(p.description LIKE %s OR p.location_site LIKE %s OR p.location_region LIKE %s)")
+            params.extend([f"%{term}%"] * 3)
+        return conditions, params
+
+    def _property_where(self, filters: PropertyFilter, any_status: bool = False):
+        """
+        Builds the WHERE clause and params of a property search. Without a status filter
+        only approved listings match, unless `any_status` is set.
+        """
+        where_conditions, params = ["1 = 1"], []
+        if filters.status or not any_status:
             where_conditions = ["p.status = %s"]
             params = [filters.status.value if filters.status else PropertyStatus.APPROVED.value]
-            
-            if filters.property_type:
-                where_conditions.append("p.property_type = %s")
-                params.append(filters.property_type.value)
-            if filters.min_bedrooms:
-                where_conditions.append("p.bedrooms >= %s")
-                params.append(filters.min_bedrooms)
-            if filters.max_bedrooms:
-                where_conditions.append("p.bedrooms <= %s")
-                params.append(filters.max_bedrooms)
-            if filters.location_region:
-                where_conditions.append("p.location_region = %s")
-                params.append(filters.location_region)
-            if filters.location_site:
-                where_conditions.append("p.location_site = %s")
-                params.append(filters.location_site)
-            if filters.min_price:
-                where_conditions.append("p.price_etb >= %s")
-                params.append(filters.min_price)
-            if filters.max_price:
-                where_conditions.append("p.price_etb <= %s")
-                params.append(filters.max_price)
-            if filters.filter_is_commercial is not None:
-                where_conditions.append("p.is_commercial = %s")
-                params.append(filters.filter_is_commercial)
-            if filters.filter_has_elevator is not None:
-                where_conditions.append("p.has_elevator = %s")
-                params.append(filters.filter_has_elevator)
-            if filters.filter_has_private_rooftop is not None:
-                where_conditions.append("p.has_private_rooftop = %s")
-                params.append(filters.filter_has_private_rooftop)
-            if filters.filter_is_two_story_penthouse is not None:
-                where_conditions.append("p.is_two_story_penthouse = %s")
-                params.append(filters.filter_is_two_story_penthouse)
-            if filters.filter_has_private_entrance is not None:
-                where_conditions.append("p.has_private_entrance = %s")
-                params.append(filters.filter_has_private_entrance)
-            
-            where_clause = " AND ".join(where_conditions)
+        
+        if filters.property_type:
+            where_conditions.append("p.property_type = %s")
+            params.append(filters.property_type.value)
+        if filters.min_bedrooms:
+            where_conditions.append("p.bedrooms >= %s")
+            params.append(filters.min_bedrooms)
+        if filters.max_bedrooms:
+            where_conditions.append("p.bedrooms <= %s")
+            params.append(filters.max_bedrooms)
+        if filters.location_region:
+            where_conditions.append("p.location_region = %s")
+            params.append(filters.location_region)
+        if filters.location_site:
+            where_conditions.append("p.location_site = %s")
+            params.append(filters.location_site)
+        if filters.min_price:
+            where_conditions.append("p.price_etb >= %s")
+            params.append(filters.min_price)
+        if filters.max_price:
+            where_conditions.append("p.price_etb <= %s")
+            params.append(filters.max_price)
+        if filters.filter_is_commercial is not None:
+            where_conditions.append("p.is_commercial = %s")
+            params.append(filters.filter_is_commercial)
+        if filters.filter_has_elevator is not None:
+            where_conditions.append("p.has_elevator = %s")
+            params.append(filters.filter_has_elevator)
+        if filters.filter_has_private_rooftop is not None:
+            where_conditions.append("p.has_private_rooftop = %s")
+            params.append(filters.filter_has_private_rooftop)
+        if filters.filter_is_two_story_penthouse is not None:
+            where_conditions.append("p.is_two_story_penthouse = %s")
+            params.append(filters.filter_is_two_story_penthouse)
+        if filters.filter_has_private_entrance is not None:
+            where_conditions.append("p.has_private_entrance = %s")
+            params.append(filters.filter_has_private_entrance)
+        if filters.min_floor_level is not None:
+            where_conditions.append("p.floor_level >= %s")
+            params.append(filters.min_floor_level)
+        if filters.min_size_sqm:
+            where_conditions.append("p.size_sqm >= %s")
+            params.append(filters.min_size_sqm)
+        if filters.max_size_sqm:
+            where_conditions.append("p.size_sqm <= %s")
+            params.append(filters.max_size_sqm)
+        if filters.condominium_scheme:
+            where_conditions.append("p.condominium_scheme = %s")
+            params.append(filters.condominium_scheme.value)
+        if filters.furnishing_status:
+            where_conditions.append("p.furnishing_status = %s")
+            params.append(filters.furnishing_status.value)
+        if filters.q:
+            keyword_conditions, keyword_params = self._keyword_conditions(search_terms(filters.q))
+            where_conditions.extend(keyword_conditions)
+            params.extend(keyword_params)
+        return " AND ".join(where_conditions), params
+
+    def get_property_facets(self, filters: PropertyFilter, price_bounds: List[float]) -> Dict[str, Any]:
+        """Facet counts for a property search, from one grouped scan of the matching rows."""
+        try:
+            where_clause, params = self._property_where(filters)
+            bounds_sql = ", ".join(["%s"] * len(price_bounds))
+            query = f"""
+                SELECT p.property_type, p.location_site, p.condominium_scheme, p.furnishing_status, p.bedrooms,
+                       INTERVAL(p.price_etb, {bounds_sql}) AS price_bucket, COUNT(*) AS n
+                FROM properties p
+                WHERE {where_clause}
+                GROUP BY p.property_type, p.location_site, p.condominium_scheme, p.furnishing_status,
+                         p.bedrooms, price_bucket
+            """
+            facets = empty_facets(price_bounds)
+            for row in self._execute_query(query, (*price_bounds, *params), fetch_all=True):
+                add_facet_row(facets, row, row['n'])
+            return facets
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while counting property facets: {e}")
+
+    def query_properties(self, filters: PropertyFilter, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
+        try:
+            where_clause, params = self._property_where(filters)
+            page_sql, page_params = self._page_clause(limit, offset)
             
             query = f"""
                 SELECT p.*, GROUP_CONCAT(pi.image_url ORDER BY pi.image_order) as image_urls
@@ -482,9 +849,10 @@ class MySQLRealEstateRepository:
                 LEFT JOIN property_images pi ON p.pid = pi.property_id
                 WHERE {where_clause}
                 GROUP BY p.pid
+                ORDER BY p.created_at DESC, p.pid{page_sql}
             """
             
-            results = self._execute_query(query, tuple(params), fetch_all=True)
+            results = self._execute_query(query, (*params, *page_params), fetch_all=True)
             properties = []
             for result in results:
                 prop_dict = dict(result)
@@ -496,12 +864,6 @@ class MySQLRealEstateRepository:
                 }
                 properties.append(Property(**prop_dict))
             
-            if filters.min_floor_level is not None:
-                properties = [
-                    prop for prop in properties 
-                    if prop.floor_level is not None and prop.floor_level >= filters.min_floor_level
-                ]
-            
             return properties
         except Exception as e:
             raise DatabaseError(f"MySQL error while querying properties: {e}")
@@ -512,67 +874,64 @@ class MySQLRealEstateRepository:
         except Exception as e:
             raise DatabaseError(f"MySQL error while deleting property: {e}")
 
-    def count_properties_by_status(self) -> dict[PropertyStatus, int]:
+    def get_property_price_groups(self) -> List[Dict[str, Any]]:
+        """
+        Listing counts grouped by status, type, site and price in one scan, for analytics
+        rollups (medians can be derived from the per-price counts).
+        """
         try:
-            counts = {}
-            for status in PropertyStatus:
-                query = "SELECT COUNT(*) as count FROM properties WHERE status = %s"
-                result = self._execute_query(query, (status.value,), fetch_one=True)
-                counts[status] = result['count']
-            return counts
+            query = """
+                SELECT status, property_type, location_site, price_etb, COUNT(*) AS n
+                FROM properties
+                GROUP BY status, property_type, location_site, price_etb
+            """
+            return self._execute_query(query, fetch_all=True)
         except Exception as e:
-            raise DatabaseError(f"MySQL error while counting properties: {e}")
+            raise DatabaseError(f"MySQL error while grouping properties: {e}")
 
     # --- Car Methods ---
+    @staticmethod
+    def _car_row(car_data: CarCreate, cid: str, status: CarStatus, now: datetime) -> Dict[str, Any]:
+        """The cars row for a new listing."""
+        return {
+            "cid": cid,
+            "car_type": car_data.car_type.value,
+            "price_etb": _decimal(car_data.price_etb),
+            "manufacturer": car_data.manufacturer,
+            "model_name": car_data.model_name,
+            "model_year": car_data.model_year,
+            "color": car_data.color,
+            "plate": car_data.plate,
+            "engine": car_data.engine,
+            "power_hp": car_data.power_hp,
+            "transmission": car_data.transmission,
+            "fuel_efficiency_kmpl": _decimal(car_data.fuel_efficiency_kmpl),
+            "motor_type": car_data.motor_type,
+            "mileage_km": _decimal(car_data.mileage_km),
+            "description": car_data.description,
+            "broker_id": car_data.broker_id,
+            "broker_name": car_data.broker_name,
+            "broker_phone": car_data.broker_phone,
+            "status": status.value,
+            "created_at": now,
+            "updated_at": now
+        }
+
     def create_car(self, car_data: CarCreate) -> Car:
         try:
             cid = str(uuid.uuid4())
-            now = datetime.now(timezone.utc)
-            
-            car_dict = {
-                "cid": cid,
-                "car_type": car_data.car_type.value,
-                "price_etb": car_data.price_etb,
-                "manufacturer": car_data.manufacturer,
-                "model_name": car_data.model_name,
-                "model_year": car_data.model_year,
-                "color": car_data.color,
-                "plate": car_data.plate,
-                "engine": car_data.engine,
-                "power_hp": car_data.power_hp,
-                "transmission": car_data.transmission,
-                "fuel_efficiency_kmpl": car_data.fuel_efficiency_kmpl,
-                "motor_type": car_data.motor_type,
-                "mileage_km": car_data.mileage_km,
-                "description": car_data.description,
-                "broker_id": car_data.broker_id,
-                "broker_name": car_data.broker_name,
-                "broker_phone": car_data.broker_phone,
-                "status": CarStatus.PENDING.value,
-                "created_at": now,
-                "updated_at": now
-            }
-            
-            car_query = """
-                INSERT INTO cars (
-                    cid, car_type, price_etb, manufacturer, model_name, model_year,
-                    color, plate, engine, power_hp, transmission, fuel_efficiency_kmpl,
-                    motor_type, mileage_km, description, broker_id, broker_name,
-                    broker_phone, status, created_at, updated_at
-                ) VALUES (
-                    %(cid)s, %(car_type)s, %(price_etb)s, %(manufacturer)s, %(model_name)s, %(model_year)s,
-                    %(color)s, %(plate)s, %(engine)s, %(power_hp)s, %(transmission)s, %(fuel_efficiency_kmpl)s,
-                    %(motor_type)s, %(mileage_km)s, %(description)s, %(broker_id)s, %(broker_name)s,
-                    %(broker_phone)s, %(status)s, %(created_at)s, %(updated_at)s
-                )
-            """
-            self._execute_query(car_query, car_dict)
+            car_dict = self._car_row(car_data, cid, CarStatus.PENDING, _db_now())
+            self._ensure_activity_table()
+            with self._transaction() as cursor:
+                cursor.execute(_CAR_INSERT, car_dict)
+                if car_data.images:
+                    cursor.executemany(
+                        "INSERT INTO car_images (car_id, image_url, image_order) VALUES (%s, %s, %s)",
+                        [(cid, image_url, i) for i, image_url in enumerate(car_data.images)]
+                    )
+                self._count_activity(cursor, "car", "submitted", [cid], car_dict["created_at"].date())
             
-            for i, image_url in enumerate(car_data.images):
-                img_query = "INSERT INTO car_images (car_id, image_url, image_order) VALUES (%s, %s, %s)"
-                self._execute_query(img_query, (cid, image_url, i))
-            
-            return self.get_car_by_id(cid)
+            return Car(**car_dict, images=list(car_data.images))
         except Exception as e:
             raise DatabaseError(f"MySQL error while creating car: {e}")
 
@@ -615,22 +974,27 @@ class MySQLRealEstateRepository:
         except Exception as e:
             raise DatabaseError(f"MySQL error while getting cars by broker ID: {e}")
 
+    @staticmethod
+    def _car_where(filters: CarFilter, status: Optional[CarStatus] = CarStatus.APPROVED):
+        """Builds the WHERE clause and params of a car search; status None matches every status."""
+        where_conditions, params = ["1 = 1"], []
+        if status:
+            where_conditions = ["c.status = %s"]
+            params = [status.value]
+        if filters.car_type:
+            where_conditions.append("c.car_type = %s")
+            params.append(filters.car_type.value)
+        if filters.min_price:
+            where_conditions.append("c.price_etb >= %s")
+            params.append(filters.min_price)
+        if filters.max_price:
+            where_conditions.append("c.price_etb <= %s")
+            params.append(filters.max_price)
+        return " AND ".join(where_conditions), params
+
     def query_cars(self, filters: CarFilter) -> List[Car]:
         try:
-            where_conditions = ["c.status = %s"]
-            params = [CarStatus.APPROVED.value]
-            
-            if filters.car_type:
-                where_conditions.append("c.car_type = %s")
-                params.append(filters.car_type.value)
-            if filters.min_price:
-                where_conditions.append("c.price_etb >= %s")
-                params.append(filters.min_price)
-            if filters.max_price:
-                where_conditions.append("c.price_etb <= %s")
-                params.append(filters.max_price)
-            
-            where_clause = " AND ".join(where_conditions)
+            where_clause, params = self._car_where(filters)
             
             query = f"""
                 SELECT c.*, GROUP_CONCAT(ci.image_url ORDER BY ci.image_order) as images
@@ -638,6 +1002,7 @@ class MySQLRealEstateRepository:
                 LEFT JOIN car_images ci ON c.cid = ci.car_id
                 WHERE {where_clause}
                 GROUP BY c.cid
+                ORDER BY c.created_at DESC, c.cid
             """
             
             results = self._execute_query(query, tuple(params), fetch_all=True)
@@ -656,11 +1021,28 @@ class MySQLRealEstateRepository:
         except Exception as e:
             raise DatabaseError(f"MySQL error while deleting car: {e}")
 
-    def update_car_status(self, cid: str, status: CarStatus) -> Car:
+    def update_car_status(self, cid: str, status: CarStatus, from_statuses: Optional[List[CarStatus]] = None) -> Car:
+        """
+        Sets a car's status only if it is currently in one of `from_statuses` (any other
+        status when not given), with one conditional UPDATE (see transition_property_status).
+        """
+        allowed = [s.value for s in (from_statuses if from_statuses is not None else CarStatus) if s != status]
+        changes = {"status": status.value, "updated_at": _db_now()}
         try:
-            query = "UPDATE cars SET status = %s, updated_at = %s WHERE cid = %s"
-            self._execute_query(query, (status.value, datetime.now(timezone.utc), cid))
-            return self.get_car_by_id(cid)
+            self._ensure_activity_table()
+            with self._transaction() as cursor:
+                row, images, updated = self._transition_one(cursor, "car", cid, allowed, changes)
+                if row is None:
+                    raise PropertyNotFoundError(identifier=cid)
+                if not updated:
+                    raise InvalidOperationError(
+                        f"Cannot change car status to '{status.value}'. Current status is '{row['status']}'."
+                    )
+                self._count_activity(cursor, "car", status.value, [cid], changes['updated_at'].date())
+
+            return Car(**{**row, 'images': images})
+        except (PropertyNotFoundError, InvalidOperationError):
+            raise
         except Exception as e:
             raise DatabaseError(f"MySQL error while updating car status: {e}")
 
@@ -682,16 +1064,554 @@ class MySQLRealEstateRepository:
         except Exception as e:
             raise DatabaseError(f"MySQL error while listing cars: {e}")
 
-    def count_cars_by_status(self) -> dict[CarStatus, int]:
+    def get_car_price_groups(self) -> List[Dict[str, Any]]:
+        """Car counts grouped by status, type and price in one scan, for analytics rollups."""
+        try:
+            query = """
+                SELECT status, car_type, price_etb, COUNT(*) AS n
+                FROM cars
+                GROUP BY status, car_type, price_etb
+            """
+            return self._execute_query(query, fetch_all=True)
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while grouping cars: {e}")
+
+    # --- Bulk Import & Moderation ---
+    def _ensure_notifications_table(self):
+        """Creates the broker notification outbox if it does not exist."""
+        if getattr(self, '_notifications_table_checked', False):
+            return
+        self._execute_query(
+            """
+            CREATE TABLE IF NOT EXISTS broker_notifications (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                broker_id VARCHAR(36) NOT NULL,
+                kind VARCHAR(16) NOT NULL,
+                listing_id VARCHAR(36) NOT NULL,
+                event VARCHAR(16) NOT NULL,
+                reason TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                sent_at TIMESTAMP NULL DEFAULT NULL,
+                INDEX idx_unsent (sent_at, id)
+            ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+            """
+        )
+        self._notifications_table_checked = True
+
+    @staticmethod
+    def _count_activity(cursor, kind: str, event: str, ids: List[str], day) -> None:
+        """
+        Adds the listings in `ids` to the activity rollup, per site, and for approvals and
+        sales their prices too, with one grouped INSERT ... SELECT each. Runs on the caller's
+        cursor so the rollup commits (or rolls back) with the listing change.
+        """
+        event = getattr(event, "value", event)
+        if event not in _ACTIVITY_EVENTS or not ids:
+            return
+        table, id_col, *_, site_sql = _LISTING_TABLES[kind]
+        in_ids = f"{id_col} IN ({', '.join(['%s'] * len(ids))})"
+        cursor.execute(
+            f"""
+            INSERT INTO listing_activity_daily (day, kind, location_site, event, n)
+            SELECT %s, %s, {site_sql}, %s, COUNT(*)
+            FROM {table}
+            WHERE {in_ids}
+            GROUP BY {site_sql}
+            ON DUPLICATE KEY UPDATE n = n + VALUES(n)
+            """,
+            (day, kind, event, *ids)
+        )
+        if event in _PRICED_EVENTS:
+            cursor.execute(
+                f"""
+                INSERT INTO listing_activity_prices (day, kind, location_site, event, price_etb, n)
+                SELECT %s, %s, {site_sql}, %s, price_etb, COUNT(*)
+                FROM {table}
+                WHERE {in_ids}
+                GROUP BY {site_sql}, price_etb
+                ON DUPLICATE KEY UPDATE n = n + VALUES(n)
+                """,
+                (day, kind, event, *ids)
+            )
+
+    def _insert_listings(self, kind: str, insert_sql: str, rows: List[Dict[str, Any]], images: Dict[str, List[str]]) -> None:
+        """
+        Inserts new listings and their images with one multi-row INSERT each, in one transaction,
+        and counts them in the activity rollup (as submitted, and approved if imported approved).
+        """
+        _, id_col, img_table, img_fk = _LISTING_TABLES[kind][:4]
+        ids = [row[id_col] for row in rows]
+        image_rows = [(i, url, order) for i in ids for order, url in enumerate(images.get(i, []))]
+        self._ensure_activity_table()
+        with self._transaction() as cursor:
+            cursor.executemany(insert_sql, rows)
+            if image_rows:
+                cursor.executemany(
+                    f"INSERT INTO {img_table} ({img_fk}, image_url, image_order) VALUES (%s, %s, %s)", image_rows
+                )
+            day = rows[0]["created_at"].date()
+            self._count_activity(cursor, kind, "submitted", ids, day)
+            if rows[0]["status"] == "approved":
+                self._count_activity(cursor, kind, "approved", ids, day)
+
+    def create_properties(self, items: List[PropertyCreate], status: PropertyStatus = PropertyStatus.PENDING) -> List[Property]:
+        """Bulk counterpart of create_property, for imports."""
+        if not items:
+            return []
+        try:
+            now = _db_now()
+            rows = [self._property_row(item, str(uuid.uuid4()), status, now) for item in items]
+            images = {row["pid"]: list(item.image_urls) for row, item in zip(rows, items)}
+            self._insert_listings("property", _PROPERTY_INSERT, rows, images)
+            return [self._property_from_row(row, images[row["pid"]]) for row in rows]
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while creating properties: {e}")
+
+    def create_cars(self, items: List[CarCreate], status: CarStatus = CarStatus.PENDING) -> List[Car]:
+        """Bulk counterpart of create_car, for imports."""
+        if not items:
+            return []
+        try:
+            now = _db_now()
+            rows = [self._car_row(item, str(uuid.uuid4()), status, now) for item in items]
+            images = {row["cid"]: list(item.images) for row, item in zip(rows, items)}
+            self._insert_listings("car", _CAR_INSERT, rows, images)
+            return [Car(**row, images=images[row["cid"]]) for row in rows]
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while creating cars: {e}")
+
+    def _bulk_transition(self, kind: str, ids: List[str], from_statuses: List[str], to_status: str,
+                         updates: Optional[Dict[str, Any]], reason: Optional[str]) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Moves every listing in `ids` that is in one of `from_statuses` to `to_status` in one
+        transaction: the rows are locked, updated with one UPDATE, counted in the activity
+        rollup and, for approvals and rejections, queued for their brokers with one INSERT ... SELECT each.
+        Returns the changed rows (with the changes and images applied) and the status
+        every found listing had before the call.
+        """
+        table, id_col, img_table, img_fk, img_field = _LISTING_TABLES[kind][:5]
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return [], {}
+        changes = {"status": to_status, **_column_values(updates or {}), "updated_at": _db_now()}
+        self._ensure_activity_table()
+        self._ensure_notifications_table()
+        with self._transaction() as cursor:
+            cursor.execute(f"SELECT * FROM {table} WHERE {id_col} IN ({', '.join(['%s'] * len(ids))}) FOR UPDATE", ids)
+            rows = {row[id_col]: row for row in cursor.fetchall()}
+            moved = [i for i in ids if i in rows and rows[i]['status'] in from_statuses]
+            if not moved:
+                return [], {i: row['status'] for i, row in rows.items()}
+            in_moved = f"{id_col} IN ({', '.join(['%s'] * len(moved))})"
+
+            set_sql = ", ".join(f"{key} = %s" for key in changes)
+            cursor.execute(f"UPDATE {table} SET {set_sql} WHERE {in_moved}", (*changes.values(), *moved))
+            self._count_activity(cursor, kind, to_status, moved, changes["updated_at"].date())
+            if to_status in BROKER_NOTIFIED_EVENTS:
+                cursor.execute(
+                    f"""
+                    INSERT INTO broker_notifications (broker_id, kind, listing_id, event, reason, created_at)
+                    SELECT broker_id, %s, {id_col}, %s, %s, %s
+                    FROM {table}
+                    WHERE {in_moved} AND broker_id IS NOT NULL AND broker_id <> ''
+                    """,
+                    (kind, to_status, reason, changes["updated_at"], *moved)
+                )
+            cursor.execute(
+                f"SELECT {img_fk} AS id, image_url FROM {img_table} WHERE {img_fk} IN ({', '.join(['%s'] * len(moved))}) "
+                f"ORDER BY {img_fk}, image_order",
+                moved
+            )
+            images: Dict[str, List[str]] = {}
+            for img in cursor.fetchall():
+                images.setdefault(img['id'], []).append(img['image_url'])
+
+        changed = [{**rows[i], **changes, img_field: images.get(i, [])} for i in moved]
+        return changed, {i: row['status'] for i, row in rows.items()}
+
+    def _bulk_delete(self, kind: str, ids: List[str]) -> List[str]:
+        """Deletes the listings in `ids` with one statement; returns the ids that existed."""
+        table, id_col = _LISTING_TABLES[kind][:2]
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        placeholders = ", ".join(["%s"] * len(ids))
+        with self._transaction() as cursor:
+            cursor.execute(f"SELECT {id_col} AS id FROM {table} WHERE {id_col} IN ({placeholders}) FOR UPDATE", ids)
+            found = {row['id'] for row in cursor.fetchall()}
+            cursor.execute(f"DELETE FROM {table} WHERE {id_col} IN ({placeholders})", ids)
+        return [i for i in ids if i in found]
+
+    def bulk_transition_properties(self, pids: List[str], from_statuses: List[PropertyStatus], to_status: PropertyStatus,
+                                   updates: Optional[Dict[str, Any]] = None,
+                                   reason: Optional[str] = None) -> Tuple[List[Property], Dict[str, str]]:
+        try:
+            rows, statuses = self._bulk_transition(
+                "property", pids, [s.value for s in from_statuses], to_status.value, updates, reason
+            )
+            return [self._property_from_row(row, row['image_urls']) for row in rows], statuses
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while changing property statuses: {e}")
+
+    def bulk_transition_cars(self, cids: List[str], from_statuses: List[CarStatus], to_status: CarStatus,
+                             reason: Optional[str] = None) -> Tuple[List[Car], Dict[str, str]]:
+        try:
+            rows, statuses = self._bulk_transition(
+                "car", cids, [s.value for s in from_statuses], to_status.value, None, reason
+            )
+            return [Car(**row) for row in rows], statuses
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while changing car statuses: {e}")
+
+    def delete_properties(self, pids: List[str]) -> List[str]:
+        try:
+            return self._bulk_delete("property", pids)
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while deleting properties: {e}")
+
+    def delete_cars(self, cids: List[str]) -> List[str]:
+        try:
+            return self._bulk_delete("car", cids)
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while deleting cars: {e}")
+
+    def get_pending_broker_notifications(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Oldest unsent notifications from the outbox."""
+        try:
+            self._ensure_notifications_table()
+            return self._execute_query(
+                """
+                SELECT id, broker_id, kind, listing_id, event, reason
+                FROM broker_notifications
+                WHERE sent_at IS NULL
+                ORDER BY id
+                LIMIT %s
+                """,
+                (limit,),
+                fetch_all=True
+            )
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while reading broker notifications: {e}")
+
+    def mark_broker_notifications_sent(self, ids: List[int]) -> None:
+        if not ids:
+            return
+        try:
+            self._execute_query(
+                f"UPDATE broker_notifications SET sent_at = %s WHERE id IN ({', '.join(['%s'] * len(ids))})",
+                (_db_now(), *ids)
+            )
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while marking broker notifications sent: {e}")
+
+    # --- Projected Queries ---
+    @staticmethod
+    def _select_columns(kind: str, alias: str, columns: List[str]) -> str:
+        """
+        The SELECT list for `columns` of a listing table. "cover_image" is the first image, from
+        a correlated subquery on the image table's index. The image field (image_urls/images) is
+        not selected here; the listing id is, and _add_images loads the lists afterwards.
+        """
+        table, id_col, img_table, img_fk, img_field = _LISTING_TABLES[kind][:5]
+        selects = []
+        for column in columns:
+            if column == "cover_image":
+                selects.append(
+                    f"(SELECT i.image_url FROM {img_table} i WHERE i.{img_fk} = {alias}.{id_col} "
+                    f"ORDER BY i.image_order LIMIT 1) AS cover_image"
+                )
+            elif column == img_field:
+                if id_col not in columns:
+                    selects.append(f"{alias}.{id_col}")
+            elif column.isidentifier():
+                selects.append(f"{alias}.{column}")
+            else:
+                raise ValueError(f"Invalid column name: {column!r}")
+        return ", ".join(selects)
+
+    def _add_images(self, kind: str, rows: List[Dict[str, Any]], columns: List[str]) -> List[Dict[str, Any]]:
+        """Fills the image field of projected rows, when requested, with one IN query over the page's ids."""
+        id_col, img_field = _LISTING_TABLES[kind][1], _LISTING_TABLES[kind][4]
+        if img_field not in columns:
+            return rows
+        images = self._images_by_id(kind, [row[id_col] for row in rows])
+        for row in rows:
+            row[img_field] = images.get(row[id_col], [])
+            if id_col not in columns:
+                del row[id_col]
+        return rows
+
+    def query_property_columns(self, filters: PropertyFilter, columns: List[str],
+                               limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Like query_properties, but only the given columns, as plain rows."""
+        try:
+            where_clause, params = self._property_where(filters)
+            page_sql, page_params = self._page_clause(limit, offset)
+            query = f"""
+                SELECT {self._select_columns("property", "p", columns)}
+                FROM properties p
+                WHERE {where_clause}
+                ORDER BY p.created_at DESC, p.pid{page_sql}
+            """
+            rows = self._execute_query(query, (*params, *page_params), fetch_all=True)
+            return self._add_images("property", rows, columns)
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while querying property columns: {e}")
+
+    def query_car_columns(self, filters: CarFilter, columns: List[str]) -> List[Dict[str, Any]]:
+        """Like query_cars, but only the given columns, as plain rows."""
+        try:
+            where_clause, params = self._car_where(filters)
+            query = f"""
+                SELECT {self._select_columns("car", "c", columns)}
+                FROM cars c
+                WHERE {where_clause}
+                ORDER BY c.created_at DESC, c.cid
+            """
+            rows = self._execute_query(query, tuple(params), fetch_all=True)
+            return self._add_images("car", rows, columns)
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while querying car columns: {e}")
+
+    # --- Listing Versions ---
+    def get_listing_stamp(self, kind: str) -> Dict[str, Any]:
+        """The newest updated_at and the row count of a listing table, to tell when it changed."""
+        table = _LISTING_TABLES[kind][0]
+        try:
+            return self._execute_query(f"SELECT MAX(updated_at) AS updated_at, COUNT(*) AS n FROM {table}", fetch_one=True)
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while reading the {table} version: {e}")
+
+    # --- Batch Fetch ---
+    def _listings_by_ids(self, kind: str, ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Loads the listings in `ids` with one query for the rows and one for their images,
+        in the requested order. Unknown ids are simply absent from the result.
+        """
+        table, id_col, _, _, img_field = _LISTING_TABLES[kind][:5]
+        ids = list(dict.fromkeys(i for i in ids if i))
+        if not ids:
+            return []
+        # Both reads run in one transaction so they see the same snapshot
+        with self._transaction() as cursor:
+            cursor.execute(f"SELECT * FROM {table} WHERE {id_col} IN ({', '.join(['%s'] * len(ids))})", ids)
+            rows = {row[id_col]: row for row in cursor.fetchall()}
+            images = self._images_by_id(kind, list(rows), cursor)
+        return [{**rows[i], img_field: images.get(i, [])} for i in ids if i in rows]
+
+    def _images_by_id(self, kind: str, ids: List[str], cursor=None) -> Dict[str, List[str]]:
+        """The image URLs of each listing in `ids`, in image order, read with one IN query (on `cursor` if given)."""
+        img_table, img_fk = _LISTING_TABLES[kind][2:4]
+        images: Dict[str, List[str]] = {}
+        if not ids:
+            return images
+        query = (
+            f"SELECT {img_fk} AS id, image_url FROM {img_table} WHERE {img_fk} IN ({', '.join(['%s'] * len(ids))}) "
+            f"ORDER BY {img_fk}, image_order"
+        )
+        if cursor is None:
+            rows = self._execute_query(query, tuple(ids), fetch_all=True)
+        else:
+            cursor.execute(query, list(ids))
+            rows = cursor.fetchall()
+        for img in rows:
+            images.setdefault(img['id'], []).append(img['image_url'])
+        return images
+
+    def get_properties_by_ids(self, pids: List[str]) -> List[Property]:
+        """Properties of any status in the order of `pids`; unknown ids are skipped."""
+        try:
+            return [self._property_from_row(row, row['image_urls']) for row in self._listings_by_ids("property", pids)]
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while getting properties by IDs: {e}")
+
+    def get_cars_by_ids(self, cids: List[str]) -> List[Car]:
+        """Cars of any status in the order of `cids`; unknown ids are skipped."""
+        try:
+            return [Car(**row) for row in self._listings_by_ids("car", cids)]
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while getting cars by IDs: {e}")
+
+    # --- Streaming Export ---
+    def _stream_rows(self, query: str, params: tuple, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the rows of a query through a server-side cursor, `batch_size` at a time, so
+        memory stays flat however many rows match. The connection stays open until the
+        generator is exhausted or closed.
+        """
+        conn = None
+        try:
+            conn = pymysql.connect(**{**self._connection_params, 'cursorclass': pymysql.cursors.SSDictCursor})
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while streaming rows: {e}")
+        finally:
+            # Closing the connection (not the cursor) abandons unread rows instead of draining them
+            if conn is not None:
+                conn.close()
+
+    def _stream_with_images(self, kind: str, rows: Iterator[Dict[str, Any]],
+                            batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Adds the image URLs of streamed listing rows, joined by "|", reading them with one
+        ordered query per `batch_size` rows instead of a GROUP_CONCAT, which would cut long
+        lists at group_concat_max_len.
+        """
+        id_col, img_field = _LISTING_TABLES[kind][1], _LISTING_TABLES[kind][4]
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            images = self._images_by_id(kind, [row[id_col] for row in batch])
+            for row in batch:
+                row[img_field] = "|".join(images.get(row[id_col], []))
+                yield row
+
+    def stream_properties(self, filters: PropertyFilter) -> Iterator[Dict[str, Any]]:
+        """
+        Flat property rows (any status unless filtered) with image URLs joined by "|", in pid
+        order. The importer splits the cell on "|" again, so URLs containing it don't round-trip.
+        """
+        where_clause, params = self._property_where(filters, any_status=True)
+        query = f"""
+            SELECT p.*
+            FROM properties p
+            WHERE {where_clause}
+            ORDER BY p.pid
+        """
+        return self._stream_with_images("property", self._stream_rows(query, tuple(params)))
+
+    def stream_cars(self, filters: CarFilter, status: Optional[CarStatus] = None) -> Iterator[Dict[str, Any]]:
+        """Flat car rows with image URLs joined by "|" (see stream_properties), in cid order."""
+        where_clause, params = self._car_where(filters, status)
+        query = f"""
+            SELECT c.*
+            FROM cars c
+            WHERE {where_clause}
+            ORDER BY c.cid
+        """
+        return self._stream_with_images("car", self._stream_rows(query, tuple(params)))
+
+    def stream_users(self, role: Optional[UserRole] = None, active: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        """User rows without password hashes, roles joined by "|", in uid order."""
+        where_conditions, params = ["1 = 1"], []
+        if role:
+            where_conditions.append("EXISTS (SELECT 1 FROM user_roles r WHERE r.user_id = u.uid AND r.role = %s)")
+            params.append(role.value)
+        if active is not None:
+            where_conditions.append("u.active = %s")
+            params.append(active)
+        query = f"""
+            SELECT u.uid, u.phone_number, u.telegram_id, u.display_name, u.language, u.active,
+                (SELECT GROUP_CONCAT(ur.role ORDER BY ur.role SEPARATOR '|')
+                 FROM user_roles ur WHERE ur.user_id = u.uid) AS roles,
+                u.created_at, u.updated_at
+            FROM users u
+            WHERE {' AND '.join(where_conditions)}
+            ORDER BY u.uid
+        """
+        return self._stream_rows(query, tuple(params))
+
+    # --- Activity Rollups ---
+    def _ensure_activity_table(self):
+        """Creates the activity rollup tables if they do not exist."""
+        if getattr(self, '_activity_table_checked', False):
+            return
+        self._execute_query(
+            """
+            CREATE TABLE IF NOT EXISTS listing_activity_daily (
+                day DATE NOT NULL,
+                kind VARCHAR(16) NOT NULL,
+                location_site VARCHAR(255) NOT NULL DEFAULT '',
+                event VARCHAR(16) NOT NULL,
+                n INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, day, location_site, event)
+            ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+            """
+        )
+        self._execute_query(
+            """
+            CREATE TABLE IF NOT EXISTS listing_activity_prices (
+                day DATE NOT NULL,
+                kind VARCHAR(16) NOT NULL,
+                location_site VARCHAR(255) NOT NULL DEFAULT '',
+                event VARCHAR(16) NOT NULL,
+                price_etb DECIMAL(15,2) NOT NULL,
+                n INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, day, location_site, event, price_etb)
+            ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+            """
+        )
+        self._activity_table_checked = True
+
+    def get_listing_activity(self, kind: str, since, site: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Daily rollup rows (day, location_site, event, n) from `since` onwards."""
+        return self._read_activity("listing_activity_daily", "day, location_site, event, n", kind, since, site)
+
+    def get_listing_activity_prices(self, kind: str, since, site: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Prices of the listings approved and sold from `since` onwards: rows (day, location_site, event, price_etb, n)."""
+        return self._read_activity(
+            "listing_activity_prices", "day, location_site, event, price_etb, n", kind, since, site
+        )
+
+    def _read_activity(self, table: str, columns: str, kind: str, since, site: Optional[str]) -> List[Dict[str, Any]]:
+        try:
+            self._ensure_activity_table()
+            query = f"SELECT {columns} FROM {table} WHERE kind = %s AND day >= %s"
+            params = [kind, since]
+            if site is not None:
+                query += " AND location_site = %s"
+                params.append(site)
+            return self._execute_query(query, tuple(params), fetch_all=True)
+        except Exception as e:
+            raise DatabaseError(f"MySQL error while reading listing activity: {e}")
+
+    def rebuild_listing_activity(self) -> int:
+        """
+        Recomputes the rollup from the listing tables in one transaction. Submissions
+        are dated by created_at; the current approved/rejected/sold status by updated_at,
+        since earlier transitions are not stored. Returns the number of count rows.
+        """
+        statements = ["DELETE FROM listing_activity_daily", "DELETE FROM listing_activity_prices"]
+        for kind in _LISTING_TABLES:
+            table, site_sql = _LISTING_TABLES[kind][0], _LISTING_TABLES[kind][5]
+            statements += [
+                f"""
+                INSERT INTO listing_activity_daily (day, kind, location_site, event, n)
+                SELECT DATE(created_at), '{kind}', {site_sql}, 'submitted', COUNT(*)
+                FROM {table}
+                GROUP BY DATE(created_at), {site_sql}
+                """,
+                f"""
+                INSERT INTO listing_activity_daily (day, kind, location_site, event, n)
+                SELECT DATE(updated_at), '{kind}', {site_sql}, status, COUNT(*)
+                FROM {table}
+                WHERE status IN ('approved', 'rejected', 'sold')
+                GROUP BY DATE(updated_at), {site_sql}, status
+                """,
+                f"""
+                INSERT INTO listing_activity_prices (day, kind, location_site, event, price_etb, n)
+                SELECT DATE(updated_at), '{kind}', {site_sql}, status, price_etb, COUNT(*)
+                FROM {table}
+                WHERE status IN ('approved', 'sold')
+                GROUP BY DATE(updated_at), {site_sql}, status, price_etb
+                """,
+            ]
+        self._ensure_activity_table()
         try:
-            counts = {}
-            for status in CarStatus:
-                query = "SELECT COUNT(*) as count FROM cars WHERE status = %s"
-                result = self._execute_query(query, (status.value,), fetch_one=True)
-                counts[status] = result['count']
-            return counts
+            with self._transaction() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute("SELECT COUNT(*) AS n FROM listing_activity_daily")
+                return cursor.fetchone()['n']
         except Exception as e:
-            raise DatabaseError(f"MySQL error while counting cars: {e}")
+            raise DatabaseError(f"MySQL error while rebuilding listing activity: {e}")
 
     def close(self):
         """No-op for sync connection if not pooling, or implement if needed."""
@@ -0,0 +1,114 @@
+# src/infrastructure/search/base.py
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, Optional
+
+from src.domain.models.property_models import Property, PropertyFilter, PropertyStatus
+
+logger = logging.getLogger(__name__)
+
+
+class SyncedPropertyIndex:
+    """
+    Base class for in-process indexes over APPROVED properties.
+
+    Subclasses implement _clear/_add/_discard. Callers keep the index current with
+    upsert/remove on every write made in this process, and call refresh(repo) before
+    reading so that writes made by other processes are applied: a delta by updated_at
+    every `sync_interval` seconds and a full rebuild (which also catches deletes)
+    every `rebuild_interval` seconds. Only rows read from the repository move the
+    sync watermark; a local write may be newer than writes other processes made
+    before it, and those must still be picked up by the next delta.
+    """
+    name = "property index"
+
+    def __init__(self, sync_interval: float = 30, rebuild_interval: float = 600):
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._rebuilt_at: Optional[float] = None
+        self._synced_at: float = 0.0
+        self.watermark: Optional[datetime] = None
+        self.last_rebuild_ms = 0.0
+
+    @staticmethod
+    def supports(filters: PropertyFilter) -> bool:
+        """Only approved listings are indexed; other statuses go to the database."""
+        return filters.status in (None, PropertyStatus.APPROVED)
+
+    # --- Subclass hooks (called with the lock held) ---
+    def _clear(self, expected_size: int) -> None:
+        raise NotImplementedError
+
+    def _add(self, prop: Property) -> None:
+        raise NotImplementedError
+
+    def _discard(self, pid: str) -> None:
+        raise NotImplementedError
+
+    def _load(self, repo) -> Iterable[Property]:
+        """Everything a full rebuild reads from the repository."""
+        return repo.query_properties(PropertyFilter(status=PropertyStatus.APPROVED))
+
+    # --- Maintenance ---
+    def _advance_watermark(self, prop: Property) -> None:
+        if prop.updated_at and (self.watermark is None or prop.updated_at > self.watermark):
+            self.watermark = prop.updated_at
+
+    def upsert(self, prop: Property) -> None:
+        """Indexes the property if it is approved, otherwise drops it from the index."""
+        with self._lock:
+            self._discard(prop.pid)
+            if prop.status == PropertyStatus.APPROVED:
+                self._add(prop)
+
+    def remove(self, pid: str) -> None:
+        with self._lock:
+            self._discard(pid)
+
+    def rebuild(self, properties: Iterable[Property]) -> None:
+        started = time.perf_counter()
+        properties = [p for p in properties if p.status == PropertyStatus.APPROVED]
+        with self._lock:
+            self._clear(len(properties))
+            self.watermark = None
+            for prop in properties:
+                self._add(prop)
+                self._advance_watermark(prop)
+        self.last_rebuild_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"{self.name.capitalize()} rebuilt with {len(properties)} listings in {self.last_rebuild_ms} ms.")
+
+    def expire(self, rebuild: bool = False) -> None:
+        """Makes the next refresh sync now (or rebuild, e.g. after deletes made elsewhere) instead of waiting for the interval."""
+        self._synced_at = 0.0
+        if rebuild and self._rebuilt_at is not None:
+            self._rebuilt_at = float("-inf")
+
+    def refresh(self, repo) -> None:
+        """Rebuilds from the repository when due, otherwise applies rows changed since the last sync."""
+        now = time.monotonic()
+        if self._rebuilt_at is not None and now - self._synced_at < self.sync_interval:
+            return
+        first_load = self._rebuilt_at is None
+        # Only one thread refreshes; the others keep serving the current index (unless it was never built)
+        if not self._refresh_lock.acquire(blocking=first_load):
+            return
+        try:
+            now = time.monotonic()
+            if self._rebuilt_at is None or now - self._rebuilt_at >= self.rebuild_interval:
+                self.rebuild(self._load(repo))
+                self._rebuilt_at = now
+            elif now - self._synced_at >= self.sync_interval and self.watermark is not None:
+                for prop in repo.get_properties_updated_since(self.watermark):
+                    self.upsert(prop)
+                    self._advance_watermark(prop)
+            self._synced_at = now
+        except Exception as e:
+            logger.error(f"Failed to refresh {self.name}: {e}")
+            if self._rebuilt_at is None:
+                raise
+        finally:
+            self._refresh_lock.release()
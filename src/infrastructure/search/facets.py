@@ -0,0 +1,74 @@
+# src/infrastructure/search/facets.py
+import bisect
+from typing import Iterable, List, Optional, Sequence
+
+from src.domain.models.property_models import Property
+from .filters import enum_value
+
+# Fields counted by value; bedrooms and the price bucket are counted separately
+FACET_FIELDS = ("property_type", "location_site", "condominium_scheme", "furnishing_status")
+
+
+# Prices are stored with two decimals, so this is the gap between adjacent prices
+PRICE_STEP = 0.01
+
+
+def price_ranges(price_bounds: Sequence[float]) -> List[dict]:
+    """
+    The price buckets cut at `price_bounds`, with zero counts. Bucket i holds
+    bounds[i-1] <= price < bounds[i], with an open first and last bucket. "max" is the
+    highest price in the bucket, so min_price/max_price filters (both inclusive) built
+    from a bucket never overlap the next one.
+    """
+    edges = [None, *price_bounds, None]
+    return [
+        {"min": lo, "max": round(hi - PRICE_STEP, 2) if hi is not None else None, "count": 0}
+        for lo, hi in zip(edges, edges[1:])
+    ]
+
+
+def empty_facets(price_bounds: Sequence[float]) -> dict:
+    """The facet payload with zero counts; there are len(price_bounds) + 1 price buckets."""
+    return {
+        "total": 0,
+        **{field: {} for field in FACET_FIELDS},
+        "bedrooms": {},
+        "price": price_ranges(price_bounds),
+    }
+
+
+def price_bucket(price: float, price_bounds: Sequence[float]) -> int:
+    """Index of the bucket a price falls in (same result as MySQL's INTERVAL())."""
+    return bisect.bisect_right(price_bounds, price)
+
+
+def add_facet_row(facets: dict, row: dict, count: int) -> None:
+    """Adds `count` listings sharing the facet values in `row` (FACET_FIELDS, bedrooms, price_bucket)."""
+    facets["total"] += count
+    for field in FACET_FIELDS:
+        value = enum_value(row.get(field))
+        if value is not None and value != "":
+            facets[field][value] = facets[field].get(value, 0) + count
+    bedrooms = row.get("bedrooms")
+    if bedrooms is not None:
+        key = str(int(bedrooms))
+        facets["bedrooms"][key] = facets["bedrooms"].get(key, 0) + count
+    bucket: Optional[int] = row.get("price_bucket")
+    if bucket is not None:
+        facets["price"][int(bucket)]["count"] += count
+
+
+def count_facets(properties: Iterable[Property], price_bounds: Sequence[float]) -> dict:
+    """Facet counts over already-filtered properties, in one pass."""
+    facets = empty_facets(price_bounds)
+    for prop in properties:
+        row = {
+            "property_type": prop.property_type,
+            "location_site": prop.location.site,
+            "condominium_scheme": prop.condominium_scheme,
+            "furnishing_status": prop.furnishing_status,
+            "bedrooms": prop.bedrooms,
+            "price_bucket": price_bucket(prop.price_etb, price_bounds),
+        }
+        add_facet_row(facets, row, 1)
+    return facets
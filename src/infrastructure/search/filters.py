@@ -0,0 +1,91 @@
+# src/infrastructure/search/filters.py
+from typing import List, Tuple
+
+from src.domain.models.property_models import Property, PropertyFilter
+
+# Boolean amenity filters -> the Property attribute they test
+FLAG_FILTERS = {
+    "filter_is_commercial": "is_commercial",
+    "filter_has_elevator": "has_elevator",
+    "filter_has_private_rooftop": "has_private_rooftop",
+    "filter_is_two_story_penthouse": "is_two_story_penthouse",
+    "filter_has_private_entrance": "has_private_entrance",
+}
+
+
+def enum_value(value):
+    """The plain value of an enum member; other values are returned as they are."""
+    return getattr(value, "value", value)
+
+
+def property_keys(prop: Property) -> List[Tuple[str, object]]:
+    """The (field, value) pairs a property is listed under for equality filters."""
+    keys = [
+        ("property_type", enum_value(prop.property_type)),
+        ("location_region", prop.location.region),
+    ]
+    if prop.location.site:
+        keys.append(("location_site", prop.location.site))
+    for field in ("condominium_scheme", "furnishing_status"):
+        value = getattr(prop, field)
+        if value is not None:
+            keys.append((field, enum_value(value)))
+    for flag in FLAG_FILTERS.values():
+        value = getattr(prop, flag)
+        if value is not None:
+            keys.append((flag, bool(value)))
+    return keys
+
+
+def filter_keys(filters: PropertyFilter) -> List[Tuple[str, object]]:
+    """The equality keys that a filter requires, mirroring the SQL WHERE clause."""
+    keys = []
+    if filters.property_type:
+        keys.append(("property_type", enum_value(filters.property_type)))
+    if filters.location_region:
+        keys.append(("location_region", filters.location_region))
+    if filters.location_site:
+        keys.append(("location_site", filters.location_site))
+    if filters.condominium_scheme:
+        keys.append(("condominium_scheme", enum_value(filters.condominium_scheme)))
+    if filters.furnishing_status:
+        keys.append(("furnishing_status", enum_value(filters.furnishing_status)))
+    for filter_name, flag in FLAG_FILTERS.items():
+        value = getattr(filters, filter_name)
+        if value is not None:
+            keys.append((flag, bool(value)))
+    return keys
+
+
+def filter_ranges(filters: PropertyFilter) -> List[Tuple[str, str, float]]:
+    """The (field, op, bound) range terms of a filter, with the same truthiness rules as SQL."""
+    terms = []
+    if filters.min_bedrooms:
+        terms.append(("bedrooms", ">=", filters.min_bedrooms))
+    if filters.max_bedrooms:
+        terms.append(("bedrooms", "<=", filters.max_bedrooms))
+    if filters.min_price:
+        terms.append(("price_etb", ">=", filters.min_price))
+    if filters.max_price:
+        terms.append(("price_etb", "<=", filters.max_price))
+    if filters.min_size_sqm:
+        terms.append(("size_sqm", ">=", filters.min_size_sqm))
+    if filters.max_size_sqm:
+        terms.append(("size_sqm", "<=", filters.max_size_sqm))
+    if filters.min_floor_level is not None:
+        terms.append(("floor_level", ">=", filters.min_floor_level))
+    return terms
+
+
+def matches_filter(prop: Property, filters: PropertyFilter) -> bool:
+    """Evaluates a filter's equality and range predicates (not status or q) against one property."""
+    listed_under = set(property_keys(prop))
+    if any(key not in listed_under for key in filter_keys(filters)):
+        return False
+    for field, op, bound in filter_ranges(filters):
+        value = getattr(prop, field)
+        if value is None:
+            return False
+        if (op == ">=" and value < bound) or (op == "<=" and value > bound):
+            return False
+    return True
@@ -0,0 +1,96 @@
+# src/infrastructure/search/price_buckets.py
+import bisect
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.domain.models.property_models import PropertyFilter, PropertyStatus
+from .base import SyncedPropertyIndex
+from .facets import price_ranges
+from .filters import enum_value
+
+
+class _PriceRow(NamedTuple):
+    """The columns of an approved listing a rebuild reads, in place of the full Property."""
+    pid: str
+    property_type: str
+    price_etb: float
+    updated_at: Optional[datetime]
+    status: PropertyStatus = PropertyStatus.APPROVED
+
+
+def _round_price(price: float) -> float:
+    """Rounds a bucket edge to two significant figures so button labels stay readable."""
+    return float(f"{price:.2g}")
+
+
+class PriceDistribution(SyncedPropertyIndex):
+    """
+    Sorted prices of approved listings, overall and per property type.
+
+    Approvals, sales and deletes insert or remove a single price (O(log n) search),
+    so price buckets can be cut at the current quantiles without rescanning listings.
+    """
+    name = "price distribution"
+
+    def __init__(self, sync_interval: float = 30, rebuild_interval: float = 600):
+        super().__init__(sync_interval=sync_interval, rebuild_interval=rebuild_interval)
+        self._prices: Dict[Optional[str], List[float]] = {}  # None holds every type
+        self._entries: Dict[str, Tuple[str, float]] = {}
+
+    def _load(self, repo) -> List[_PriceRow]:
+        rows = repo.query_property_columns(
+            PropertyFilter(status=PropertyStatus.APPROVED), ["pid", "property_type", "price_etb", "updated_at"]
+        )
+        return [_PriceRow(**row) for row in rows]
+
+    def _clear(self, expected_size: int) -> None:
+        self._prices = {}
+        self._entries = {}
+
+    def _add(self, prop) -> None:
+        prop_type, price = enum_value(prop.property_type), float(prop.price_etb)
+        self._entries[prop.pid] = (prop_type, price)
+        for key in (None, prop_type):
+            bisect.insort(self._prices.setdefault(key, []), price)
+
+    def _discard(self, pid: str) -> None:
+        entry = self._entries.pop(pid, None)
+        if entry is None:
+            return
+        prop_type, price = entry
+        for key in (None, prop_type):
+            prices = self._prices[key]
+            del prices[bisect.bisect_left(prices, price)]
+
+    def buckets(self, property_type: Optional[str] = None, count: int = 8) -> List[dict]:
+        """
+        Up to `count` price ranges holding roughly equal numbers of listings, each non-empty.
+        A range covers min <= price <= max (see price_ranges); the first has no min and the last no max.
+        """
+        with self._lock:
+            prices = self._prices.get(enum_value(property_type), [])
+            if not prices:
+                return []
+            n = len(prices)
+            bounds: List[float] = []
+            for i in range(1, count):
+                bound = _round_price(prices[i * n // count])
+                # Keep an edge only if the bucket it closes has listings in it
+                lower = bisect.bisect_left(prices, bounds[-1]) if bounds else 0
+                if bisect.bisect_left(prices, bound) > lower:
+                    bounds.append(bound)
+            while bounds and bisect.bisect_left(prices, bounds[-1]) == n:
+                bounds.pop()
+            result = price_ranges(bounds)
+            edges = [0, *(bisect.bisect_left(prices, bound) for bound in bounds), n]
+            for bucket, start, end in zip(result, edges, edges[1:]):
+                bucket["count"] = end - start
+            return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "listings": len(self._entries),
+                "by_type": {key: len(prices) for key, prices in self._prices.items() if key is not None},
+                "last_rebuild_ms": self.last_rebuild_ms,
+            }
@@ -0,0 +1,175 @@
+# src/infrastructure/search/property_index.py
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.models.property_models import Property, PropertyFilter
+from .base import SyncedPropertyIndex
+from .facets import FACET_FIELDS, empty_facets
+from .filters import property_keys, filter_keys, filter_ranges
+from .text_index import InvertedIndex, property_text
+
+logger = logging.getLogger(__name__)
+
+# Numeric columns, stored as float64 so a missing value can be NaN (never matches a range)
+NUMERIC_COLUMNS = ("price_etb", "bedrooms", "size_sqm", "floor_level", "created_at")
+
+
+class PropertySearchIndex(SyncedPropertyIndex):
+    """
+    An in-memory index of APPROVED properties for answering PropertyFilter queries.
+
+    Each property occupies a slot. Numeric fields live in NumPy columns; every enum
+    value and boolean flag has a boolean bitmap over the slots. A query ANDs the
+    bitmaps it needs with vectorized range masks (and the keyword matches for `q`),
+    then orders the matches by created_at (newest first, ties by pid), like the SQL query.
+    """
+    name = "property search index"
+
+    def __init__(self, sync_interval: float = 30, rebuild_interval: float = 600, initial_capacity: int = 1024):
+        super().__init__(sync_interval=sync_interval, rebuild_interval=rebuild_interval)
+        self._reset(initial_capacity)
+        self.queries = 0
+
+    def _reset(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._size = 0  # high-water mark of used slots
+        self._props: List[Optional[Property]] = [None] * capacity
+        # pids per slot, the tiebreak for equal created_at
+        self._pids = np.full(capacity, "", dtype=object)
+        self._keys: List[Optional[List[Tuple[str, object]]]] = [None] * capacity
+        self._slot_by_pid: Dict[str, int] = {}
+        self._free_slots: List[int] = []
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._columns = {name: np.full(capacity, np.nan) for name in NUMERIC_COLUMNS}
+        self._bitmaps: Dict[Tuple[str, object], np.ndarray] = {}
+        self._text = InvertedIndex()
+
+    def __len__(self) -> int:
+        return len(self._slot_by_pid)
+
+    # --- Maintenance ---
+    def _grow(self) -> None:
+        new_capacity = self._capacity * 2
+        extra = new_capacity - self._capacity
+        self._props.extend([None] * extra)
+        self._keys.extend([None] * extra)
+        self._pids = np.concatenate([self._pids, np.full(extra, "", dtype=object)])
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        for name, column in self._columns.items():
+            self._columns[name] = np.concatenate([column, np.full(extra, np.nan)])
+        for key, bitmap in self._bitmaps.items():
+            self._bitmaps[key] = np.concatenate([bitmap, np.zeros(extra, dtype=bool)])
+        self._capacity = new_capacity
+
+    def _clear(self, expected_size: int) -> None:
+        capacity = 1024
+        while capacity < expected_size:
+            capacity *= 2
+        self._reset(capacity)
+
+    def _add(self, prop: Property) -> None:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._size == self._capacity:
+                self._grow()
+            slot = self._size
+            self._size += 1
+        keys = property_keys(prop)
+        self._props[slot] = prop
+        self._keys[slot] = keys
+        self._slot_by_pid[prop.pid] = slot
+        self._pids[slot] = prop.pid
+        self._alive[slot] = True
+        self._columns["price_etb"][slot] = prop.price_etb
+        self._columns["bedrooms"][slot] = prop.bedrooms
+        self._columns["size_sqm"][slot] = prop.size_sqm
+        self._columns["floor_level"][slot] = prop.floor_level if prop.floor_level is not None else np.nan
+        self._columns["created_at"][slot] = prop.created_at.timestamp() if prop.created_at else 0.0
+        for key in keys:
+            bitmap = self._bitmaps.get(key)
+            if bitmap is None:
+                bitmap = self._bitmaps[key] = np.zeros(self._capacity, dtype=bool)
+            bitmap[slot] = True
+        self._text.add(prop.pid, property_text(prop))
+
+    def _discard(self, pid: str) -> None:
+        slot = self._slot_by_pid.pop(pid, None)
+        if slot is None:
+            return
+        for key in self._keys[slot] or ():
+            self._bitmaps[key][slot] = False
+        self._text.discard(pid)
+        self._props[slot] = None
+        self._keys[slot] = None
+        self._alive[slot] = False
+        self._free_slots.append(slot)
+
+    # --- Queries ---
+    def match_mask(self, filters: PropertyFilter) -> np.ndarray:
+        """Boolean mask over the used slots of the listings matching the filter. Call with the lock held."""
+        n = self._size
+        mask = self._alive[:n].copy()
+        for key in filter_keys(filters):
+            bitmap = self._bitmaps.get(key)
+            if bitmap is None:
+                return np.zeros(n, dtype=bool)
+            mask &= bitmap[:n]
+        for column, op, bound in filter_ranges(filters):
+            values = self._columns[column][:n]
+            mask &= (values >= bound) if op == ">=" else (values <= bound)
+        if filters.q:
+            text_mask = np.zeros(n, dtype=bool)
+            text_slots = [self._slot_by_pid[pid] for pid in self._text.search(filters.q)]
+            text_mask[text_slots] = True
+            mask &= text_mask
+        return mask
+
+    def query(self, filters: PropertyFilter, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
+        with self._lock:
+            self.queries += 1
+            slots = np.flatnonzero(self.match_mask(filters))
+            if not slots.size:
+                return []
+            # ORDER BY created_at DESC, pid (lexsort sorts by the last key first)
+            ordered = slots[np.lexsort((self._pids[slots], -self._columns["created_at"][slots]))]
+            end = None if limit is None else offset + limit
+            return [self._props[slot] for slot in ordered[offset:end]]
+
+    def facets(self, filters: PropertyFilter, price_bounds: Sequence[float]) -> dict:
+        """Facet counts for the listings matching the filter, from one match mask."""
+        facets = empty_facets(price_bounds)
+        with self._lock:
+            mask = self.match_mask(filters)
+            facets["total"] = int(np.count_nonzero(mask))
+            if not facets["total"]:
+                return facets
+            n = self._size
+            for (field, value), bitmap in self._bitmaps.items():
+                if field in FACET_FIELDS:
+                    count = int(np.count_nonzero(bitmap[:n] & mask))
+                    if count:
+                        facets[field][value] = count
+            bedrooms, counts = np.unique(self._columns["bedrooms"][:n][mask], return_counts=True)
+            facets["bedrooms"] = {str(int(b)): int(c) for b, c in zip(bedrooms, counts)}
+            buckets = np.searchsorted(np.asarray(price_bounds, dtype=float), self._columns["price_etb"][:n][mask], side="right")
+            for bucket, count in enumerate(np.bincount(buckets, minlength=len(price_bounds) + 1)):
+                facets["price"][bucket]["count"] = int(count)
+        return facets
+
+    def stats(self) -> dict:
+        with self._lock:
+            column_bytes = sum(column.nbytes for column in self._columns.values())
+            bitmap_bytes = sum(bitmap.nbytes for bitmap in self._bitmaps.values())
+            return {
+                "entries": len(self._slot_by_pid),
+                "capacity": self._capacity,
+                "bitmaps": len(self._bitmaps),
+                "approx_bytes": column_bytes + bitmap_bytes + self._alive.nbytes,
+                "text": self._text.stats(),
+                "last_rebuild_ms": self.last_rebuild_ms,
+                "queries": self.queries,
+                "watermark": self.watermark.isoformat() if self.watermark else None,
+            }
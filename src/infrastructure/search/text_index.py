@@ -0,0 +1,148 @@
+# src/infrastructure/search/text_index.py
+import bisect
+import re
+from typing import Dict, List, Optional, Sequence, Set
+
+from src.domain.models.property_models import Property, PropertyFilter
+from .base import SyncedPropertyIndex
+from .facets import count_facets
+from .filters import matches_filter
+
+# \w covers Ethiopic letters as well as Latin ones; Ethiopic punctuation (፡ ። ፣ ፤ …) is not a word character
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Amharic spells several sounds with interchangeable letter series (e.g. ሀ/ሐ/ኀ, ሰ/ሠ, አ/ዐ, ጸ/ፀ).
+# Each redundant series is folded onto one canonical series so either spelling matches.
+_ETHIOPIC_FOLDS = {
+    0x1210: 0x1200,  # ሐ -> ሀ
+    0x1280: 0x1200,  # ኀ -> ሀ
+    0x1220: 0x1230,  # ሠ -> ሰ
+    0x12D0: 0x12A0,  # ዐ -> አ
+    0x1340: 0x1338,  # ፀ -> ጸ
+}
+_FOLD_TABLE = {
+    source + order: target + order
+    for source, target in _ETHIOPIC_FOLDS.items()
+    for order in range(7)
+}
+
+
+def search_terms(text: str) -> List[str]:
+    """Lower-cased word tokens of a query, in order and without duplicates."""
+    return list(dict.fromkeys(_TOKEN_RE.findall((text or "").lower())))
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokens used by the in-process index: search_terms with Amharic letter variants folded."""
+    return search_terms((text or "").translate(_FOLD_TABLE))
+
+
+def property_text(prop: Property) -> str:
+    """The searchable text of a listing: description plus region and site (including broker-typed sites)."""
+    return " ".join(filter(None, [prop.description, prop.location.region, prop.location.site]))
+
+
+class InvertedIndex:
+    """
+    Maps tokens to the ids of the documents containing them.
+
+    A query matches documents containing every query term, where each term matches
+    any indexed token it is a prefix of ("apart" finds "apartments").
+    """
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._tokens_by_doc: Dict[str, List[str]] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._tokens_by_doc)
+
+    def add(self, doc_id: str, text: str) -> None:
+        self.discard(doc_id)
+        tokens = tokenize(text)
+        self._tokens_by_doc[doc_id] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._sorted_tokens = None
+            postings.add(doc_id)
+
+    def discard(self, doc_id: str) -> None:
+        for token in self._tokens_by_doc.pop(doc_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+                self._sorted_tokens = None
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._tokens_by_doc.clear()
+        self._sorted_tokens = None
+
+    def _matching_tokens(self, prefix: str) -> List[str]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        end = bisect.bisect_left(self._sorted_tokens, prefix + "\U0010ffff")
+        return self._sorted_tokens[start:end]
+
+    def search(self, query: str) -> Set[str]:
+        """Ids of documents matching every term of the query (empty query matches nothing)."""
+        result: Optional[Set[str]] = None
+        for term in tokenize(query):
+            matches: Set[str] = set()
+            for token in self._matching_tokens(term):
+                matches |= self._postings[token]
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result or set()
+
+    def stats(self) -> dict:
+        return {"documents": len(self._tokens_by_doc), "tokens": len(self._postings)}
+
+
+class PropertyTextIndex(SyncedPropertyIndex):
+    """
+    Keyword search over approved listings for databases without a FULLTEXT index.
+    Text matches are combined with the other PropertyFilter predicates in Python.
+    """
+    name = "property text index"
+
+    def __init__(self, sync_interval: float = 30, rebuild_interval: float = 600):
+        super().__init__(sync_interval=sync_interval, rebuild_interval=rebuild_interval)
+        self._props: Dict[str, Property] = {}
+        self._text = InvertedIndex()
+
+    def _clear(self, expected_size: int) -> None:
+        self._props = {}
+        self._text.clear()
+
+    def _add(self, prop: Property) -> None:
+        self._props[prop.pid] = prop
+        self._text.add(prop.pid, property_text(prop))
+
+    def _discard(self, pid: str) -> None:
+        if self._props.pop(pid, None) is not None:
+            self._text.discard(pid)
+
+    def query(self, filters: PropertyFilter, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
+        with self._lock:
+            candidates = [self._props[pid] for pid in self._text.search(filters.q or "")]
+        matches = [prop for prop in candidates if matches_filter(prop, filters)]
+        # Newest first, ties by pid, like the SQL ORDER BY
+        matches.sort(key=lambda prop: prop.pid)
+        matches.sort(key=lambda prop: prop.created_at, reverse=True)
+        end = None if limit is None else offset + limit
+        return matches[offset:end]
+
+    def facets(self, filters: PropertyFilter, price_bounds: Sequence[float]) -> dict:
+        return count_facets(self.query(filters), price_bounds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._text.stats(), "last_rebuild_ms": self.last_rebuild_ms}
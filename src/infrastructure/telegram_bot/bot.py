@@ -1,24 +1,41 @@
 # src/infrastructure/telegram_bot/bot.py
 
+import logging
 from telegram.ext import (
     Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters,
     ConversationHandler
 )
 from src.utils.config import settings
 from telegram.request import HTTPXRequest
-from src.utils.i18n import t, create_i18n_regex
+from src.utils.i18n import t, create_i18n_regex, check_translations
 from src.utils.constants import * # Import all constants
 from src.use_cases.user_use_cases import UserUseCases
 from src.use_cases.property_use_cases import PropertyUseCases
 from .handlers import (
     common_handlers, admin_handlers, buyer_handlers, broker_handlers
 )
+from .persistence import SQLitePersistence
+from .user_state import UserStateStore
+
+logger = logging.getLogger(__name__)
 
 def setup_bot_application(user_cases: UserUseCases, prop_cases: PropertyUseCases) -> Application:
     """Creates and configures the Telegram bot application."""
+    # Every translation key should exist in every language; a gap silently falls back to English.
+    for lang, missing_keys in check_translations().items():
+        logger.warning(f"Translations for '{lang}' are missing {len(missing_keys)} key(s): {', '.join(missing_keys)}")
+
     # Increase HTTP timeouts to reduce Telegram API read/connect timeouts
     httpx_request = HTTPXRequest(connect_timeout=30.0, read_timeout=30.0, write_timeout=30.0, pool_timeout=30.0)
     builder = Application.builder().token(settings.TELEGRAM_BOT_TOKEN).request(httpx_request)
+
+    # Persist user_data/chat_data and conversation states so restarts are invisible to users
+    persistence = None
+    if settings.BOT_PERSISTENCE_PATH:
+        persistence = SQLitePersistence(settings.BOT_PERSISTENCE_PATH, flush_delay=settings.BOT_PERSISTENCE_FLUSH_SECONDS)
+        builder = builder.persistence(persistence)
+    is_persistent = persistence is not None
+
     application = builder.build()
     application.bot_data["user_use_cases"] = user_cases
     application.bot_data["property_use_cases"] = prop_cases
@@ -37,6 +54,13 @@ def setup_bot_application(user_cases: UserUseCases, prop_cases: PropertyUseCases
     # 4. A standard timeout for all conversations (1800 seconds = 30 minutes)
     CONVERSATION_TIMEOUT = 1800
 
+    # Per-user state is bounded, but users in a conversation keep theirs until it times out
+    application.bot_data["user_state"] = UserStateStore(
+        max_users=settings.BOT_USER_STATE_MAX_USERS,
+        ttl=settings.BOT_USER_STATE_TTL_SECONDS,
+        conversation_timeout=CONVERSATION_TIMEOUT,
+    )
+
     # 5. A reusable list of fallback handlers for ALL conversations.
     common_fallbacks = [
         MessageHandler(cancel_filter, common_handlers.cancel_conversation),
@@ -80,6 +104,7 @@ def setup_bot_application(user_cases: UserUseCases, prop_cases: PropertyUseCases
         fallbacks=common_fallbacks, # Use the new common fallbacks list
         conversation_timeout=CONVERSATION_TIMEOUT,
         name="property_submission",
+        persistent=is_persistent,
         per_message=False
     )
 
@@ -105,10 +130,24 @@ def setup_bot_application(user_cases: UserUseCases, prop_cases: PropertyUseCases
         fallbacks=common_fallbacks, # Use the new common fallbacks list
         conversation_timeout=CONVERSATION_TIMEOUT,
         name="property_filtering",
+        persistent=is_persistent,
+        per_message=False
+    )
+
+    # 3. Buyer: Keyword Search Flow
+    keyword_search_conv = ConversationHandler(
+        entry_points=[MessageHandler(filters.Regex(create_i18n_regex('keyword_search')), buyer_handlers.start_keyword_search)],
+        states={
+            STATE_KEYWORD_SEARCH_INPUT: [MessageHandler(text_input_filter, buyer_handlers.receive_keyword_search)],
+        },
+        fallbacks=common_fallbacks,
+        conversation_timeout=CONVERSATION_TIMEOUT,
+        name="keyword_search",
+        persistent=is_persistent,
         per_message=False
     )
 
-    # 3. Admin: Property Rejection Flow
+    # 4. Admin: Property Rejection Flow
     admin_rejection_conv = ConversationHandler(
         entry_points=[CallbackQueryHandler(admin_handlers.reject_property_start, pattern=f"^{CB_ADMIN_REJECT}_")],
         states={
@@ -117,6 +156,7 @@ def setup_bot_application(user_cases: UserUseCases, prop_cases: PropertyUseCases
         fallbacks=common_fallbacks, # Use the new common fallbacks list
         conversation_timeout=CONVERSATION_TIMEOUT,
         name="admin_rejection",
+        persistent=is_persistent,
         per_message=False
     )
 
@@ -129,6 +169,7 @@ def setup_bot_application(user_cases: UserUseCases, prop_cases: PropertyUseCases
 
     application.add_handler(submission_conv)
     application.add_handler(filter_conv)
+    application.add_handler(keyword_search_conv)
     application.add_handler(admin_rejection_conv)
 
     application.add_handler(MessageHandler(filters.Regex(create_i18n_regex('language_select')), common_handlers.select_language_start))
@@ -151,5 +192,10 @@ def setup_bot_application(user_cases: UserUseCases, prop_cases: PropertyUseCases
     application.add_handler(CallbackQueryHandler(admin_handlers.delete_property_confirm, pattern=f"^{CB_ADMIN_DELETE_CONFIRM}_"))
     application.add_handler(CallbackQueryHandler(admin_handlers.delete_property_execute, pattern=f"^{CB_ADMIN_DELETE_EXECUTE}_"))
     application.add_handler(CallbackQueryHandler(admin_handlers.delete_property_cancel, pattern=f"^{CB_ADMIN_DELETE_CANCEL}_"))
+    # "Next page" buttons under paged result lists
+    application.add_handler(CallbackQueryHandler(buyer_handlers.show_more_properties, pattern=f"^{CB_PREFIX_PAGE}{PAGE_BROWSE}_"))
+    application.add_handler(CallbackQueryHandler(broker_handlers.show_more_listings, pattern=f"^{CB_PREFIX_PAGE}{PAGE_MY_LISTINGS}_"))
+    application.add_handler(CallbackQueryHandler(admin_handlers.show_more_pending, pattern=f"^{CB_PREFIX_PAGE}{PAGE_PENDING}_"))
+    application.add_handler(CallbackQueryHandler(admin_handlers.show_more_managed, pattern=f"^{CB_PREFIX_PAGE}{PAGE_MANAGE}_"))
 
     return application
\ No newline at end of file
@@ -9,7 +9,7 @@ from .. import keyboards
 from src.utils.i18n import t
 from src.utils.constants import *
 from src.utils.display_utils import create_property_card_text
-from .common_handlers import ensure_user_data, handle_exceptions
+from .common_handlers import ensure_user_data, handle_exceptions, recall_paged_list, remember_paged_list
 from src.domain.models.common_models import PropertyStatus
 from src.utils.config import settings
 
@@ -35,28 +35,53 @@ async def admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def view_pending_listings(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Triggers display of pending properties using the rich card format."""
     logger.info("Admin requested to view pending listings.")
-    
+    await _send_pending_page(update, context, offset=0)
+
+@handle_exceptions
+@ensure_user_data
+async def show_more_pending(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handles the 'Next page' button under the pending list."""
+    page = await recall_paged_list(update, context)
+    if page is None:
+        return
+    _, offset = page
+    await _send_pending_page(update, context, offset=offset)
+
+async def _send_pending_page(update: Update, context: ContextTypes.DEFAULT_TYPE, offset: int):
+    """Sends one page of pending properties, followed by a 'Next page' button if more exist."""
+    chat_id = update.effective_chat.id
     prop_cases: PropertyUseCases = context.bot_data["property_use_cases"]
-    pending_props = prop_cases.get_pending_properties()
+    user = context.user_data['user']
+    list_id = remember_paged_list(context, {"list": PAGE_PENDING})
+    # One extra row tells us whether another page exists
+    pending_props = prop_cases.get_pending_properties(limit=RESULTS_PAGE_SIZE + 1, offset=offset)
+    has_more = len(pending_props) > RESULTS_PAGE_SIZE
+    pending_props = pending_props[:RESULTS_PAGE_SIZE]
     
-    logger.info(f"Found {len(pending_props)} pending properties in the database.")
+    logger.info(f"Loaded {len(pending_props)} pending properties (offset {offset}).")
 
     if not pending_props:
-        await update.message.reply_text(
-            "There are no pending properties for approval.",
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text="There are no pending properties for approval." if offset == 0 else "End of pending list.",
             reply_markup=keyboards.get_admin_panel_keyboard()
         )
         return
 
-    await update.message.reply_text(f"Found {len(pending_props)} pending listings. Please review them below:")
+    await context.bot.send_message(
+        chat_id=chat_id,
+        text=f"Pending listings {offset + 1}-{offset + len(pending_props)}. Please review them below:"
+    )
     
     user_cases: UserUseCases = context.bot_data["user_use_cases"]
+    # Resolve every broker on this page with a single query
+    brokers = user_cases.get_users_by_ids([prop.broker_id for prop in pending_props if prop.broker_id])
 
     for prop in pending_props:
         resolved_urls = [_resolve_image_url(url) for url in prop.image_urls]
         prop_details_card = create_property_card_text(prop, for_admin=True)
         # Append broker contact info (admin-only)
-        broker_user = user_cases.get_user_by_id(prop.broker_id) if prop.broker_id else None
+        broker_user = brokers.get(prop.broker_id)
         contact_lines = "\n\n**Broker Contact:**"
         # Phone preference: property-specific phone if present, else user's phone_number
         phone_val = prop.broker_phone or (getattr(broker_user, 'phone_number', None) or '')
@@ -69,36 +94,44 @@ async def view_pending_listings(update: Update, context: ContextTypes.DEFAULT_TY
 
         if not resolved_urls:
             await context.bot.send_message(
-                chat_id=update.effective_chat.id,
+                chat_id=chat_id,
                 text=prop_details_with_contact,
                 parse_mode='Markdown',
                 reply_markup=approval_keyboard
             )
         elif len(resolved_urls) == 1:
             await context.bot.send_photo(
-                chat_id=update.effective_chat.id,
+                chat_id=chat_id,
                 photo=resolved_urls[0]
             )
             await context.bot.send_message(
-                chat_id=update.effective_chat.id,
+                chat_id=chat_id,
                 text=prop_details_with_contact,
                 parse_mode='Markdown',
                 reply_markup=approval_keyboard
             )
         else:
             media_group = [InputMediaPhoto(media=url) for url in resolved_urls]
-            await context.bot.send_media_group(chat_id=update.effective_chat.id, media=media_group)
+            await context.bot.send_media_group(chat_id=chat_id, media=media_group)
             await context.bot.send_message(
-                chat_id=update.effective_chat.id,
+                chat_id=chat_id,
                 text=prop_details_with_contact,
                 parse_mode='Markdown',
                 reply_markup=approval_keyboard
             )
     
-    await update.message.reply_text(
-        "End of pending list.",
-        reply_markup=keyboards.get_admin_panel_keyboard()
-    )
+    if has_more:
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=t('more_results', lang=user.language),
+            reply_markup=keyboards.create_next_page_keyboard(PAGE_PENDING, list_id, offset + len(pending_props), lang=user.language)
+        )
+    else:
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text="End of pending list.",
+            reply_markup=keyboards.get_admin_panel_keyboard()
+        )
 
 @handle_exceptions
 @ensure_user_data
@@ -112,7 +145,7 @@ async def approve_property(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_cases: UserUseCases = context.bot_data["user_use_cases"]
 
     approved_prop = prop_cases.approve_property(prop_id)
-    broker = user_cases.get_user_by_id(approved_prop.broker_id)
+    broker = user_cases.get_users_by_ids([approved_prop.broker_id]).get(approved_prop.broker_id)
     if broker and broker.telegram_id:
         notification_text = t('property_approved_notification', default="Your property submission has been approved and is now live!")
         await context.bot.send_message(chat_id=broker.telegram_id, text=notification_text)
@@ -155,7 +188,7 @@ async def reject_property_reason(update: Update, context: ContextTypes.DEFAULT_T
     user_cases: UserUseCases = context.bot_data["user_use_cases"]
     rejected_prop = prop_cases.reject_property(prop_id, reason)
 
-    broker = user_cases.get_user_by_id(rejected_prop.broker_id)
+    broker = user_cases.get_users_by_ids([rejected_prop.broker_id]).get(rejected_prop.broker_id)
     if broker and broker.telegram_id:
         notification_text = t('property_rejected_notification', reason=reason, default=f"Your property submission was rejected. Reason: {reason}")
         await context.bot.send_message(chat_id=broker.telegram_id, text=notification_text)
@@ -173,27 +206,55 @@ async def reject_property_reason(update: Update, context: ContextTypes.DEFAULT_T
 async def manage_listings(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Shows all APPROVED properties to the admin for management."""
     logger.info("Admin requested to manage listings.")
+    await _send_managed_page(update, context, offset=0)
+
+@handle_exceptions
+@ensure_user_data
+async def show_more_managed(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handles the 'Next page' button under the managed listings."""
+    page = await recall_paged_list(update, context)
+    if page is None:
+        return
+    _, offset = page
+    await _send_managed_page(update, context, offset=offset)
+
+async def _send_managed_page(update: Update, context: ContextTypes.DEFAULT_TYPE, offset: int):
+    """Sends one page of approved properties with management buttons."""
+    chat_id = update.effective_chat.id
     prop_cases: PropertyUseCases = context.bot_data["property_use_cases"]
     user = context.user_data['user']
     user_cases: UserUseCases = context.bot_data["user_use_cases"]
     
-    # We'll find properties with the 'approved' status
-    approved_props = prop_cases.find_properties(PropertyFilter(status=PropertyStatus.APPROVED)) # We need to modify find_properties for this
+    list_id = remember_paged_list(context, {"list": PAGE_MANAGE})
+    # We'll find properties with the 'approved' status, one extra row to detect a next page
+    approved_props = prop_cases.find_properties(
+        PropertyFilter(status=PropertyStatus.APPROVED), limit=RESULTS_PAGE_SIZE + 1, offset=offset
+    )
+    has_more = len(approved_props) > RESULTS_PAGE_SIZE
+    approved_props = approved_props[:RESULTS_PAGE_SIZE]
     
     if not approved_props:
-        await update.message.reply_text(
-            "There are no approved properties to manage.",
-            reply_markup=keyboards.get_admin_panel_keyboard(lang=user.language)
-        )
+        if offset == 0:
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text="There are no approved properties to manage.",
+                reply_markup=keyboards.get_admin_panel_keyboard(lang=user.language)
+            )
         return
 
-    await update.message.reply_text(f"Found {len(approved_props)} approved listings to manage:")
+    await context.bot.send_message(
+        chat_id=chat_id,
+        text=f"Approved listings {offset + 1}-{offset + len(approved_props)} to manage:"
+    )
     
+    # Resolve every broker on this page with a single query
+    brokers = user_cases.get_users_by_ids([prop.broker_id for prop in approved_props if prop.broker_id])
+
     for prop in approved_props:
         resolved_urls = [_resolve_image_url(url) for url in prop.image_urls]
         prop_details_card = create_property_card_text(prop, for_admin=True)
         # Append broker contact info (admin-only)
-        broker_user = user_cases.get_user_by_id(prop.broker_id) if prop.broker_id else None
+        broker_user = brokers.get(prop.broker_id)
         contact_lines = "\n\n**Broker Contact:**"
         phone_val = prop.broker_phone or (getattr(broker_user, 'phone_number', None) or '')
         if phone_val:
@@ -205,31 +266,39 @@ async def manage_listings(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         if not resolved_urls:
             await context.bot.send_message(
-                chat_id=update.effective_chat.id,
+                chat_id=chat_id,
                 text=prop_details_with_contact,
                 parse_mode='Markdown',
                 reply_markup=management_keyboard
             )
         elif len(resolved_urls) == 1:
             await context.bot.send_photo(
-                chat_id=update.effective_chat.id,
+                chat_id=chat_id,
                 photo=resolved_urls[0]
             )
             await context.bot.send_message(
-                chat_id=update.effective_chat.id,
+                chat_id=chat_id,
                 text=prop_details_with_contact,
                 parse_mode='Markdown',
                 reply_markup=management_keyboard
             )
         else:
             media_group = [InputMediaPhoto(media=url) for url in resolved_urls]
-            await context.bot.send_media_group(chat_id=update.effective_chat.id, media=media_group)
+            await context.bot.send_media_group(chat_id=chat_id, media=media_group)
             await context.bot.send_message(
-                chat_id=update.effective_chat.id,
+                chat_id=chat_id,
                 text=prop_details_with_contact,
                 parse_mode='Markdown',
                 reply_markup=management_keyboard
             )
+
+    if has_more:
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=t('more_results', lang=user.language),
+            reply_markup=keyboards.create_next_page_keyboard(PAGE_MANAGE, list_id, offset + len(approved_props), lang=user.language)
+        )
+
 @handle_exceptions
 @ensure_user_data
 async def mark_as_sold(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -307,9 +376,17 @@ async def view_analytics(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = context.user_data['user']
     
     analytics_data = prop_cases.get_analytics_summary()
+    property_counts = analytics_data["properties"]
+    approved_prices = analytics_data["property_rollup"]["by_status"].get(PropertyStatus.APPROVED.value, {})
     
     # Calculate total
-    total_properties = sum(analytics_data.values())
+    total_properties = sum(property_counts.values())
+    price_line = ""
+    if approved_prices.get("median_price") is not None:
+        price_line = (
+            f"**Approved Prices:** median {approved_prices['median_price']:,.0f} ETB, "
+            f"avg {approved_prices['avg_price']:,.0f} ETB\n"
+        )
 
     # Format the message
     dashboard_text = (
@@ -317,10 +394,12 @@ async def view_analytics(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"➖➖➖➖➖➖➖➖➖➖➖➖➖\n"
         f"**Total Properties:** {total_properties}\n\n"
         f"**Status Breakdown:**\n"
-        f"- `⏳ Pending:`   {analytics_data.get(PropertyStatus.PENDING, 0)}\n"
-        f"- `✅ Approved:`  {analytics_data.get(PropertyStatus.APPROVED, 0)}\n"
-        f"- `💰 Sold:`       {analytics_data.get(PropertyStatus.SOLD, 0)}\n"
-        f"- `❌ Rejected:`   {analytics_data.get(PropertyStatus.REJECTED, 0)}\n"
+        f"- `⏳ Pending:`   {property_counts.get(PropertyStatus.PENDING.value, 0)}\n"
+        f"- `✅ Approved:`  {property_counts.get(PropertyStatus.APPROVED.value, 0)}\n"
+        f"- `💰 Sold:`       {property_counts.get(PropertyStatus.SOLD.value, 0)}\n"
+        f"- `❌ Rejected:`   {property_counts.get(PropertyStatus.REJECTED.value, 0)}\n\n"
+        f"{price_line}"
+        f"**Total Cars:** {sum(analytics_data['cars'].values())}\n"
         f"➖➖➖➖➖➖➖➖➖➖➖➖➖"
     )
 
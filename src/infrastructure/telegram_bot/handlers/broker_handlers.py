@@ -8,7 +8,7 @@ from .. import keyboards
 from src.utils.i18n import t
 from src.utils.constants import *
 from src.utils.display_utils import create_property_card_text
-from .common_handlers import ensure_user_data, handle_exceptions
+from .common_handlers import ensure_user_data, handle_exceptions, recall_paged_list, remember_paged_list
 from src.infrastructure.storage_utils import upload_telegram_photo_to_storage
 from src.utils.config import settings
 
@@ -442,19 +442,41 @@ async def receive_description(update: Update, context: ContextTypes.DEFAULT_TYPE
 @ensure_user_data
 async def my_listings(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Displays the broker's own listings using the rich card format."""
+    await _send_listings_page(update, context, offset=0)
+
+@handle_exceptions
+@ensure_user_data
+async def show_more_listings(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handles the 'Next page' button under the broker's listings."""
+    page = await recall_paged_list(update, context)
+    if page is None:
+        return
+    _, offset = page
+    await _send_listings_page(update, context, offset=offset)
+
+async def _send_listings_page(update: Update, context: ContextTypes.DEFAULT_TYPE, offset: int):
+    """Sends one page of the broker's listings, followed by a 'Next page' button if more exist."""
+    chat_id = update.effective_chat.id
     user: User = context.user_data['user']
     prop_cases: PropertyUseCases = context.bot_data["property_use_cases"]
     
-    listings = prop_cases.get_properties_by_broker(user.uid)
+    list_id = remember_paged_list(context, {"list": PAGE_MY_LISTINGS, "broker_id": user.uid})
+    # One extra row tells us whether another page exists
+    listings = prop_cases.get_properties_by_broker(user.uid, limit=RESULTS_PAGE_SIZE + 1, offset=offset)
+    has_more = len(listings) > RESULTS_PAGE_SIZE
+    listings = listings[:RESULTS_PAGE_SIZE]
     
     if not listings:
-        await update.message.reply_text(
-            t('no_listings_yet', lang=user.language, default="You have not submitted any properties yet."),
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=t('no_listings_yet', lang=user.language, default="You have not submitted any properties yet.") if offset == 0
+            else t('end_of_listings', lang=user.language, default="End of your listings."),
             reply_markup=keyboards.get_main_menu_keyboard(user)
         )
         return
         
-    await update.message.reply_text(t('displaying_your_listings', lang=user.language, default="Displaying your submitted properties:"))
+    if offset == 0:
+        await context.bot.send_message(chat_id=chat_id, text=t('displaying_your_listings', lang=user.language, default="Displaying your submitted properties:"))
     
     def _resolve_image_url(url: str) -> str:
         if url and (url.startswith('/uploads/') or url.startswith('/images/')):
@@ -469,37 +491,46 @@ async def my_listings(update: Update, context: ContextTypes.DEFAULT_TYPE):
         try:
             if not resolved_urls:
                 await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
+                    chat_id=chat_id,
                     text=prop_details_card,
                     parse_mode='Markdown'
                 )
             elif len(resolved_urls) == 1:
                 await context.bot.send_photo(
-                    chat_id=update.effective_chat.id,
+                    chat_id=chat_id,
                     photo=resolved_urls[0]
                 )
                 await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
+                    chat_id=chat_id,
                     text=prop_details_card,
                     parse_mode='Markdown'
                 )
             else:
                 media_group = [InputMediaPhoto(media=url) for url in resolved_urls]
-                await context.bot.send_media_group(chat_id=update.effective_chat.id, media=media_group)
+                await context.bot.send_media_group(chat_id=chat_id, media=media_group)
                 await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
+                    chat_id=chat_id,
                     text=prop_details_card,
                     parse_mode='Markdown'
                 )
         except Exception as e:
             logger.error(f"Failed to send rich card for broker's property {prop.pid}: {e}")
             await context.bot.send_message(
-                chat_id=update.effective_chat.id,
+                chat_id=chat_id,
                 text=f"Error displaying property. Details:\n{prop_details_card}",
                 parse_mode='Markdown'
             )
     
-    await update.message.reply_text(
-        t('end_of_listings', lang=user.language, default="End of your listings."),
+    if has_more:
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=t('more_results', lang=user.language),
+            reply_markup=keyboards.create_next_page_keyboard(PAGE_MY_LISTINGS, list_id, offset + len(listings), lang=user.language)
+        )
+        return
+
+    await context.bot.send_message(
+        chat_id=chat_id,
+        text=t('end_of_listings', lang=user.language, default="End of your listings."),
         reply_markup=keyboards.get_main_menu_keyboard(user)
-    )
\ No newline at end of file
+    )
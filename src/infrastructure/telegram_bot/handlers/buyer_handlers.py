@@ -8,7 +8,7 @@ from .. import keyboards
 from src.utils.i18n import t
 from src.utils.constants import *
 from src.utils.display_utils import create_property_card_text
-from .common_handlers import ensure_user_data, handle_exceptions
+from .common_handlers import ensure_user_data, handle_exceptions, recall_paged_list, remember_paged_list
 import re
 from src.utils.constants import CONDOMINIUM_SITES, OTHER_OPTION_EN , OTHER_OPTION_AM
 from src.utils.config import settings
@@ -37,36 +37,44 @@ def _is_valid_photo_url(url: str) -> bool:
         return False
     return url.startswith('http://') or url.startswith('https://')
 
-async def show_properties(update: Update, context: ContextTypes.DEFAULT_TYPE, filters: PropertyFilter):
+async def show_properties(update: Update, context: ContextTypes.DEFAULT_TYPE, filters: PropertyFilter, offset: int = 0):
     """
-    A helper function to fetch and display properties.
-    It no longer sends the final menu.
+    A helper function to fetch and display one page of properties.
+    Only the requested page is loaded; if more results exist, a 'Next page' button
+    is sent that carries the search's id and the next offset. It no longer sends the final menu.
     """
-    source_message = update.message or update.callback_query.message
+    chat_id = update.effective_chat.id
     user: User = context.user_data.get('user')
     lang = user.language if user else 'en'
-
-    await source_message.reply_text(
-        t('searching', lang=lang, default="Searching for properties..."), 
-        reply_markup=keyboards.REMOVE_KEYBOARD
-    )
+    # Remember the search so 'Next page' can re-run it without the conversation state
+    search_id = remember_paged_list(context, filters.model_dump(mode='json', exclude_none=True))
+
+    if offset == 0:
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=t('searching', lang=lang, default="Searching for properties..."),
+            reply_markup=keyboards.REMOVE_KEYBOARD
+        )
     
     prop_cases: PropertyUseCases = context.bot_data["property_use_cases"]
-    properties = prop_cases.find_properties(filters)
+    # Fetch one extra row to learn whether another page exists without a COUNT query
+    properties = prop_cases.find_properties(filters, limit=RESULTS_PAGE_SIZE + 1, offset=offset)
+    has_more = len(properties) > RESULTS_PAGE_SIZE
+    properties = properties[:RESULTS_PAGE_SIZE]
     
     if not properties:
-        await source_message.reply_text(t('no_properties_found', lang=lang, default="No properties found matching your criteria."))
+        if offset == 0:
+            await context.bot.send_message(chat_id=chat_id, text=t('no_properties_found', lang=lang, default="No properties found matching your criteria."))
         return # Exit the function
 
-    await source_message.reply_text(t(
-        'found_properties', 
-        lang=lang, 
-        default="Found {count} matching properties:",
-        count=len(properties)
+    await context.bot.send_message(chat_id=chat_id, text=t(
+        'showing_results',
+        lang=lang,
+        start=offset + 1,
+        end=offset + len(properties)
     ))
 
-    # Limit to first 10 results to avoid spamming the user
-    for prop in properties[:10]:
+    for prop in properties:
         try:
             resolved_urls = [_resolve_image_url(url) for url in prop.image_urls]
             # Keep only absolute http(s) URLs for Telegram
@@ -79,7 +87,7 @@ async def show_properties(update: Update, context: ContextTypes.DEFAULT_TYPE, fi
 
             if not resolved_urls:
                 await context.bot.send_message(
-                    chat_id=source_message.chat_id,
+                    chat_id=chat_id,
                     text=prop_details_card,
                     parse_mode='Markdown',
                     disable_web_page_preview=True
@@ -87,13 +95,13 @@ async def show_properties(update: Update, context: ContextTypes.DEFAULT_TYPE, fi
             elif len(resolved_urls) == 1:
                 try:
                     await context.bot.send_photo(
-                        chat_id=source_message.chat_id,
+                        chat_id=chat_id,
                         photo=resolved_urls[0]
                     )
                 except Exception as e:
                     logger.error(f"Failed to send photo for property {prop.pid}: {e}. Falling back to text only.")
                 await context.bot.send_message(
-                    chat_id=source_message.chat_id,
+                    chat_id=chat_id,
                     text=prop_details_card,
                     parse_mode='Markdown',
                     disable_web_page_preview=True
@@ -101,11 +109,11 @@ async def show_properties(update: Update, context: ContextTypes.DEFAULT_TYPE, fi
             else:
                 try:
                     media_group = [InputMediaPhoto(media=url) for url in resolved_urls]
-                    await context.bot.send_media_group(chat_id=source_message.chat_id, media=media_group)
+                    await context.bot.send_media_group(chat_id=chat_id, media=media_group)
                 except Exception as e:
                     logger.error(f"Failed to send media group for property {prop.pid}: {e}. Falling back to text only.")
                 await context.bot.send_message(
-                    chat_id=source_message.chat_id,
+                    chat_id=chat_id,
                     text=prop_details_card,
                     parse_mode='Markdown',
                     disable_web_page_preview=True
@@ -113,15 +121,46 @@ async def show_properties(update: Update, context: ContextTypes.DEFAULT_TYPE, fi
         except Exception as e:
             logger.error(f"Failed to send property card {prop.pid}: {e}")
             await context.bot.send_message(
-                chat_id=source_message.chat_id,
+                chat_id=chat_id,
                 text=f"Error displaying a property (ID: {prop.pid[:8]}...). Continuing..."
             )
             
-    if len(properties) > 10:
-        await source_message.reply_text(t('showing_first_10', lang=lang, default="Showing the first 10 results. For more, please refine your search."))
+    if has_more:
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=t('more_results', lang=lang),
+            reply_markup=keyboards.create_next_page_keyboard(PAGE_BROWSE, search_id, offset + len(properties), lang=lang)
+        )
+
+@handle_exceptions
+@ensure_user_data
+async def show_more_properties(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handles the 'Next page' button under browse/filter results."""
+    page = await recall_paged_list(update, context)
+    if page is None:
+        return
+    search, offset = page
+    await show_properties(update, context, PropertyFilter(**search), offset=offset)
 
 # --- Filtering Conversation ---
 
+async def ask_filter_price_range(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """Offers price ranges cut at quantiles of the live listings of the chosen property type."""
+    user: User = context.user_data['user']
+    prop_cases: PropertyUseCases = context.bot_data["property_use_cases"]
+    buckets = prop_cases.get_price_buckets(context.user_data['filters'].get('property_type'))
+    # Remember what each button means; the labels alone are rounded
+    price_ranges = {
+        keyboards.price_range_label(bucket['min'], bucket['max'], lang=user.language): (bucket['min'], bucket['max'])
+        for bucket in buckets
+    }
+    context.user_data['price_ranges'] = price_ranges
+    await update.message.reply_text(
+        t('select_price_range', lang=user.language),
+        reply_markup=keyboards.get_price_range_keyboard(tuple(price_ranges), lang=user.language)
+    )
+    return STATE_FILTER_PRICE_RANGE
+
 # STEP 0: Entry Point
 @handle_exceptions
 @ensure_user_data
@@ -174,8 +213,7 @@ async def receive_filter_prop_type(update: Update, context: ContextTypes.DEFAULT
         await update.message.reply_text(t('ask_filter_has_entrance', lang=lang), reply_markup=keyboards.get_boolean_keyboard(lang=lang))
         return STATE_FILTER_HAS_ENTRANCE
     else:
-        await update.message.reply_text(t('select_price_range', lang=lang), reply_markup=keyboards.get_price_range_keyboard(lang=lang))
-        return STATE_FILTER_PRICE_RANGE
+        return await ask_filter_price_range(update, context)
 
 # === BUILDING FILTER FLOW (Unchanged) ===
 @handle_exceptions
@@ -191,8 +229,7 @@ async def receive_filter_is_commercial(update: Update, context: ContextTypes.DEF
 async def receive_filter_has_elevator(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user: User = context.user_data['user']
     context.user_data['filters']['filter_has_elevator'] = (update.message.text.lower() == t('yes', lang=user.language).lower())
-    await update.message.reply_text(t('select_price_range', lang=user.language), reply_markup=keyboards.get_price_range_keyboard(lang=user.language))
-    return STATE_FILTER_PRICE_RANGE
+    return await ask_filter_price_range(update, context)
 
 # === PENTHOUSE FILTER FLOW (Unchanged) ===
 @handle_exceptions
@@ -208,8 +245,7 @@ async def receive_filter_has_rooftop(update: Update, context: ContextTypes.DEFAU
 async def receive_filter_is_two_story(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user: User = context.user_data['user']
     context.user_data['filters']['filter_is_two_story_penthouse'] = (update.message.text.lower() == t('yes', lang=user.language).lower())
-    await update.message.reply_text(t('select_price_range', lang=user.language), reply_markup=keyboards.get_price_range_keyboard(lang=user.language))
-    return STATE_FILTER_PRICE_RANGE
+    return await ask_filter_price_range(update, context)
 
 # === DUPLEX FILTER FLOW (Unchanged) ===
 @handle_exceptions
@@ -217,8 +253,7 @@ async def receive_filter_is_two_story(update: Update, context: ContextTypes.DEFA
 async def receive_filter_has_entrance(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user: User = context.user_data['user']
     context.user_data['filters']['filter_has_private_entrance'] = (update.message.text.lower() == t('yes', lang=user.language).lower())
-    await update.message.reply_text(t('select_price_range', lang=user.language), reply_markup=keyboards.get_price_range_keyboard(lang=user.language))
-    return STATE_FILTER_PRICE_RANGE
+    return await ask_filter_price_range(update, context)
 
 # === COMMON & NEW FLOWS ===
 @handle_exceptions
@@ -258,8 +293,7 @@ async def receive_filter_site(update: Update, context: ContextTypes.DEFAULT_TYPE
         context.user_data['filters']['location_site'] = site_to_filter
     
     # Move on to the next filter: price range
-    await update.message.reply_text(t('select_price_range', lang=lang), reply_markup=keyboards.get_price_range_keyboard(lang=lang))
-    return STATE_FILTER_PRICE_RANGE
+    return await ask_filter_price_range(update, context)
 
 # --- NEW HANDLER for "Other" site filter ---
 @handle_exceptions
@@ -271,19 +305,21 @@ async def receive_filter_other_site(update: Update, context: ContextTypes.DEFAUL
     context.user_data['filters']['location_site'] = user_input
     
     # Move on to the next filter: price range
-    await update.message.reply_text(t('select_price_range', lang=user.language), reply_markup=keyboards.get_price_range_keyboard(lang=user.language))
-    return STATE_FILTER_PRICE_RANGE
+    return await ask_filter_price_range(update, context)
 
 @handle_exceptions
 @ensure_user_data
 async def receive_filter_price_range(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user: User = context.user_data['user']
     if update.message.text != t('any_price', lang=user.language):
-        price_value = keyboards.PRICE_RANGES_TEXT.get(update.message.text)
-        if price_value:
-            price_range = price_value.split('-')
-            context.user_data['filters']['min_price'] = float(price_range[0])
-            context.user_data['filters']['max_price'] = float(price_range[1])
+        price_range = context.user_data.get('price_ranges', {}).get(update.message.text)
+        if price_range:
+            min_price, max_price = price_range
+            if min_price is not None:
+                context.user_data['filters']['min_price'] = min_price
+            if max_price is not None:
+                context.user_data['filters']['max_price'] = max_price
+    context.user_data.pop('price_ranges', None)
             
     # --- UPDATED ---: Decide next step based on property type
     prop_type = context.user_data['filters'].get('property_type')
@@ -368,6 +404,28 @@ async def end_filter_conversation(update: Update, context: ContextTypes.DEFAULT_
     context.user_data.pop('filters', None)
     return ConversationHandler.END
 
+@handle_exceptions
+@ensure_user_data
+async def start_keyword_search(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    user: User = context.user_data['user']
+    await update.message.reply_text(
+        text=t('enter_keywords', lang=user.language),
+        reply_markup=keyboards.create_reply_options_keyboard([], lang=user.language)
+    )
+    return STATE_KEYWORD_SEARCH_INPUT
+
+@handle_exceptions
+@ensure_user_data
+async def receive_keyword_search(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """Runs a keyword search over approved listings and returns to the main menu."""
+    user: User = context.user_data['user']
+    await show_properties(update, context, PropertyFilter(q=update.message.text.strip()))
+    await update.message.reply_text(
+        text=t('search_complete', lang=user.language),
+        reply_markup=keyboards.get_main_menu_keyboard(user)
+    )
+    return ConversationHandler.END
+
 @handle_exceptions
 @ensure_user_data
 async def browse_all_properties(update: Update, context: ContextTypes.DEFAULT_TYPE):
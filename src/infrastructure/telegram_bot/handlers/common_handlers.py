@@ -2,13 +2,18 @@
 
 from telegram import Update
 from functools import wraps
+import hashlib
+import json
 import logging
+from typing import Optional, Tuple
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram.error import TelegramError
 from src.use_cases.user_use_cases import UserUseCases
 from src.domain.models.user_models import UserRole , User
 from .. import keyboards
+from ..user_state import UserStateStore, UserSnapshot, remember_user
 from src.utils.i18n import t
+from src.utils.constants import PAGED_LISTS_KEPT
 from src.utils.exceptions import RealEstatePlatformException, TelegramApiError
 
 logger = logging.getLogger(__name__)
@@ -74,15 +79,23 @@ async def _send_error_response(update: Update, context: ContextTypes.DEFAULT_TYP
 def ensure_user_data(func):
     """
     A decorator that ensures the user object is in context.user_data.
-    If not present (e.g., after a bot restart), it fetches the user
-    from the database and stores it.
+    If not present (e.g., after a bot restart or after the entry was evicted),
+    it fetches the user from the database and stores a compact snapshot of it.
     """
     @wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-        if 'user' not in context.user_data:
+        effective_user = update.effective_user
+        user_state: UserStateStore = context.bot_data.get("user_state")
+        if user_state and effective_user:
+            user_state.touch(context.application, effective_user.id)
+
+        cached_user = context.user_data.get('user')
+        if cached_user is not None and not isinstance(cached_user, UserSnapshot):
+            # Entries restored from older persistence files still hold the full model
+            remember_user(context, cached_user)
+        elif cached_user is None:
             logger.info(f"User object not in context for handler '{func.__name__}'. Refetching from DB.")
             user_use_cases: UserUseCases = context.bot_data["user_use_cases"]
-            effective_user = update.effective_user
 
             if not effective_user:
                 logger.warning("Could not find effective_user in update. Cannot refetch user.")
@@ -93,7 +106,7 @@ def ensure_user_data(func):
                 display_name=effective_user.full_name
             )
             if user:
-                context.user_data['user'] = user
+                remember_user(context, user)
             else:
                 logger.error(f"Failed to get or create user for telegram_id {effective_user.id}")
                 await update.message.reply_text("An error occurred while retrieving your profile. Please try typing /start again.")
@@ -104,6 +117,41 @@ def ensure_user_data(func):
     return wrapper
 
 
+# --- Paged Lists ---
+def remember_paged_list(context: ContextTypes.DEFAULT_TYPE, params: dict) -> str:
+    """
+    Stores the query a paged list was built from and returns its id, a short hash of
+    `params`. The 'Next page' button carries the id, so it always pages its own list.
+    Only the last PAGED_LISTS_KEPT lists per user are kept; storing one again keeps it fresh.
+    """
+    list_id = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:10]
+    paged_lists = context.user_data.setdefault('paged_lists', {})
+    paged_lists.pop(list_id, None)
+    paged_lists[list_id] = params
+    while len(paged_lists) > PAGED_LISTS_KEPT:
+        paged_lists.pop(next(iter(paged_lists)))
+    return list_id
+
+
+async def recall_paged_list(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Optional[Tuple[dict, int]]:
+    """
+    Reads a 'Next page' callback and answers it. Returns (params, offset), or None
+    after telling the user the search expired when the list is no longer remembered.
+    The button is removed either way, so the same page can't be requested twice.
+    """
+    query = update.callback_query
+    _, list_id, offset = query.data.rsplit('_', 2)
+    params = context.user_data.get('paged_lists', {}).get(list_id)
+    user = context.user_data.get('user')
+    lang = user.language if user else 'en'
+    if params is None:
+        await query.answer(t('search_expired', lang=lang), show_alert=True)
+    else:
+        await query.answer()
+    await query.edit_message_reply_markup(reply_markup=None)
+    return (params, int(offset)) if params is not None else None
+
+
 @handle_exceptions
 @ensure_user_data
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -143,8 +191,7 @@ async def set_user_role(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = context.user_data['user']
     user_use_cases: UserUseCases = context.bot_data["user_use_cases"]
 
-    updated_user = user_use_cases.add_user_role(user.uid, role)
-    context.user_data['user'] = updated_user
+    updated_user = remember_user(context, user_use_cases.add_user_role(user.uid, role))
 
     await update.message.reply_text(
         f"You are now registered as a {role.value}!",
@@ -220,8 +267,7 @@ async def set_language(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chosen_lang = update.message.text
     lang_code = 'am' if 'አማርኛ' in chosen_lang else 'en'
 
-    updated_user = user_use_cases.set_user_language(user.uid, lang_code)
-    context.user_data['user'] = updated_user # IMPORTANT: Update context
+    updated_user = remember_user(context, user_use_cases.set_user_language(user.uid, lang_code)) # IMPORTANT: Update context
 
     source_message = update.message or (update.callback_query.message if update.callback_query else None)
     if source_message:
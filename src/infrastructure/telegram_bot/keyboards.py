@@ -1,3 +1,4 @@
+from functools import lru_cache
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup, ReplyKeyboardRemove
 from src.domain.models.user_models import User, UserRole
 from src.domain.models.property_models import PropertyType, CondoScheme, FurnishingStatus
@@ -11,6 +12,10 @@ from src.utils.config import settings
 # A constant to remove the reply keyboard
 REMOVE_KEYBOARD = ReplyKeyboardRemove()
 
+# Static keyboards depend only on (language, flags), so each variant is built once
+# and the same markup object is reused for every message.
+_cached_keyboard = lru_cache(maxsize=256)
+
 # --- Data for Reply Keyboards ---
 BEDROOM_OPTIONS = ["1", "2", "3", "4", "5", "6+"]
 BATHROOM_OPTIONS = ["1", "2", "3", "4+"]
@@ -30,21 +35,19 @@ SIZE_RANGES_TEXT = {
     "Above 250 m²": "250-9999",
 }
 
-PRICE_RANGES_TEXT = {
-    # Lower, more granular ranges
-    "Under 2.5M": "0-2500000",
-    "2.5M - 4M": "2500000-4000000",
-    "4M - 6M": "4000000-6000000",
-    "6M - 8M": "6000000-8000000",
-    # Mid-range
-    "8M - 11M": "8000000-11000000",
-    "11M - 14M": "11000000-14000000",
-    "14M - 17M": "14000000-17000000",
-    # Higher-end ranges
-    "17M - 22M": "17000000-22000000",
-    "22M - 30M": "22000000-30000000",
-    "Above 30M": "30000000-9999999999",
-}
+def _short_price(amount: float) -> str:
+    """2500000 -> '2.5M', 950000 -> '950K'."""
+    if amount >= 1_000_000:
+        return f"{amount / 1_000_000:g}M"
+    return f"{amount / 1_000:g}K"
+
+def price_range_label(min_price, max_price, lang: str = 'en') -> str:
+    """Button label for a price bucket; an open end has no min or max."""
+    if min_price is None:
+        return t('price_under', lang=lang, max=_short_price(max_price))
+    if max_price is None:
+        return t('price_above', lang=lang, min=_short_price(min_price))
+    return t('price_between', lang=lang, min=_short_price(min_price), max=_short_price(max_price))
 
 # --- Helper Function ---
 def create_reply_options_keyboard(options: list, columns: int = 2, add_cancel=True, lang: str = 'en') -> ReplyKeyboardMarkup:
@@ -54,21 +57,26 @@ def create_reply_options_keyboard(options: list, columns: int = 2, add_cancel=Tr
     return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=True)
 
 def get_main_menu_keyboard(user: User) -> ReplyKeyboardMarkup:
-    lang = user.language
-    options = [t('browse_properties', lang=lang), t('filter_properties', lang=lang)]
-    if UserRole.BROKER in user.roles:
+    return _build_main_menu_keyboard(user.language, UserRole.BROKER in user.roles, UserRole.ADMIN in user.roles)
+
+@_cached_keyboard
+def _build_main_menu_keyboard(lang: str, is_broker: bool, is_admin: bool) -> ReplyKeyboardMarkup:
+    options = [t('browse_properties', lang=lang), t('filter_properties', lang=lang), t('keyword_search', lang=lang)]
+    if is_broker:
         options.extend([t('submit_property', lang=lang), t('my_listings', lang=lang)])
-    if UserRole.ADMIN in user.roles:
+    if is_admin:
         options.append(t('admin_panel', lang=lang))
     options.append(t('language_select', lang=lang))
     return create_reply_options_keyboard(options, columns=2, add_cancel=False, lang=lang)
 
+@_cached_keyboard
 def get_website_inline_keyboard() -> InlineKeyboardMarkup:
     """Global inline keyboard with a website link."""
     url = settings.WEB_APP_URL or "https://addishomess.com"
     keyboard = [[InlineKeyboardButton(text="🌐 Visit our website", url=url)]]
     return InlineKeyboardMarkup(keyboard)
 
+@_cached_keyboard
 def get_admin_panel_keyboard(lang: str = 'en') -> ReplyKeyboardMarkup:
     options = [
         t('admin_pending_listings', lang=lang),
@@ -94,17 +102,20 @@ def create_delete_confirmation_keyboard(prop_id: str, lang: str = 'en') -> Inlin
     ]]
     return InlineKeyboardMarkup(keyboard)
 
+@_cached_keyboard
 def get_role_selection_keyboard() -> ReplyKeyboardMarkup:
     # Use both languages for first-time selection
     options = [t('buyer_role', lang='en'), t('broker_role', lang='en'), t('buyer_role', lang='am'), t('broker_role', lang='am')]
     return create_reply_options_keyboard(options, add_cancel=False)
 
+@_cached_keyboard
 def get_language_selection_keyboard() -> ReplyKeyboardMarkup:
     """Creates a keyboard for selecting a language."""
     options = ["English 🇬🇧", "አማርኛ 🇪🇹"]
     return create_reply_options_keyboard(options, columns=2, add_cancel=True, lang='en')
 
 # --- Submission & Filter Flow Keyboards ---
+@_cached_keyboard
 def get_property_type_keyboard(lang: str = 'en') -> ReplyKeyboardMarkup:
     """Creates a keyboard with translated property type names."""
     # Generate translated button text for each property type enum
@@ -117,6 +128,7 @@ def get_property_type_keyboard(lang: str = 'en') -> ReplyKeyboardMarkup:
 # def get_condo_site_keyboard(sub_city: str, lang: str = 'en') -> ReplyKeyboardMarkup: ...
 
 # --- NEW KEYBOARD for Apartment/Condo sites ---
+@_cached_keyboard
 def get_site_keyboard(is_filter: bool = False, lang: str = 'en') -> ReplyKeyboardMarkup:
     """Creates a dynamic keyboard for common sites in the user's language."""
     # Use the user's language to get the translated site names for the buttons
@@ -135,6 +147,7 @@ def get_numeric_keyboard(options: list, lang: str = 'en') -> ReplyKeyboardMarkup
     """Helper for numeric choice keyboards like bedrooms/bathrooms."""
     return create_reply_options_keyboard(options, columns=4, lang=lang)
 
+@_cached_keyboard
 def get_bedroom_keyboard(is_filter: bool = False, lang: str = 'en') -> ReplyKeyboardMarkup:
     options = [t('bedroom_count', lang=lang, count=i) for i in range(1, 6)]
     options.append(t('bedroom_plus', lang=lang, count=6))
@@ -142,37 +155,46 @@ def get_bedroom_keyboard(is_filter: bool = False, lang: str = 'en') -> ReplyKeyb
         options.append(t('any_option', lang=lang))
     return create_reply_options_keyboard(options, columns=4, lang=lang)
 
+@_cached_keyboard
 def get_bathroom_keyboard(lang: str = 'en') -> ReplyKeyboardMarkup:
     return create_reply_options_keyboard(BATHROOM_OPTIONS, columns=4, lang=lang)
 
+@_cached_keyboard
 def get_size_range_keyboard(lang: str = 'en') -> ReplyKeyboardMarkup:
     return create_reply_options_keyboard(list(SIZE_RANGES_TEXT.keys()), columns=2, lang=lang)
 
-def get_price_range_keyboard(lang: str = 'en') -> ReplyKeyboardMarkup:
-    options = list(PRICE_RANGES_TEXT.keys())
+@_cached_keyboard
+def get_price_range_keyboard(labels: tuple, lang: str = 'en') -> ReplyKeyboardMarkup:
+    """`labels` are the current price bucket labels (a tuple, so the keyboard can be cached)."""
+    options = list(labels)
     options.append(t('any_price', lang=lang))
     return create_reply_options_keyboard(options, columns=2, lang=lang)
 
+@_cached_keyboard
 def get_region_keyboard(is_filter: bool = False, lang: str = 'en') -> ReplyKeyboardMarkup:
     options = REGIONS[:] # Create a copy
     if is_filter:
         options.append(t('any_region', lang=lang))
     return create_reply_options_keyboard(options, lang=lang)
 
+@_cached_keyboard
 def get_furnishing_status_keyboard(lang: str = 'en') -> ReplyKeyboardMarkup:
     return create_reply_options_keyboard([fs.value for fs in FurnishingStatus], columns=3, lang=lang)
 
+@_cached_keyboard
 def get_boolean_keyboard(lang: str = 'en') -> ReplyKeyboardMarkup:
     """Creates a simple Yes/No keyboard."""
     options = [t('yes', lang=lang), t('no', lang=lang)]
     return create_reply_options_keyboard(options, columns=2, lang=lang)
 
+@_cached_keyboard
 def get_condo_scheme_keyboard(is_filter: bool = False, lang: str = 'en') -> ReplyKeyboardMarkup:
     options = CONDO_SCHEMES[:] # Create a copy
     if is_filter:
         options.append(t('any_scheme', lang=lang))
     return create_reply_options_keyboard(options, lang=lang)
 
+@_cached_keyboard
 def get_g_plus_keyboard(is_filter: bool = False, lang: str = 'en') -> ReplyKeyboardMarkup:
     """Creates a keyboard for Villa G+ options."""
     options = G_PLUS_OPTIONS[:] # Create a copy
@@ -181,6 +203,7 @@ def get_g_plus_keyboard(is_filter: bool = False, lang: str = 'en') -> ReplyKeybo
     return create_reply_options_keyboard(options, columns=3, lang=lang)
 
 
+@_cached_keyboard
 def get_image_upload_keyboard(lang: str = 'en') -> ReplyKeyboardMarkup:
     """Creates a keyboard with a 'Done' button for image uploads."""
     keyboard = [[KeyboardButton(DONE_UPLOADING_TEXT)], [KeyboardButton(t('cancel', lang=lang))]]
@@ -192,4 +215,9 @@ def create_admin_approval_keyboard(prop_id: str, lang: str = 'en') -> InlineKeyb
         InlineKeyboardButton(t('admin_approve', lang=lang), callback_data=f"{CB_ADMIN_APPROVE}_{prop_id}"),
         InlineKeyboardButton(t('admin_reject', lang=lang), callback_data=f"{CB_ADMIN_REJECT}_{prop_id}")
     ]]
-    return InlineKeyboardMarkup(keyboard)
\ No newline at end of file
+    return InlineKeyboardMarkup(keyboard)
+
+def create_next_page_keyboard(kind: str, list_id: str, offset: int, lang: str = 'en') -> InlineKeyboardMarkup:
+    """Inline 'Next page' button; the callback carries the list kind, the list's id and the next offset."""
+    keyboard = [[InlineKeyboardButton(t('next_page', lang=lang), callback_data=f"{CB_PREFIX_PAGE}{kind}_{list_id}_{offset}")]]
+    return InlineKeyboardMarkup(keyboard)
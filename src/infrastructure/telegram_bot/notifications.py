@@ -0,0 +1,55 @@
+# src/infrastructure/telegram_bot/notifications.py
+import asyncio
+import logging
+
+from telegram.error import Forbidden, BadRequest, TelegramError
+from telegram.ext import Application
+
+from src.use_cases.property_use_cases import PropertyUseCases
+from src.use_cases.user_use_cases import UserUseCases
+from src.utils.i18n import t
+
+logger = logging.getLogger(__name__)
+
+
+async def send_pending_notifications(application: Application, batch_size: int = 100) -> int:
+    """
+    Sends one batch of broker notifications queued by bulk moderation and marks them sent.
+    Notifications that cannot be delivered (blocked bot, unknown chat, no Telegram account)
+    are dropped; on other errors the rest of the batch is left for the next run.
+    """
+    prop_cases: PropertyUseCases = application.bot_data["property_use_cases"]
+    user_cases: UserUseCases = application.bot_data["user_use_cases"]
+
+    pending = prop_cases.get_pending_broker_notifications(batch_size)
+    if not pending:
+        return 0
+    brokers = user_cases.get_users_by_ids([note["broker_id"] for note in pending])
+
+    done = []
+    try:
+        for note in pending:
+            broker = brokers.get(note["broker_id"])
+            if broker and broker.telegram_id:
+                text = t(f"{note['kind']}_{note['event']}_notification", lang=broker.language, reason=note.get("reason") or "-")
+                try:
+                    await application.bot.send_message(chat_id=broker.telegram_id, text=text)
+                except (Forbidden, BadRequest) as e:
+                    logger.warning(f"Dropping notification {note['id']} for broker {note['broker_id']}: {e}")
+            done.append(note["id"])
+    except TelegramError as e:
+        logger.warning(f"Stopped sending broker notifications, will retry: {e}")
+    finally:
+        prop_cases.mark_broker_notifications_sent(done)
+    return len(done)
+
+
+async def deliver_broker_notifications(application: Application, interval: float) -> None:
+    """Runs send_pending_notifications every `interval` seconds until cancelled."""
+    while True:
+        try:
+            while await send_pending_notifications(application) > 0:
+                pass
+        except Exception as e:
+            logger.error(f"Error delivering broker notifications: {e}")
+        await asyncio.sleep(interval)
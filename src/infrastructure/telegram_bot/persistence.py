@@ -0,0 +1,185 @@
+# src/infrastructure/telegram_bot/persistence.py
+import asyncio
+import json
+import logging
+import pickle
+import sqlite3
+from typing import Any, Dict, Optional
+
+from telegram.ext import BasePersistence, PersistenceInput
+
+logger = logging.getLogger(__name__)
+
+
+class SQLitePersistence(BasePersistence):
+    """
+    Stores user_data, chat_data and ConversationHandler states in a local SQLite file
+    so that a bot restart neither loses in-progress conversations nor forces every
+    user to be re-fetched from MySQL on their next message.
+
+    Writes are debounced: updates only mark entries dirty, and all dirty entries are
+    committed together in a single transaction `flush_delay` seconds later.
+    bot_data is never persisted because it holds the live use-case singletons.
+    """
+    def __init__(self, filepath: str, flush_delay: float = 5.0, update_interval: float = 60):
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=True, user_data=True, callback_data=False),
+            update_interval=update_interval,
+        )
+        self.filepath = filepath
+        self.flush_delay = flush_delay
+        self._conn = sqlite3.connect(filepath, check_same_thread=False)
+        self._create_tables()
+
+        self._user_data: Optional[Dict[int, Any]] = None
+        self._chat_data: Optional[Dict[int, Any]] = None
+        self._conversations: Dict[str, Dict[tuple, object]] = {}
+
+        # Pending writes, keyed by table -> id; a value of None means "delete the row"
+        self._dirty_users: Dict[int, Any] = {}
+        self._dirty_chats: Dict[int, Any] = {}
+        self._dirty_conversations: Dict[tuple, object] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def _create_tables(self):
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS user_data (user_id INTEGER PRIMARY KEY, data BLOB NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS chat_data (chat_id INTEGER PRIMARY KEY, data BLOB NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS conversations ("
+                "name TEXT NOT NULL, conv_key TEXT NOT NULL, state BLOB NOT NULL, "
+                "PRIMARY KEY (name, conv_key))"
+            )
+
+    def _load_table(self, table: str, id_column: str) -> Dict[int, Any]:
+        loaded = {}
+        for row_id, blob in self._conn.execute(f"SELECT {id_column}, data FROM {table}"):
+            try:
+                loaded[row_id] = pickle.loads(blob)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable {table} row {row_id}: {e}")
+        return loaded
+
+    # --- Debounced writes ---
+    def _schedule_flush(self):
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_dirty()
+            return
+        self._flush_handle = loop.call_later(self.flush_delay, self._write_dirty)
+
+    def _write_dirty(self):
+        self._flush_handle = None
+        if not (self._dirty_users or self._dirty_chats or self._dirty_conversations):
+            return
+        users, self._dirty_users = self._dirty_users, {}
+        chats, self._dirty_chats = self._dirty_chats, {}
+        conversations, self._dirty_conversations = self._dirty_conversations, {}
+        try:
+            with self._conn:
+                self._write_rows("user_data", "user_id", users)
+                self._write_rows("chat_data", "chat_id", chats)
+                upserts = [(name, key, pickle.dumps(state)) for (name, key), state in conversations.items() if state is not None]
+                deletes = [(name, key) for (name, key), state in conversations.items() if state is None]
+                self._conn.executemany("INSERT OR REPLACE INTO conversations (name, conv_key, state) VALUES (?, ?, ?)", upserts)
+                self._conn.executemany("DELETE FROM conversations WHERE name = ? AND conv_key = ?", deletes)
+        except Exception as e:
+            logger.error(f"Failed to write bot persistence to {self.filepath}: {e}", exc_info=True)
+
+    def _write_rows(self, table: str, id_column: str, rows: Dict[int, Any]):
+        upserts = []
+        deletes = []
+        for row_id, data in rows.items():
+            if data is None:
+                deletes.append((row_id,))
+                continue
+            try:
+                upserts.append((row_id, pickle.dumps(data)))
+            except Exception as e:
+                logger.warning(f"Skipping {table} row {row_id}, data is not picklable: {e}")
+        self._conn.executemany(f"INSERT OR REPLACE INTO {table} ({id_column}, data) VALUES (?, ?)", upserts)
+        self._conn.executemany(f"DELETE FROM {table} WHERE {id_column} = ?", deletes)
+
+    # --- BasePersistence: reads ---
+    async def get_user_data(self) -> Dict[int, Any]:
+        if self._user_data is None:
+            self._user_data = self._load_table("user_data", "user_id")
+        return self._user_data
+
+    async def get_chat_data(self) -> Dict[int, Any]:
+        if self._chat_data is None:
+            self._chat_data = self._load_table("chat_data", "chat_id")
+        return self._chat_data
+
+    async def get_bot_data(self) -> Dict[Any, Any]:
+        return {}
+
+    async def get_callback_data(self):
+        return None
+
+    async def get_conversations(self, name: str) -> Dict[tuple, object]:
+        if name not in self._conversations:
+            rows = self._conn.execute("SELECT conv_key, state FROM conversations WHERE name = ?", (name,))
+            self._conversations[name] = {tuple(json.loads(key)): pickle.loads(state) for key, state in rows}
+        return self._conversations[name]
+
+    # --- BasePersistence: writes ---
+    async def update_user_data(self, user_id: int, data: Any) -> None:
+        if self._user_data is None:
+            self._user_data = {}
+        self._user_data[user_id] = data
+        self._dirty_users[user_id] = data
+        self._schedule_flush()
+
+    async def update_chat_data(self, chat_id: int, data: Any) -> None:
+        if self._chat_data is None:
+            self._chat_data = {}
+        self._chat_data[chat_id] = data
+        self._dirty_chats[chat_id] = data
+        self._schedule_flush()
+
+    async def update_bot_data(self, data: Any) -> None:
+        pass
+
+    async def update_callback_data(self, data: Any) -> None:
+        pass
+
+    async def update_conversation(self, name: str, key: tuple, new_state: Optional[object]) -> None:
+        conversations = self._conversations.setdefault(name, {})
+        if new_state is None:
+            conversations.pop(key, None)
+        else:
+            conversations[key] = new_state
+        self._dirty_conversations[(name, json.dumps(list(key)))] = new_state
+        self._schedule_flush()
+
+    async def drop_user_data(self, user_id: int) -> None:
+        if self._user_data is not None:
+            self._user_data.pop(user_id, None)
+        self._dirty_users[user_id] = None
+        self._schedule_flush()
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        if self._chat_data is not None:
+            self._chat_data.pop(chat_id, None)
+        self._dirty_chats[chat_id] = None
+        self._schedule_flush()
+
+    async def refresh_user_data(self, user_id: int, user_data: Any) -> None:
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Any) -> None:
+        pass
+
+    async def refresh_bot_data(self, bot_data: Any) -> None:
+        pass
+
+    async def flush(self) -> None:
+        """Called by the Application on shutdown; writes anything still pending."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._write_dirty()
@@ -0,0 +1,154 @@
+# src/infrastructure/telegram_bot/user_state.py
+import logging
+import pickle
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from telegram.ext import Application, ContextTypes
+from src.domain.models.user_models import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """
+    The handful of user fields the bot actually reads, kept in context.user_data
+    instead of the full User model (no password hash, timestamps or pydantic overhead).
+    """
+    uid: str
+    telegram_id: int
+    display_name: Optional[str]
+    phone_number: str
+    roles: Tuple[UserRole, ...]
+    language: str
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        if isinstance(user, cls):
+            return user
+        return cls(
+            uid=user.uid,
+            telegram_id=user.telegram_id,
+            display_name=user.display_name,
+            phone_number=user.phone_number,
+            roles=tuple(user.roles or ()),
+            language=user.language,
+        )
+
+
+def remember_user(context: ContextTypes.DEFAULT_TYPE, user: User) -> UserSnapshot:
+    """Stores the compact snapshot of a user in context.user_data and returns it."""
+    snapshot = UserSnapshot.from_user(user)
+    context.user_data['user'] = snapshot
+    return snapshot
+
+
+class UserStateStore:
+    """
+    Bounds the per-user state that python-telegram-bot keeps in Application.user_data.
+
+    Every handled update touches the user's entry. Users idle for longer than `ttl`
+    seconds, and the least recently seen users beyond `max_users`, have their
+    user_data dropped (which also removes it from persistence). A dropped user is
+    transparently reloaded by ensure_user_data on their next message. Users in the
+    middle of a conversation (holding any of CONVERSATION_KEYS and seen within
+    `conversation_timeout`) are skipped, so a half-finished submission is never lost.
+    """
+    # user_data keys a conversation keeps until it ends
+    CONVERSATION_KEYS = ('submission_data', 'filters', 'prop_to_reject', 'price_ranges')
+    # How many entries stats() pickles to estimate the total size
+    SIZE_SAMPLE = 100
+
+    def __init__(self, max_users: int = 10000, ttl: float = 6 * 3600, sweep_interval: float = 600,
+                 conversation_timeout: float = 1800):
+        self.max_users = max_users
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.conversation_timeout = conversation_timeout
+        self._last_seen: "OrderedDict[int, float]" = OrderedDict()
+        self._seeded = False
+        self._last_sweep = time.monotonic()
+        self.evictions = 0
+        # Times an overflow or sweep spared a user mid-conversation (the same user counts each time)
+        self.skipped_active_checks = 0
+
+    def touch(self, application: Application, user_id: int) -> None:
+        now = time.monotonic()
+        if not self._seeded:
+            # Users restored from persistence start their TTL now
+            for known_id in application.user_data.keys():
+                self._last_seen[known_id] = now
+            self._seeded = True
+
+        self._last_seen[user_id] = now
+        self._last_seen.move_to_end(user_id)
+
+        excess = len(self._last_seen) - self.max_users
+        if excess > 0:
+            # Least recently seen first; the user being touched is last and never a candidate
+            candidates = []
+            for known_id, seen_at in self._last_seen.items():
+                if len(candidates) == excess or known_id == user_id:
+                    break
+                if self._in_conversation(application, known_id, seen_at, now):
+                    self.skipped_active_checks += 1
+                else:
+                    candidates.append(known_id)
+            for known_id in candidates:
+                del self._last_seen[known_id]
+                self._evict(application, known_id)
+
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(application, now)
+
+    def _in_conversation(self, application: Application, user_id: int, seen_at: float, now: float) -> bool:
+        if now - seen_at >= self.conversation_timeout:
+            return False
+        data = application.user_data.get(user_id)
+        return bool(data) and any(key in data for key in self.CONVERSATION_KEYS)
+
+    def _sweep(self, application: Application, now: float) -> None:
+        self._last_sweep = now
+        cutoff = now - self.ttl
+        # _last_seen is ordered oldest-first, so stop at the first fresh entry
+        expired = []
+        for user_id, seen_at in self._last_seen.items():
+            if seen_at > cutoff:
+                break
+            if self._in_conversation(application, user_id, seen_at, now):
+                self.skipped_active_checks += 1
+            else:
+                expired.append(user_id)
+        for user_id in expired:
+            del self._last_seen[user_id]
+            self._evict(application, user_id)
+        logger.info(f"Bot user state: {self.stats(application)}")
+
+    def _evict(self, application: Application, user_id: int) -> None:
+        if user_id in application.user_data:
+            application.drop_user_data(user_id)
+            self.evictions += 1
+
+    def stats(self, application: Application) -> dict:
+        """Entry count and approximate serialized size of all per-user state, estimated from a sample."""
+        user_ids = list(application.user_data.keys())
+        sample = random.sample(user_ids, min(len(user_ids), self.SIZE_SAMPLE))
+        sample_bytes = 0
+        for user_id in sample:
+            try:
+                sample_bytes += len(pickle.dumps(application.user_data[user_id]))
+            except Exception:
+                pass
+        return {
+            "entries": len(user_ids),
+            "tracked": len(self._last_seen),
+            "approx_bytes": sample_bytes * len(user_ids) // len(sample) if sample else 0,
+            "evictions": self.evictions,
+            "skipped_active_checks": self.skipped_active_checks,
+            "max_users": self.max_users,
+            "ttl_seconds": self.ttl,
+        }
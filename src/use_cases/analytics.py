@@ -0,0 +1,83 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+def price_stats(price_counts: List[Tuple[float, int]]) -> dict:
+    """Count, mean and median from (price, number of listings at that price) pairs."""
+    price_counts = sorted(price_counts)
+    total = sum(n for _, n in price_counts)
+    if not total:
+        return {"count": 0, "avg_price": None, "median_price": None}
+    # The median sits at 0-based positions (total - 1) // 2 and total // 2 of the sorted prices
+    lower_pos, upper_pos = (total - 1) // 2, total // 2
+    lower = upper = None
+    seen = 0
+    for price, n in price_counts:
+        seen += n
+        if lower is None and seen > lower_pos:
+            lower = price
+        if seen > upper_pos:
+            upper = price
+            break
+    return {
+        "count": total,
+        "avg_price": round(sum(price * n for price, n in price_counts) / total, 2),
+        "median_price": round((lower + upper) / 2, 2),
+    }
+
+
+def rollup(rows: Iterable[dict], dims: Sequence[str], statuses: Iterable[str]) -> dict:
+    """
+    Aggregates rows grouped by (*dims, price_etb) with a count `n` into per-status and
+    per-dims counts with average and median prices. `dims` must start with "status".
+    """
+    by_status: Dict[str, List[Tuple[float, int]]] = {status: [] for status in statuses}
+    by_dims: Dict[tuple, List[Tuple[float, int]]] = defaultdict(list)
+    for row in rows:
+        price_count = (float(row["price_etb"]), int(row["n"]))
+        by_status.setdefault(row["status"], []).append(price_count)
+        by_dims[tuple(row[dim] for dim in dims)].append(price_count)
+    breakdown = [{**dict(zip(dims, key)), **price_stats(prices)} for key, prices in by_dims.items()]
+    breakdown.sort(key=lambda entry: entry["count"], reverse=True)
+    return {
+        "by_status": {status: price_stats(prices) for status, prices in by_status.items()},
+        "breakdown": breakdown,
+    }
+
+
+# Rollup events and the keys they are reported under
+ACTIVITY_EVENTS = {"submitted": "submissions", "approved": "approvals", "rejected": "rejections", "sold": "sales"}
+
+
+def activity_series(counts: Iterable[dict], prices: Iterable[dict], interval: str = "day",
+                    by_site: bool = True) -> List[dict]:
+    """
+    Buckets daily rollup rows (day, location_site, event, n) into days or ISO weeks
+    (keyed by their Monday), with event counts, and the median price of the listings
+    approved and sold in each period from the price rows (day, location_site, event, price_etb, n).
+    """
+    def period_of(row: dict) -> tuple:
+        day = row["day"]
+        period = day - timedelta(days=day.weekday()) if interval == "week" else day
+        return period, row["location_site"] if by_site else None
+
+    event_counts: Dict[tuple, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for row in counts:
+        event_counts[period_of(row)][row["event"]] += int(row["n"])
+    event_prices: Dict[tuple, Dict[str, List[Tuple[float, int]]]] = defaultdict(lambda: defaultdict(list))
+    for row in prices:
+        event_prices[period_of(row)][row["event"]].append((float(row["price_etb"]), int(row["n"])))
+
+    series = []
+    for period, site in sorted(event_counts, key=lambda key: (key[0], key[1] or "")):
+        entry = {"period": period.isoformat()}
+        if by_site:
+            entry["site"] = site
+        for event, label in ACTIVITY_EVENTS.items():
+            entry[label] = event_counts[(period, site)].get(event, 0)
+        period_prices = event_prices.get((period, site), {})
+        entry["median_price"] = price_stats(period_prices.get("approved", []))["median_price"]
+        entry["median_sold_price"] = price_stats(period_prices.get("sold", []))["median_price"]
+        series.append(entry)
+    return series
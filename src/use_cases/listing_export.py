@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Columns exported as "a|b" strings; NDJSON turns them back into lists
+LIST_COLUMNS = ("image_urls", "images", "roles")
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def ndjson_lines(rows: Iterable[dict]) -> Iterator[str]:
+    """One JSON object per line, written as each row arrives."""
+    for row in rows:
+        row = {
+            key: ((value.split("|") if value else []) if key in LIST_COLUMNS else value)
+            for key, value in row.items()
+        }
+        yield json.dumps(row, default=_json_default, ensure_ascii=False) + "\n"
+
+
+def csv_lines(rows: Iterable[dict], rows_per_chunk: int = 100) -> Iterator[str]:
+    """
+    CSV with a header taken from the first row, yielded `rows_per_chunk` rows at a time.
+    The columns match what the importer reads back (see listing_import).
+    """
+    buffer = io.StringIO()
+    writer = None
+    pending = 0
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow({
+            key: value.isoformat() if isinstance(value, (datetime, date)) else value
+            for key, value in row.items()
+        })
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_lines(rows: Iterable[dict], fmt: str) -> Iterator[str]:
+    return csv_lines(rows) if fmt == "csv" else ndjson_lines(rows)
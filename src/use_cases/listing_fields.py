@@ -0,0 +1,94 @@
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from src.domain.models.car_models import Car
+from src.domain.models.property_models import Property
+
+LISTING_MODELS = {"property": Property, "car": Car}
+ID_FIELDS = {"property": "pid", "car": "cid"}
+IMAGE_FIELDS = {"property": "image_urls", "car": "images"}
+# The compact shape list endpoints return by default, enough for a browse grid card
+SUMMARY_FIELDS = {
+    "property": ("pid", "property_type", "price_etb", "site", "bedrooms", "cover_image"),
+    "car": ("cid", "car_type", "price_etb", "manufacturer", "model_name", "model_year", "cover_image"),
+}
+# Fields that are not model attributes -> the columns they are read from ("cover_image" is
+# the first image, selected by the repository on its own)
+DERIVED_FIELDS = {
+    "property": {"site": ("location_site",), "cover_image": ("cover_image",)},
+    "car": {"cover_image": ("cover_image",)},
+}
+LOCATION_COLUMNS = ("location_region", "location_city", "location_site")
+# Stored as TINYINT, so rows hold 0/1 where the models hold booleans
+BOOL_FIELDS = {
+    kind: {name for name, info in model.model_fields.items() if info.annotation in (bool, Optional[bool])}
+    for kind, model in LISTING_MODELS.items()
+}
+
+
+def parse_fields(value: Optional[str], kind: str, default: str = "summary") -> Optional[Tuple[str, ...]]:
+    """
+    Reads a `fields=` param: "summary", "full" or comma-separated field names. Returns the
+    fields to include (the id always first), or None for the full listing. Raises
+    ValueError for unknown names.
+    """
+    value = (value or default).strip()
+    if value == "full":
+        return None
+    if value == "summary":
+        return SUMMARY_FIELDS[kind]
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    allowed = set(LISTING_MODELS[kind].model_fields) | set(DERIVED_FIELDS[kind])
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    id_field = ID_FIELDS[kind]
+    return (id_field, *(name for name in names if name != id_field))
+
+
+def columns_for(fields: Sequence[str], kind: str) -> List[str]:
+    """The columns a repository has to select to build `fields`."""
+    columns = []
+    for field in fields:
+        if field in DERIVED_FIELDS[kind]:
+            columns.extend(DERIVED_FIELDS[kind][field])
+        elif field == "location":
+            columns.extend(LOCATION_COLUMNS)
+        else:
+            columns.append(field)
+    return list(dict.fromkeys(columns))
+
+
+def project_row(row: Dict[str, Any], fields: Sequence[str], kind: str) -> dict:
+    """Builds the projected listing from a row holding the columns `columns_for(fields)` named."""
+    data = {}
+    for field in fields:
+        if field == "site":
+            value = row["location_site"]
+        elif field == "location":
+            value = {"region": row["location_region"], "city": row["location_city"], "site": row["location_site"]}
+        else:
+            value = row[field]
+        if isinstance(value, Decimal):
+            value = float(value)
+        elif value is not None and field in BOOL_FIELDS[kind]:
+            value = bool(value)
+        data[field] = value
+    return data
+
+
+def project(listing: BaseModel, fields: Sequence[str], kind: str) -> dict:
+    """The same projection built from a full Property or Car."""
+    dumped = listing.model_dump(include={field for field in fields if field in listing.model_fields})
+    images = getattr(listing, IMAGE_FIELDS[kind])
+    data = {}
+    for field in fields:
+        if field == "site":
+            data[field] = listing.location.site
+        elif field == "cover_image":
+            data[field] = images[0] if images else None
+        else:
+            data[field] = dumped[field]
+    return data
@@ -0,0 +1,101 @@
+import csv
+import json
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+from src.domain.models.car_models import CarCreate
+from src.domain.models.property_models import PropertyCreate
+
+IMPORT_FORMATS = ("csv", "ndjson")
+LISTING_MODELS = {"property": PropertyCreate, "car": CarCreate}
+# Image columns hold several URLs in one CSV cell, separated by "|" (so a URL itself can't contain one)
+IMAGE_FIELDS = {"property": "image_urls", "car": "images"}
+LOCATION_COLUMNS = {"location_region": "region", "location_city": "city", "location_site": "site"}
+
+
+def read_rows(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yields (row number, raw row, parse error) from CSV (with a header row) or NDJSON text,
+    one row at a time. Row numbers are 1-based data rows; blank NDJSON lines are skipped.
+    """
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            # Empty cells mean "not given", so optional fields keep their defaults
+            yield number, {key: value for key, value in row.items() if key and value not in (None, "")}, None
+        return
+    number = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "each line must be a JSON object"
+            continue
+        yield number, row, None
+
+
+def normalize_row(row: dict, kind: str) -> dict:
+    """Maps flat export columns (location_region, ..., "a|b" image lists) onto the create models' shape."""
+    row = dict(row)
+    if "location" not in row and any(column in row for column in LOCATION_COLUMNS):
+        row["location"] = {field: row.pop(column, None) for column, field in LOCATION_COLUMNS.items()}
+    images = IMAGE_FIELDS[kind]
+    if isinstance(row.get(images), str):
+        row[images] = [url.strip() for url in row[images].split("|") if url.strip()]
+    return row
+
+
+def validation_errors(e: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()]
+
+
+def import_rows(rows: Iterable[Tuple[int, Optional[dict], Optional[str]]], kind: str,
+                insert_batch: Callable[[List[BaseModel]], int], batch_size: int = 500,
+                max_errors: int = 1000) -> dict:
+    """
+    Validates rows with the listing's create model and hands valid ones to `insert_batch`
+    `batch_size` at a time. A batch that fails to insert is reported against each of its rows.
+    Returns counts and a per-row error report (the first `max_errors` failed rows).
+    """
+    model = LISTING_MODELS[kind]
+    report = {"rows": 0, "inserted": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+    def fail(number: int, errors: List[str]) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append({"row": number, "errors": errors})
+        else:
+            report["errors_truncated"] = True
+
+    batch: List[Tuple[int, BaseModel]] = []
+
+    def flush() -> None:
+        try:
+            report["inserted"] += insert_batch([item for _, item in batch])
+        except Exception as e:
+            for number, _ in batch:
+                fail(number, [f"insert failed: {e}"])
+        batch.clear()
+
+    for number, row, error in rows:
+        report["rows"] += 1
+        if error:
+            fail(number, [error])
+            continue
+        try:
+            batch.append((number, model(**normalize_row(row, kind))))
+        except ValidationError as e:
+            fail(number, validation_errors(e))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return report
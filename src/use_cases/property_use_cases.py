@@ -1,16 +1,207 @@
-from typing import List, Optional
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
 # Note: Type hint references might be misleading if repo is now generic or different
 # but we keep imports for models
 from src.domain.models.car_models import Car, CarCreate, CarFilter, CarStatus
-from src.domain.models.property_models import Property, PropertyCreate, PropertyFilter, PropertyStatus
-from src.utils.exceptions import InvalidOperationError
+from src.domain.models.property_models import Property, PropertyCreate, PropertyFilter, PropertyStatus, PropertyType
+from src.utils.cache import LRUCache, StaleWhileRevalidate
+from src.use_cases.analytics import activity_series, rollup
+from src.use_cases.listing_fields import columns_for, project, project_row
+from src.use_cases.listing_import import import_rows, read_rows
+from src.infrastructure.search.text_index import PropertyTextIndex
+from src.infrastructure.search.price_buckets import PriceDistribution
+from src.infrastructure.search.facets import price_ranges
 
 from src.utils.config import settings
+from src.utils.display_utils import clear_property_cards, invalidate_property_card
+from src.utils.constants import PRICE_BUCKET_BOUNDS
+
+logger = logging.getLogger(__name__)
+
+def _create_search_index():
+    """Builds the in-memory search index when SEARCH_BACKEND=memory and NumPy is available."""
+    if settings.SEARCH_BACKEND != "memory":
+        return None
+    try:
+        from src.infrastructure.search.property_index import PropertySearchIndex
+    except ImportError as e:
+        logger.warning(f"SEARCH_BACKEND=memory needs NumPy ({e}); using SQL search instead.")
+        return None
+    return PropertySearchIndex(
+        sync_interval=settings.SEARCH_INDEX_SYNC_SECONDS,
+        rebuild_interval=settings.SEARCH_INDEX_REBUILD_SECONDS,
+    )
+
+# Statuses a car may be moved into, and the statuses it may come from
+CAR_TRANSITIONS = {
+    CarStatus.APPROVED: [CarStatus.PENDING],
+    CarStatus.REJECTED: [CarStatus.PENDING],
+    CarStatus.SOLD: [CarStatus.APPROVED],
+}
+
+# Bulk moderation actions: the status each moves a property to, and the statuses it may come from
+BULK_PROPERTY_ACTIONS = {
+    "approve": (PropertyStatus.APPROVED, [PropertyStatus.PENDING]),
+    "reject": (PropertyStatus.REJECTED, [PropertyStatus.PENDING]),
+    "mark_sold": (PropertyStatus.SOLD, [PropertyStatus.APPROVED]),
+}
+BULK_CAR_ACTIONS = {"approve": CarStatus.APPROVED, "reject": CarStatus.REJECTED, "mark_sold": CarStatus.SOLD}
+
+
+def _bulk_outcomes(ids: List[str], done: set, statuses: dict) -> List[dict]:
+    """One outcome per requested id, in request order: ok, not_found, or conflict with the current status."""
+    outcomes = []
+    for listing_id in dict.fromkeys(ids):
+        if listing_id in done:
+            outcomes.append({"id": listing_id, "outcome": "ok"})
+        elif listing_id in statuses:
+            outcomes.append({"id": listing_id, "outcome": "conflict", "status": statuses[listing_id]})
+        else:
+            outcomes.append({"id": listing_id, "outcome": "not_found"})
+    return outcomes
+
 
 class PropertyUseCases:
     def __init__(self, repo):
         # repo is duck-typed, expected to have sync sync methods now
         self.repo = repo
+        # Search results keyed by (generation, canonical filter, page). Any write that can
+        # change what a search returns bumps the generation, so older entries are never read.
+        self._property_query_cache = LRUCache(maxsize=settings.QUERY_CACHE_MAX_ENTRIES, ttl=settings.QUERY_CACHE_TTL_SECONDS)
+        self._car_query_cache = LRUCache(maxsize=settings.QUERY_CACHE_MAX_ENTRIES, ttl=settings.QUERY_CACHE_TTL_SECONDS)
+        self.property_generation = 0
+        self.car_generation = 0
+        # kind -> (generation, (newest updated_at, row count), checked at), see listing_version
+        self._listing_stamps = {}
+        # Optional in-memory index of approved listings; None means searches go to SQL
+        self.search_index = _create_search_index()
+        # Prices of approved listings, for price buckets cut at the current quantiles
+        self.price_distribution = PriceDistribution(
+            sync_interval=settings.SEARCH_INDEX_SYNC_SECONDS,
+            rebuild_interval=settings.SEARCH_INDEX_REBUILD_SECONDS,
+        )
+        # Keyword index for `q` searches, built on first use when the database has no FULLTEXT index
+        self.text_index = None
+        # Analytics are served stale while refreshing; the refresh runs the property and car scans
+        # side by side on their own pool, so it never waits on a worker it is holding itself
+        self._analytics_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analytics")
+        self._analytics_scan_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="analytics-scan")
+        self._analytics = StaleWhileRevalidate(
+            self._compute_analytics,
+            self._analytics_executor,
+            fresh_for=settings.ANALYTICS_FRESH_SECONDS,
+            max_stale=settings.ANALYTICS_MAX_STALE_SECONDS,
+        )
+
+    # --- Query Cache ---
+    @staticmethod
+    def _filter_key(filters) -> tuple:
+        return tuple(sorted(filters.model_dump(exclude_none=True, mode="json").items()))
+
+    def _bump_property_generation(self) -> None:
+        self.property_generation += 1
+        self._property_query_cache.clear()
+        self._analytics.invalidate()
+
+    def _index_property(self, prop: Property) -> None:
+        invalidate_property_card(prop.pid)
+        if self.search_index is not None:
+            self.search_index.upsert(prop)
+        if self.text_index is not None:
+            self.text_index.upsert(prop)
+        self.price_distribution.upsert(prop)
+
+    def _unindex_property(self, property_id: str) -> None:
+        invalidate_property_card(property_id)
+        if self.search_index is not None:
+            self.search_index.remove(property_id)
+        if self.text_index is not None:
+            self.text_index.remove(property_id)
+        self.price_distribution.remove(property_id)
+
+    def _keyword_index(self, filters: PropertyFilter):
+        """The in-process text index to answer a keyword search with, or None to let the database do it."""
+        if not filters.q or not PropertyTextIndex.supports(filters) or self.repo.supports_fulltext():
+            return None
+        if self.text_index is None:
+            self.text_index = PropertyTextIndex(
+                sync_interval=settings.SEARCH_INDEX_SYNC_SECONDS,
+                rebuild_interval=settings.SEARCH_INDEX_REBUILD_SECONDS,
+            )
+        return self.text_index
+
+    def _bump_car_generation(self) -> None:
+        self.car_generation += 1
+        self._car_query_cache.clear()
+        self._analytics.invalidate()
+
+    def get_query_cache_stats(self) -> dict:
+        return {
+            "properties": {**self._property_query_cache.stats(), "generation": self.property_generation},
+            "cars": {**self._car_query_cache.stats(), "generation": self.car_generation},
+        }
+
+    # --- Listing Versions ---
+    def listing_version(self, kind: str) -> str:
+        """
+        A string that changes whenever a listing of `kind` ("property" or "car") may have
+        changed, used for ETags. It combines this process's generation counter, bumped by
+        every write made here, with the newest updated_at and row count in the database,
+        re-read at most every LISTING_VERSION_CHECK_SECONDS. If those change without a local
+        write (the bot or another worker wrote or deleted), the generation is bumped so
+        cached searches are dropped along with the ETags.
+        """
+        generation = self.property_generation if kind == "property" else self.car_generation
+        seen = self._listing_stamps.get(kind)
+        now = time.monotonic()
+        if seen and seen[0] == generation and now - seen[2] < settings.LISTING_VERSION_CHECK_SECONDS:
+            stamp = seen[1]
+        else:
+            row = self.repo.get_listing_stamp(kind)
+            stamp = (row["updated_at"], row["n"])
+            if seen and seen[0] == generation and seen[1] != stamp:
+                self._listings_changed_elsewhere(kind, deleted=stamp[1] < seen[1][1])
+                generation = self.property_generation if kind == "property" else self.car_generation
+            self._listing_stamps[kind] = (generation, stamp, now)
+        updated_at, count = stamp
+        return f"{kind}-{generation}-{updated_at.strftime('%Y%m%d%H%M%S') if updated_at else 0}-{count}"
+
+    def _listings_changed_elsewhere(self, kind: str, deleted: bool) -> None:
+        logger.info(f"{kind} listings were changed by another process; dropping cached results.")
+        if kind == "car":
+            self._bump_car_generation()
+            return
+        self._bump_property_generation()
+        clear_property_cards()
+        for index in (self.search_index, self.text_index, self.price_distribution):
+            if index is not None:
+                index.expire(rebuild=deleted)
+
+    def get_search_index_stats(self) -> Optional[dict]:
+        return self.search_index.stats() if self.search_index is not None else None
+
+    def get_text_index_stats(self) -> Optional[dict]:
+        return self.text_index.stats() if self.text_index is not None else None
+
+    def get_price_distribution_stats(self) -> dict:
+        return self.price_distribution.stats()
+
+    def get_price_buckets(self, property_type: Optional[PropertyType] = None) -> List[dict]:
+        """
+        Price ranges with roughly equal numbers of approved listings of the given type
+        (all types when None). Falls back to PRICE_BUCKET_BOUNDS when there are none.
+        """
+        self.price_distribution.refresh(self.repo)
+        buckets = self.price_distribution.buckets(property_type, settings.PRICE_BUCKET_COUNT)
+        if buckets:
+            return buckets
+        return price_ranges(PRICE_BUCKET_BOUNDS)
+
+    def _price_bounds(self, property_type: Optional[PropertyType]) -> List[float]:
+        return [bucket["min"] for bucket in self.get_price_buckets(property_type)[1:]]
 
     def submit_property(self, property_data: PropertyCreate) -> Property:
         """Broker submits a new property. It is saved as 'pending'."""
@@ -18,67 +209,163 @@ class PropertyUseCases:
         if settings.ADMIN_PHONE_NUMBER:
             property_data.broker_phone = settings.ADMIN_PHONE_NUMBER
             
-        return self.repo.create_property(property_data)
+        prop = self.repo.create_property(property_data)
+        self._bump_property_generation()
+        return prop
 
-    def get_pending_properties(self) -> List[Property]:
-        """Admin fetches all properties awaiting approval."""
-        return self.repo.get_properties_by_status(PropertyStatus.PENDING)
+    def get_pending_properties(self, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
+        """Admin fetches properties awaiting approval, optionally one page at a time."""
+        return self.repo.get_properties_by_status(PropertyStatus.PENDING, limit=limit, offset=offset)
 
     def approve_property(self, property_id: str) -> Property:
         """Admin approves a property."""
-        prop_to_approve = self.repo.get_property_by_id(property_id)
-        if prop_to_approve.status != PropertyStatus.PENDING:
-            raise InvalidOperationError(f"Cannot approve property. Current status is '{prop_to_approve.status.value}'.")
-        
-        update_data = {"status": PropertyStatus.APPROVED.value, "rejection_reason": None}
-        return self.repo.update_property(property_id, update_data)
+        return self._transition_property(
+            property_id, [PropertyStatus.PENDING], PropertyStatus.APPROVED, {"rejection_reason": None}
+        )
 
     def reject_property(self, property_id: str, reason: str) -> Property:
         """Admin rejects a property with a given reason."""
-        prop_to_reject = self.repo.get_property_by_id(property_id)
-        if prop_to_reject.status != PropertyStatus.PENDING:
-            raise InvalidOperationError(f"Cannot reject property. Current status is '{prop_to_reject.status.value}'.")
-            
-        update_data = {"status": PropertyStatus.REJECTED.value, "rejection_reason": reason}
-        return self.repo.update_property(property_id, update_data)
+        return self._transition_property(
+            property_id, [PropertyStatus.PENDING], PropertyStatus.REJECTED, {"rejection_reason": reason}
+        )
 
-    def find_properties(self, filters: PropertyFilter) -> List[Property]:
+    def find_properties(self, filters: PropertyFilter, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
         """Buyer/Admin/Broker finds approved properties based on filters."""
-        return self.repo.query_properties(filters)
+        if self.search_index is not None and self.search_index.supports(filters):
+            self.search_index.refresh(self.repo)
+            return self.search_index.query(filters, limit=limit, offset=offset)
+        text_index = self._keyword_index(filters)
+        if text_index is not None:
+            text_index.refresh(self.repo)
+            return text_index.query(filters, limit=limit, offset=offset)
+
+        generation = self.property_generation
+        key = (generation, self._filter_key(filters), limit, offset)
+        cached = self._property_query_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        properties = self.repo.query_properties(filters, limit=limit, offset=offset)
+        if generation == self.property_generation:
+            self._property_query_cache.set(key, tuple(properties))
+        return properties
+
+    def find_property_fields(self, filters: PropertyFilter, fields: tuple,
+                             limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+        """
+        Search results reduced to `fields` (see listing_fields). SQL searches select only the
+        columns those fields need; searches served from an in-memory index project the full
+        listings. Cached like find_properties.
+        """
+        if (self.search_index is not None and self.search_index.supports(filters)) or self._keyword_index(filters):
+            return [project(p, fields, "property") for p in self.find_properties(filters, limit=limit, offset=offset)]
+
+        generation = self.property_generation
+        key = ("fields", generation, self._filter_key(filters), fields, limit, offset)
+        cached = self._property_query_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        rows = self.repo.query_property_columns(filters, columns_for(fields, "property"), limit=limit, offset=offset)
+        properties = [project_row(row, fields, "property") for row in rows]
+        if generation == self.property_generation:
+            self._property_query_cache.set(key, tuple(properties))
+        return properties
+
+    def get_property_facets(self, filters: PropertyFilter) -> dict:
+        """Listing counts per facet value for a search, cached like search results."""
+        index = self.search_index if self.search_index is not None and self.search_index.supports(filters) else None
+        if index is None:
+            index = self._keyword_index(filters)
+        if index is not None:
+            index.refresh(self.repo)
+            return index.facets(filters, self._price_bounds(filters.property_type))
+
+        generation = self.property_generation
+        key = ("facets", generation, self._filter_key(filters))
+        cached = self._property_query_cache.get(key)
+        if cached is not None:
+            return cached
+        facets = self.repo.get_property_facets(filters, self._price_bounds(filters.property_type))
+        if generation == self.property_generation:
+            self._property_query_cache.set(key, facets)
+        return facets
 
     def mark_property_as_sold(self, property_id: str) -> Property:
         """Admin marks an approved property as sold."""
-        prop_to_sell = self.repo.get_property_by_id(property_id)
-        if prop_to_sell.status != PropertyStatus.APPROVED:
-            raise InvalidOperationError(f"Cannot mark as sold. Property must be in 'approved' status.")
-        
-        update_data = {"status": PropertyStatus.SOLD.value}
-        return self.repo.update_property(property_id, update_data)
+        return self._transition_property(property_id, [PropertyStatus.APPROVED], PropertyStatus.SOLD)
 
     def delete_property(self, property_id: str):
         """Admin permanently deletes a property."""
         self.repo.delete_property(property_id)
+        self._bump_property_generation()
+        self._unindex_property(property_id)
         
-    def get_properties_by_broker(self, broker_id: str) -> List[Property]:
+    def get_properties_by_broker(self, broker_id: str, limit: Optional[int] = None, offset: int = 0) -> List[Property]:
         """Broker fetches their own submitted properties."""
-        return self.repo.get_properties_by_broker_id(broker_id)
+        return self.repo.get_properties_by_broker_id(broker_id, limit=limit, offset=offset)
 
     def get_property_details(self, property_id: str) -> Property:
         """Fetches full details for a single property."""
         return self.repo.get_property_by_id(property_id)
 
+    def get_properties_by_ids(self, property_ids: List[str]) -> List[Property]:
+        """Fetches several properties at once (favorites, compare, shared links), in the given order."""
+        return self.repo.get_properties_by_ids(property_ids)
+
     def update_property(self, property_id: str, updates: dict) -> Property:
-        return self.repo.update_property(property_id, updates)
+        prop = self.repo.update_property(property_id, updates)
+        self._property_written(prop)
+        return prop
 
-    def get_analytics_summary(self) -> dict:
-        """Retrieves a summary of property and car counts by status."""
-        prop_counts = self.repo.count_properties_by_status()
-        car_counts = self.repo.count_cars_by_status()
+    def _transition_property(self, property_id: str, from_statuses: List[PropertyStatus], to_status: PropertyStatus,
+                             updates: Optional[dict] = None) -> Property:
+        """Atomically moves a property between statuses; raises InvalidOperationError if it is in another status."""
+        prop = self.repo.transition_property_status(property_id, from_statuses, to_status, updates)
+        self._property_written(prop)
+        return prop
+
+    def _property_written(self, prop: Property) -> None:
+        self._bump_property_generation()
+        self._index_property(prop)
+
+    def _compute_analytics(self) -> dict:
+        property_groups = self._analytics_scan_executor.submit(self.repo.get_property_price_groups)
+        car_groups = self._analytics_scan_executor.submit(self.repo.get_car_price_groups)
+        property_rollup = rollup(
+            property_groups.result(), ("status", "property_type", "location_site"), [s.value for s in PropertyStatus]
+        )
+        car_rollup = rollup(car_groups.result(), ("status", "car_type"), [s.value for s in CarStatus])
         return {
-            "properties": {status.value: count for status, count in prop_counts.items()},
-            "cars": {status.value: count for status, count in car_counts.items()},
+            "properties": {status: stats["count"] for status, stats in property_rollup["by_status"].items()},
+            "cars": {status: stats["count"] for status, stats in car_rollup["by_status"].items()},
+            "property_rollup": property_rollup,
+            "car_rollup": car_rollup,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
         }
 
+    def get_analytics_summary(self) -> dict:
+        """
+        Property and car counts by status, plus counts and average/median prices by
+        status x type (x site for properties). Served from a stale-while-revalidate cache.
+        """
+        return self._analytics.get()
+
+    def get_analytics_cache_stats(self) -> dict:
+        return self._analytics.stats()
+
+    # --- Activity Rollups ---
+    def get_activity_timeseries(self, kind: str = "property", interval: str = "day", days: int = 30,
+                                site: Optional[str] = None, by_site: bool = True) -> List[dict]:
+        """Submissions, approvals, rejections, sales and median prices per period, read from the rollup only."""
+        since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+        if interval == "week":
+            since -= timedelta(days=since.weekday())  # start on a full week
+        counts = self.repo.get_listing_activity(kind, since, site=site)
+        prices = self.repo.get_listing_activity_prices(kind, since, site=site)
+        return activity_series(counts, prices, interval=interval, by_site=by_site)
+
+    def rebuild_activity_rollups(self) -> int:
+        return self.repo.rebuild_listing_activity()
+
     def get_all_properties(self) -> List[Property]:
         """Admin fetches all properties, regardless of status or broker."""
         return self.repo.query_properties(PropertyFilter())
@@ -92,13 +379,129 @@ class PropertyUseCases:
         # cars start as pending for admin approval
         if not getattr(car_data, 'status', None):
             car_data.status = CarStatus.PENDING
-        return self.repo.create_car(car_data)
+        car = self.repo.create_car(car_data)
+        self._bump_car_generation()
+        return car
 
     def find_cars(self, filters: CarFilter) -> list[Car]:
-        return self.repo.query_cars(filters)
+        generation = self.car_generation
+        key = (generation, self._filter_key(filters))
+        cached = self._car_query_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        cars = self.repo.query_cars(filters)
+        if generation == self.car_generation:
+            self._car_query_cache.set(key, tuple(cars))
+        return cars
+
+    def find_car_fields(self, filters: CarFilter, fields: tuple) -> List[dict]:
+        """Car search results reduced to `fields`, selecting only the columns they need."""
+        generation = self.car_generation
+        key = ("fields", generation, self._filter_key(filters), fields)
+        cached = self._car_query_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        cars = [project_row(row, fields, "car") for row in self.repo.query_car_columns(filters, columns_for(fields, "car"))]
+        if generation == self.car_generation:
+            self._car_query_cache.set(key, tuple(cars))
+        return cars
+
+    def list_all_cars(self) -> list[Car]:
+        return self.repo.list_all_cars()
+
+    def update_car_status(self, car_id: str, status: CarStatus) -> Car:
+        """Admin approves, rejects or marks a car as sold; only from the statuses in CAR_TRANSITIONS."""
+        car = self.repo.update_car_status(car_id, status, from_statuses=CAR_TRANSITIONS.get(status))
+        self._bump_car_generation()
+        return car
+
+    def delete_car(self, car_id: str) -> None:
+        self.repo.delete_car(car_id)
+        self._bump_car_generation()
+
+    # --- Bulk Import ---
+    def import_listings(self, kind: str, lines: Iterable[str], fmt: str, status: str = "pending") -> dict:
+        """
+        Imports "property" or "car" listings from CSV/NDJSON lines as `status` (pending or approved).
+        Rows are validated one at a time and inserted IMPORT_BATCH_SIZE per transaction;
+        returns the per-row report from import_rows.
+        """
+        def insert_batch(items: list) -> int:
+            # Same contact rule as single submissions
+            if settings.ADMIN_PHONE_NUMBER:
+                for item in items:
+                    item.broker_phone = settings.ADMIN_PHONE_NUMBER
+            if kind == "car":
+                created = self.repo.create_cars(items, CarStatus(status))
+                self._bump_car_generation()
+                return len(created)
+            created = self.repo.create_properties(items, PropertyStatus(status))
+            self._bump_property_generation()
+            if status == PropertyStatus.APPROVED.value:
+                for prop in created:
+                    self._index_property(prop)
+            return len(created)
+
+        return import_rows(read_rows(lines, fmt), kind, insert_batch, batch_size=settings.IMPORT_BATCH_SIZE)
+
+    # --- Export ---
+    def export_properties(self, filters: PropertyFilter) -> Iterable[dict]:
+        """Streams flat property rows of any status (unless filtered) straight from the database."""
+        return self.repo.stream_properties(filters)
+
+    def export_cars(self, filters: CarFilter, status: Optional[CarStatus] = None) -> Iterable[dict]:
+        return self.repo.stream_cars(filters, status)
+
+    # --- Bulk Moderation ---
+    def bulk_moderate_properties(self, action: str, property_ids: List[str], reason: Optional[str] = None) -> List[dict]:
+        """
+        Approves, rejects, marks as sold or deletes many properties in one transaction.
+        Approved and rejected brokers are queued for notification by the bot.
+        """
+        if action == "delete":
+            deleted = self.repo.delete_properties(property_ids)
+            if deleted:
+                self._bump_property_generation()
+                for property_id in deleted:
+                    self._unindex_property(property_id)
+            return _bulk_outcomes(property_ids, set(deleted), {})
+
+        to_status, from_statuses = BULK_PROPERTY_ACTIONS[action]
+        updates = None
+        if to_status != PropertyStatus.SOLD:
+            updates = {"rejection_reason": reason if to_status == PropertyStatus.REJECTED else None}
+        changed, statuses = self.repo.bulk_transition_properties(property_ids, from_statuses, to_status, updates, reason=reason)
+        if changed:
+            self._bump_property_generation()
+            for prop in changed:
+                self._index_property(prop)
+        return _bulk_outcomes(property_ids, {prop.pid for prop in changed}, statuses)
+
+    def bulk_moderate_cars(self, action: str, car_ids: List[str], reason: Optional[str] = None) -> List[dict]:
+        """Car counterpart of bulk_moderate_properties."""
+        if action == "delete":
+            deleted = self.repo.delete_cars(car_ids)
+            if deleted:
+                self._bump_car_generation()
+            return _bulk_outcomes(car_ids, set(deleted), {})
+
+        to_status = BULK_CAR_ACTIONS[action]
+        changed, statuses = self.repo.bulk_transition_cars(car_ids, CAR_TRANSITIONS[to_status], to_status, reason=reason)
+        if changed:
+            self._bump_car_generation()
+        return _bulk_outcomes(car_ids, {car.cid for car in changed}, statuses)
+
+    def get_pending_broker_notifications(self, limit: int = 100) -> List[dict]:
+        return self.repo.get_pending_broker_notifications(limit)
+
+    def mark_broker_notifications_sent(self, notification_ids: list) -> None:
+        self.repo.mark_broker_notifications_sent(notification_ids)
 
     def get_car_details(self, car_id: str) -> Car:
         return self.repo.get_car_by_id(car_id)
 
+    def get_cars_by_ids(self, car_ids: List[str]) -> list[Car]:
+        return self.repo.get_cars_by_ids(car_ids)
+
     def get_cars_by_broker(self, broker_id: str) -> list[Car]:
         return self.repo.get_cars_by_broker_id(broker_id)
@@ -4,11 +4,56 @@ from src.utils.config import settings
 from src.utils.exceptions import UserNotFoundError
 from src.utils.i18n import translations
 from src.utils.auth_utils import hash_password ,verify_password
+from src.utils.cache import LRUCache
 
 class UserUseCases:
     def __init__(self, repo):
         # repo is duck-typed, expected to have sync sync methods now
         self.repo = repo
+        # Read-through cache of users by uid, plus a telegram_id -> uid index.
+        # Entries expire after the TTL and are dropped explicitly on every write.
+        self._user_cache = LRUCache(maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.USER_CACHE_TTL_SECONDS)
+        # uid -> stored token version (-1 for unknown users), re-read from the database
+        # after TOKEN_VERSION_CHECK_SECONDS so revocations made by other processes apply promptly
+        self._token_versions = LRUCache(
+            maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.TOKEN_VERSION_CHECK_SECONDS
+        )
+
+    # --- User Cache ---
+    def _cache_user(self, user: User) -> User:
+        if user:
+            self._user_cache.set(("uid", user.uid), user)
+            if user.telegram_id:
+                self._user_cache.set(("tg", user.telegram_id), user.uid)
+        return user
+
+    def _invalidate_user(self, uid: str) -> None:
+        cached = self._user_cache.pop(("uid", uid))
+        if cached and cached.telegram_id:
+            self._user_cache.pop(("tg", cached.telegram_id))
+
+    def get_user_cache_stats(self) -> dict:
+        return self._user_cache.stats()
+
+    # --- Token Revocation ---
+    def _revoke_tokens(self, uid: str) -> User:
+        user = self.repo.bump_token_version(uid)
+        self._token_versions.set(uid, user.token_version)
+        return user
+
+    def is_token_current(self, uid: str, token_version: int) -> bool:
+        """
+        Checks a token's version against the one stored for the user. Revocations made by
+        this process apply at once; others are seen within TOKEN_VERSION_CHECK_SECONDS.
+        Tokens of users that no longer exist are never current.
+        """
+        current = self._token_versions.get(uid)
+        # A token newer than the cached version was issued after it was read, so re-read it
+        if current is None or 0 <= current < token_version:
+            stored = self.repo.get_token_version(uid)
+            current = stored if stored is not None else -1
+            self._token_versions.set(uid, current)
+        return current == token_version
 
     def initialize_admin_user(self):
         """
@@ -33,16 +78,23 @@ class UserUseCases:
         Otherwise, it creates a new regular user.
         """
         # 1. Check if user already exists with this telegram_id
+        cached_uid = self._user_cache.get(("tg", telegram_id))
+        if cached_uid:
+            cached_user = self._user_cache.get(("uid", cached_uid))
+            if cached_user and cached_user.telegram_id == telegram_id:
+                return cached_user
+
         existing_user = self.repo.get_user_by_telegram_id(telegram_id)
         if existing_user:
-            return existing_user
+            return self._cache_user(existing_user)
 
         # 2. If not, check if this is the admin logging in for the first time
         unclaimed_admin = self.repo.find_unclaimed_admin()
         if unclaimed_admin:
             # This is the admin! Claim the account by updating the telegram_id.
             updates = {"telegram_id": telegram_id, "display_name": display_name}
-            claimed_admin_user = self.repo.update_user(unclaimed_admin.uid, updates)
+            self._invalidate_user(unclaimed_admin.uid)
+            claimed_admin_user = self._cache_user(self.repo.update_user(unclaimed_admin.uid, updates))
             print(f"Admin account for {claimed_admin_user.phone_number} claimed by Telegram user {telegram_id}.")
             return claimed_admin_user
 
@@ -53,10 +105,17 @@ class UserUseCases:
             display_name=display_name,
             roles=[]  # New users start with no roles, they select one
         )
-        return self.repo.create_user(new_user_data)
+        return self._cache_user(self.repo.create_user(new_user_data))
         
     def get_user_by_id(self, uid: str) -> Optional[User]:
-        return self.repo.get_user_by_id(uid)
+        cached = self._user_cache.get(("uid", uid))
+        if cached is not None:
+            return cached
+        return self._cache_user(self.repo.get_user_by_id(uid))
+
+    def get_users_by_ids(self, uids: list[str]) -> dict[str, User]:
+        """Resolves many users at once, keyed by uid."""
+        return self.repo.get_users_by_ids(uids)
 
     def get_admin_telegram_id(self) -> Optional[int]:
         """Finds the admin user and returns their Telegram ID."""
@@ -72,8 +131,8 @@ class UserUseCases:
             raise UserNotFoundError(identifier=user_id)
         
         if role not in user.roles:
-            updated_roles = user.roles + [role]
-            return self.repo.update_user(user_id, {"roles": [r.value for r in updated_roles]})
+            # Through set_user_role, so tokens carrying the old roles claim are revoked
+            return self.set_user_role(user_id, role, True)
         
         return user
 
@@ -81,13 +140,28 @@ class UserUseCases:
     def list_users(self) -> list[User]:
         return self.repo.list_users()
 
+    def export_users(self, role: Optional[UserRole] = None, active: Optional[bool] = None):
+        """Streams user rows (without password hashes) straight from the database."""
+        return self.repo.stream_users(role=role, active=active)
+
+    def update_user(self, uid: str, updates: dict) -> User:
+        self._invalidate_user(uid)
+        return self._cache_user(self.repo.update_user(uid, updates))
+
     def set_user_role(self, uid: str, role: UserRole, enable: bool) -> User:
-        return self.repo.set_user_role(uid, role, enable)
+        self._invalidate_user(uid)
+        self.repo.set_user_role(uid, role, enable)
+        return self._cache_user(self._revoke_tokens(uid))
 
     def set_user_active(self, uid: str, active: bool) -> User:
-        return self.repo.set_user_active(uid, active)
+        self._invalidate_user(uid)
+        self.repo.set_user_active(uid, active)
+        return self._cache_user(self._revoke_tokens(uid))
 
     def delete_user(self, uid: str) -> None:
+        self._invalidate_user(uid)
+        # No real token carries a negative version, so every outstanding token is rejected
+        self._token_versions.set(uid, -1)
         return self.repo.delete_user(uid)
 
     # --- Profile Management ---
@@ -98,26 +172,28 @@ class UserUseCases:
         if phone_number is not None:
             updates["phone_number"] = phone_number
         if not updates:
-            return self.repo.get_user_by_id(uid)
-        return self.repo.update_user(uid, updates)
+            return self.get_user_by_id(uid)
+        return self.update_user(uid, updates)
 
-    def change_password(self, uid: str, current_password: str, new_password: str) -> None:
+    def change_password(self, uid: str, current_password: str, new_password: str) -> User:
+        """Changes the password and revokes existing tokens. Returns the updated user so a new token can be issued."""
         user = self.repo.get_user_by_id(uid)
         if not user or not user.hashed_password:
             raise UserNotFoundError(identifier=uid)
-        if not verify_password(current_password, user.hashed_password):
+        if not verify_password(current_password, user.hashed_password, label="change_password"):
             raise UserNotFoundError(identifier="invalid_credentials")
-        new_hash = hash_password(new_password)
-        self.repo.update_user(uid, {"hashed_password": new_hash})
+        new_hash = hash_password(new_password, label="change_password")
+        self.update_user(uid, {"hashed_password": new_hash})
+        return self._cache_user(self._revoke_tokens(uid))
 
     def set_user_language(self, user_id: str, lang_code: str) -> User:
         """Sets the user's preferred language."""
         if lang_code not in translations:
             lang_code = 'en' # Default to english if invalid code is passed
-        return self.repo.update_user(user_id, {"language": lang_code})
+        return self.update_user(user_id, {"language": lang_code})
 
     def authenticate_user(self, phone_number: str, password: str) -> Optional[User]:
         user = self.repo.get_user_by_phone_number(phone_number)
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not verify_password(password, user.hashed_password, label="login"):
             return None
         return user
\ No newline at end of file
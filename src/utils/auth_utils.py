@@ -4,9 +4,18 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from src.utils.config import settings
+from src.utils.worker_pool import BoundedWorkerPool
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a few worker threads keep password work off the request
+# threads; bursts beyond the queue limit are refused with TooManyRequestsError (HTTP 429).
+password_pool = BoundedWorkerPool(
+    "password-hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
 def _truncate_bcrypt(password: str) -> str:
     """Bcrypt only considers first 72 bytes; safely truncate to avoid backend errors."""
     try:
@@ -15,11 +24,11 @@ def _truncate_bcrypt(password: str) -> str:
     except Exception:
         return password[:72]
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(_truncate_bcrypt(password))
+def hash_password(password: str, label: str = "hash") -> str:
+    return password_pool.run(label, pwd_context.hash, _truncate_bcrypt(password))
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(_truncate_bcrypt(plain_password), hashed_password)
+def verify_password(plain_password: str, hashed_password: str, label: str = "verify") -> bool:
+    return password_pool.run(label, pwd_context.verify, _truncate_bcrypt(plain_password), hashed_password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -29,4 +38,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+def create_user_access_token(user) -> str:
+    """Issues a token whose claims are enough to authorize read-only requests without a user lookup."""
+    return create_access_token(data={
+        "sub": user.uid,
+        "roles": [role.value if hasattr(role, 'value') else role for role in user.roles],
+        "active": user.active,
+        "ver": user.token_version,
+    })
\ No newline at end of file
@@ -0,0 +1,160 @@
+# src/utils/cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A small thread-safe LRU cache with an optional per-entry TTL.
+
+    Used for in-process caches shared by the Flask app and the bot. Keeps simple
+    hit/miss/eviction counters so callers can expose them as metrics.
+    """
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Removes every entry whose key matches the predicate. Returns the number removed."""
+        with self._lock:
+            stale_keys = [key for key in self._data if predicate(key)]
+            for key in stale_keys:
+                del self._data[key]
+        return len(stale_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class StaleWhileRevalidate:
+    """
+    Caches the result of one expensive loader (e.g. a dashboard).
+
+    A value younger than `fresh_for` seconds is served as is. An older one (or one
+    marked stale with invalidate()) is still served while a single background refresh
+    runs on `executor`; only a value older than `max_stale` is reloaded inline.
+    """
+    def __init__(self, loader: Callable[[], Any], executor, fresh_for: float = 60, max_stale: float = 600):
+        self.loader = loader
+        self.executor = executor
+        self.fresh_for = fresh_for
+        self.max_stale = max_stale
+        self._value: Any = _MISSING
+        self._loaded_at = 0.0
+        self._stale = False
+        self._invalidations = 0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.loads = 0
+
+    def _load(self) -> Any:
+        with self._lock:
+            started, invalidations = time.monotonic(), self._invalidations
+        value = self.loader()
+        with self._lock:
+            # An invalidate() during the load may not be reflected in the value, so it stays stale
+            self._value, self._loaded_at = value, started
+            self._stale = self._invalidations != invalidations
+            self.loads += 1
+        return value
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._load()
+        except Exception as e:
+            # Keep serving the previous value; the next stale read retries
+            logger.error(f"Background cache refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self) -> Any:
+        with self._lock:
+            value = self._value
+            age = time.monotonic() - self._loaded_at
+            if value is not _MISSING and age < self.max_stale:
+                if not self._stale and age < self.fresh_for:
+                    self.hits += 1
+                    return value
+                self.stale_hits += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    self.executor.submit(self._refresh_in_background)
+                return value
+        return self._load()
+
+    def invalidate(self) -> None:
+        """Marks the value stale; the next get() serves it once more and refreshes it."""
+        with self._lock:
+            self._stale = True
+            self._invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            loaded = self._value is not _MISSING
+            return {
+                "age_seconds": round(time.monotonic() - self._loaded_at, 1) if loaded else None,
+                "stale": self._stale,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "loads": self.loads,
+            }
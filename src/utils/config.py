@@ -28,7 +28,55 @@ class Settings(BaseSettings):
     ADMIN_TG_USERNAME: str = os.getenv("ADMIN_TG_USERNAME")  # Default to a placeholder if not set
     WEB_APP_URL: str = os.getenv("WEB_APP_URL", "https://addishomess.com")
     FRONTEND_ORIGIN: str = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
+    # Local SQLite file for bot user/chat data and conversation states (empty disables persistence)
+    BOT_PERSISTENCE_PATH: str = os.getenv("BOT_PERSISTENCE_PATH", "bot_state.sqlite3")
+    BOT_PERSISTENCE_FLUSH_SECONDS: float = float(os.getenv("BOT_PERSISTENCE_FLUSH_SECONDS", "5"))
+    # Per-user bot state is dropped after this much inactivity, or LRU-first beyond the cap
+    BOT_USER_STATE_MAX_USERS: int = int(os.getenv("BOT_USER_STATE_MAX_USERS", "10000"))
+    BOT_USER_STATE_TTL_SECONDS: float = float(os.getenv("BOT_USER_STATE_TTL_SECONDS", "21600"))
     
+    # In-process user cache used by token_required and the bot (see UserUseCases)
+    USER_CACHE_MAX_ENTRIES: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", "5000"))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    # Access tokens are checked against the stored token version, re-read this often per user
+    TOKEN_VERSION_CHECK_SECONDS: float = float(os.getenv("TOKEN_VERSION_CHECK_SECONDS", "5"))
+    # bcrypt runs on this many worker threads; callers beyond workers + queue get HTTP 429
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "8"))
+    # Search result cache; writes through PropertyUseCases invalidate it, the TTL bounds
+    # staleness from writes made by the other process (API vs bot)
+    QUERY_CACHE_MAX_ENTRIES: int = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "512"))
+    QUERY_CACHE_TTL_SECONDS: float = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "120"))
+    # "sql" searches MySQL; "memory" answers approved-listing searches from an in-process
+    # NumPy index, synced by updated_at and fully rebuilt periodically
+    SEARCH_BACKEND: str = os.getenv("SEARCH_BACKEND", "sql")
+    SEARCH_INDEX_SYNC_SECONDS: float = float(os.getenv("SEARCH_INDEX_SYNC_SECONDS", "30"))
+    SEARCH_INDEX_REBUILD_SECONDS: float = float(os.getenv("SEARCH_INDEX_REBUILD_SECONDS", "600"))
+    # Analytics dashboard: served from cache for this long, then served stale while one refresh runs
+    ANALYTICS_FRESH_SECONDS: float = float(os.getenv("ANALYTICS_FRESH_SECONDS", "60"))
+    ANALYTICS_MAX_STALE_SECONDS: float = float(os.getenv("ANALYTICS_MAX_STALE_SECONDS", "900"))
+    # Number of price range buttons, cut at quantiles of approved listings per property type
+    PRICE_BUCKET_COUNT: int = int(os.getenv("PRICE_BUCKET_COUNT", "8"))
+    # Public listing GETs send weak ETags and answer If-None-Match with 304. Writes made by
+    # another process (the bot) are noticed within LISTING_VERSION_CHECK_SECONDS
+    HTTP_CACHE_ENABLED: bool = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+    LISTING_VERSION_CHECK_SECONDS: float = float(os.getenv("LISTING_VERSION_CHECK_SECONDS", "5"))
+    # Rendered response bodies kept per URL until the next listing write (0 disables)
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "0"))
+    # Most ids one GET /properties?ids= or /cars?ids= request may name
+    LISTING_BATCH_MAX_IDS: int = int(os.getenv("LISTING_BATCH_MAX_IDS", "100"))
+    # Most ids one bulk moderation request may name
+    BULK_MODERATION_MAX_IDS: int = int(os.getenv("BULK_MODERATION_MAX_IDS", "200"))
+    # Listings per multi-row INSERT (and transaction) when importing CSV/NDJSON
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    # How often the bot sends broker notifications queued by bulk moderation
+    BROKER_NOTIFY_INTERVAL_SECONDS: float = float(os.getenv("BROKER_NOTIFY_INTERVAL_SECONDS", "10"))
+    # Per-route token buckets; "memory" keeps them per process, a redis:// URL shares them across workers
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_STORAGE_URL: str = os.getenv("RATE_LIMIT_STORAGE_URL", "memory")
+    # Take the client address from X-Forwarded-For (only safe behind a trusted proxy)
+    RATE_LIMIT_TRUST_PROXY: bool = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+
     # Admin
     ADMIN_PHONE_NUMBER: str
     SECRET_KEY: str
@@ -16,6 +16,16 @@ CB_PREFIX_SIZE = "size_"
 CB_PREFIX_LOCATION = "loc_"
 CB_PREFIX_PRICE_RANGE = "price_"
 
+# Paged result lists: callback data is f"{CB_PREFIX_PAGE}{kind}_{list_id}_{offset}", where
+# list_id names the query the list was built from (kept in user_data['paged_lists'])
+CB_PREFIX_PAGE = "page_"
+PAGE_BROWSE = "browse"
+PAGE_MY_LISTINGS = "mine"
+PAGE_MANAGE = "manage"
+PAGE_PENDING = "pending"
+RESULTS_PAGE_SIZE = 10
+PAGED_LISTS_KEPT = 10
+
 # Admin
 CB_ADMIN_PENDING_LISTINGS = "admin_pending"
 CB_ADMIN_APPROVE = "admin_approve" # Note: constant uses underscore
@@ -85,6 +95,12 @@ SUPPORTED_SITES = [
     {"en": "Asko", "am": "አስኮ"},
 ]
 
+# --- Fallback price bucket edges (ETB), used until approved listings exist to derive them from ---
+PRICE_BUCKET_BOUNDS = (2_500_000, 4_000_000, 6_000_000, 8_000_000, 11_000_000, 14_000_000, 17_000_000, 22_000_000, 30_000_000)
+
+# --- Status transitions whose broker is notified (queued by bulk moderation, sent by the bot) ---
+BROKER_NOTIFIED_EVENTS = ("approved", "rejected")
+
 # --- NEW: Regex for numeric button choices ---
 NUMERIC_CHOICE_REGEX = r"^\d+(\+)?( .*)?$" # Matches "1", "6+", "0 (Ground)"
 
@@ -130,7 +146,8 @@ NUMERIC_CHOICE_REGEX = r"^\d+(\+)?( .*)?$" # Matches "1", "6+", "0 (Ground)"
     STATE_FILTER_SPECIFIC_AREA,
     STATE_FILTER_SITE,
     STATE_FILTER_OTHER_SITE,
+    STATE_KEYWORD_SEARCH_INPUT,
 
     # Admin state
     STATE_ADMIN_REJECT_REASON_INPUT
-) = range(42)
\ No newline at end of file
+) = range(43)
\ No newline at end of file
@@ -1,20 +1,49 @@
 from src.domain.models.property_models import Property, PropertyType
 from src.utils.config import settings
+from src.utils.cache import LRUCache
 from telegram.helpers import escape_markdown
 
+TYPE_EMOJIS = {
+    PropertyType.APARTMENT: "🏢",
+    PropertyType.CONDOMINIUM: "🏙️",
+    PropertyType.VILLA: "🏡",
+    PropertyType.BUILDING: "🏭",
+    PropertyType.PENTHOUSE: "🌟",
+    PropertyType.DUPLEX: "🏘️",
+}
+
+# Rendered cards keyed by (pid, updated_at, audience); the text is the same in every
+# language. updated_at only has whole seconds, so the use cases also drop a listing's
+# cards on every write they make (and all cards when another process changed listings).
+_card_cache = LRUCache(maxsize=1024)
+
 def create_property_card_text(prop: Property, for_admin: bool = False, for_broker: bool = False) -> str:
+    """
+    Returns the formatted text card for a property, rendering it only on a cache miss.
+    """
+    audience = "admin" if for_admin else "broker" if for_broker else "public"
+    cache_key = (prop.pid, prop.updated_at, audience)
+    card_text = _card_cache.get(cache_key)
+    if card_text is None:
+        card_text = _render_property_card_text(prop, for_admin=for_admin, for_broker=for_broker)
+        _card_cache.set(cache_key, card_text)
+    return card_text
+
+def invalidate_property_card(pid: str) -> None:
+    """Drops every cached card for a property, after it was changed or deleted."""
+    _card_cache.invalidate(lambda key: key[0] == pid)
+
+def clear_property_cards() -> None:
+    _card_cache.clear()
+
+def get_card_cache_stats() -> dict:
+    return _card_cache.stats()
+
+def _render_property_card_text(prop: Property, for_admin: bool = False, for_broker: bool = False) -> str:
     """
     Generates a beautifully formatted, detailed text card for a given property.
     """
-    type_emojis = {
-        PropertyType.APARTMENT: "🏢",
-        PropertyType.CONDOMINIUM: "🏙️",
-        PropertyType.VILLA: "🏡",
-        PropertyType.BUILDING: "🏭",
-        PropertyType.PENTHOUSE: "🌟",
-        PropertyType.DUPLEX: "🏘️",
-    }
-    header_emoji = type_emojis.get(prop.property_type, "🏠")
+    header_emoji = TYPE_EMOJIS.get(prop.property_type, "🏠")
 
     # --- Escaped Variables ---
     property_type_val = escape_markdown(prop.property_type.value)
@@ -38,4 +38,10 @@ class InvalidOperationError(RealEstatePlatformException):
 class TelegramApiError(RealEstatePlatformException):
     """Raised when a call to the Telegram API fails."""
     def __init__(self, message="There was a problem communicating with Telegram. Please try again."):
-        super().__init__(message)
\ No newline at end of file
+        super().__init__(message)
+
+class TooManyRequestsError(RealEstatePlatformException):
+    """Raised when a request is refused because of load or rate limits; maps to HTTP 429."""
+    def __init__(self, message="Too many requests. Please try again later.", retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message)
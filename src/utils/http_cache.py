@@ -0,0 +1,76 @@
+# src/utils/http_cache.py
+import logging
+from functools import wraps
+from typing import Callable, Dict
+from urllib.parse import urlencode
+
+from flask import Response, make_response, request
+
+from src.utils.cache import LRUCache
+from src.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rendered bodies keyed by (kind, version, normalized URL)
+_responses = LRUCache(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES)
+# The last version seen per kind; a new one drops that kind's cached bodies
+_versions: Dict[str, str] = {}
+
+
+def _normalized_url() -> str:
+    """The request path with its query params sorted, so equivalent URLs share a cache entry."""
+    params = sorted((key, value) for key, values in request.args.lists() for value in values)
+    return f"{request.path}?{urlencode(params)}" if params else request.path
+
+
+def _cached_body(kind: str, version: str, view: Callable, *args, **kwargs) -> Response:
+    if _versions.get(kind) != version:
+        _versions[kind] = version
+        _responses.invalidate(lambda key: key[0] == kind and key[1] != version)
+    key = (kind, version, _normalized_url())
+    cached = _responses.get(key)
+    if cached is not None:
+        body, mimetype = cached
+        return Response(body, mimetype=mimetype)
+    response = make_response(view(*args, **kwargs))
+    if response.status_code == 200 and not response.direct_passthrough:
+        _responses.set(key, (response.get_data(), response.mimetype))
+    return response
+
+
+def conditional_get(version_of: Callable[[str], str], kind: str):
+    """
+    Serves a public GET view with a weak ETag built from `version_of(kind)`, a string that
+    changes whenever the listings behind the view may have changed. A request whose
+    If-None-Match matches gets 304 without running the view. With RESPONSE_CACHE_MAX_ENTRIES
+    set, 200 bodies are also kept per normalized URL until the version changes.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not settings.HTTP_CACHE_ENABLED:
+                return f(*args, **kwargs)
+            try:
+                # Read before the view runs, so a write made meanwhile can only make the ETag older than the body
+                version = version_of(kind)
+            except Exception as e:
+                logger.error(f"Could not read the {kind} listing version ({e}); serving without an ETag.")
+                return f(*args, **kwargs)
+
+            if request.if_none_match.contains_weak(version):
+                response = Response(status=304)
+            elif settings.RESPONSE_CACHE_MAX_ENTRIES > 0:
+                response = _cached_body(kind, version, f, *args, **kwargs)
+            else:
+                response = make_response(f(*args, **kwargs))
+            if response.status_code in (200, 304):
+                response.set_etag(version, weak=True)
+                # Clients may keep the body but must revalidate it before reuse
+                response.cache_control.no_cache = True
+            return response
+        return decorated
+    return decorator
+
+
+def get_response_cache_stats() -> dict:
+    return {**_responses.stats(), "enabled": settings.HTTP_CACHE_ENABLED and settings.RESPONSE_CACHE_MAX_ENTRIES > 0}
@@ -1,5 +1,6 @@
 # src/utils/i18n.py
 import re
+import string
 translations = {
     'en': {
         # General & Main Menu
@@ -7,6 +8,7 @@ translations = {
         'main_menu_prompt': "What would you like to do?",
         'browse_properties': "🔍 Browse Properties",
         'filter_properties': "📊 Filter Properties",
+        'keyword_search': "🔎 Search by Keyword",
         'submit_property': "➕ Submit a Property",
         'my_listings': "📋 My Listings",
         'admin_panel': "👑 Admin Panel",
@@ -50,15 +52,22 @@ translations = {
         'searching': "Searching for properties...",
         'no_properties_found': "No properties found matching your criteria.",
         'found_properties': "Found {count} matching properties:",
-        'showing_first_10': "Showing the first 10 results. For more, please refine your search.",
+        'showing_results': "Showing results {start}-{end}:",
+        'more_results': "More results are available.",
+        'next_page': "➡️ Next page",
+        'search_expired': "This search has expired. Please run it again.",
         'search_complete': "Search complete. Returning to the main menu.",
         'browse_complete': "Browse complete. Returning to the main menu.",
+        'enter_keywords': "Type what you are looking for (e.g. \"furnished Bole 3 bedroom\"):",
         'select_property_type': "First, select a property type:",
         'select_price_range': "Select a price range:",
         'select_region': "Which region?",
         'select_condo_scheme': "Select a Condominium scheme:",
         'any_option': "Any",
         'any_price': "Any Price",
+        'price_under': "Under {max}",
+        'price_between': "{min} - {max}",
+        'price_above': "Above {min}",
         'any_region': "Any Region",
         'any_scheme': "Any Scheme",
 
@@ -94,6 +103,8 @@ translations = {
         # Notifications
         'property_approved_notification': "Your property submission has been approved and is now live!",
         'property_rejected_notification': "Your property submission was rejected. Reason: {reason}",
+        'car_approved_notification': "Your car submission has been approved and is now live!",
+        'car_rejected_notification': "Your car submission was rejected. Reason: {reason}",
 
 
         'is_commercial': "Is it a commercial or mixed-use building?",
@@ -120,6 +131,7 @@ translations = {
         'main_menu_prompt': "ምን ማድረግ ይፈልጋሉ?",
         'browse_properties': "🔍 ንብረቶችን ያስሱ",
         'filter_properties': "📊 ንብረቶችን ያጣሩ",
+        'keyword_search': "🔎 በቁልፍ ቃል ይፈልጉ",
         'submit_property': "➕ ንብረት ያስገቡ",
         'my_listings': "📋 የእኔ ዝርዝሮች",
         'admin_panel': "👑 የአስተዳዳሪ ፓነል",
@@ -163,15 +175,22 @@ translations = {
         'searching': "ንብረቶችን በመፈለግ ላይ...",
         'no_properties_found': "ከፍለጋዎ ጋር የሚዛመድ ምንም ንብረት አልተገኘም።",
         'found_properties': "{count} ተዛማጅ ንብረቶች ተገኝተዋል:",
-        'showing_first_10': "የመጀመሪያዎቹን 10 ውጤቶች በማሳየት ላይ። ለተጨማሪ፣ እባክዎ ፍለጋዎን ያጥቡ።",
+        'showing_results': "ውጤቶች {start}-{end} በማሳየት ላይ:",
+        'more_results': "ተጨማሪ ውጤቶች አሉ።",
+        'next_page': "➡️ ቀጣይ ገጽ",
+        'search_expired': "ይህ ፍለጋ ጊዜው አልፏል። እባክዎ እንደገና ይፈልጉ።",
         'search_complete': "ፍለጋ ተጠናቋል። ወደ ዋናው ማውጫ በመመለስ ላይ።",
         'browse_complete': "ማሰስ ተጠናቋል። ወደ ዋናው ማውጫ በመመለስ ላይ።",
+        'enter_keywords': "የሚፈልጉትን ይጻፉ (ለምሳሌ \"ቦሌ ባለ 3 መኝታ\"):",
         'select_property_type': "በመጀመሪያ የንብረቱን አይነት ይምረጡ:",
         'select_price_range': "የዋጋ ወሰን ይምረጡ:",
         'select_region': "በየትኛው ክልል?",
         'select_condo_scheme': "የኮንዶሚኒየም የክፍያ አይነት ይምረጡ:",
         'any_option': "ማንኛውም",
         'any_price': "ማንኛውም ዋጋ",
+        'price_under': "ከ{max} በታች",
+        'price_between': "{min} - {max}",
+        'price_above': "ከ{min} በላይ",
         'any_region': "ማንኛውም ክልል",
         'any_scheme': "ማንኛውም አይነት",
 
@@ -207,6 +226,8 @@ translations = {
         # Notifications
         'property_approved_notification': "ያስገቡት ንብረት ጸድቆ ገበያ ላይ ውሏል!",
         'property_rejected_notification': "ያስገቡት ንብረት ውድቅ ተደርጓል። ምክንያት: {reason}",
+        'car_approved_notification': "ያስገቡት መኪና ጸድቆ ገበያ ላይ ውሏል!",
+        'car_rejected_notification': "ያስገቡት መኪና ውድቅ ተደርጓል። ምክንያት: {reason}",
 
 
         'is_commercial': "ሕንፃው ለንግድ ወይስ ለተቀላቀለ አገልግሎት ነው?",
@@ -228,25 +249,63 @@ translations = {
     }
 }
 
+_formatter = string.Formatter()
+
+def _compile_message(message: str) -> tuple:
+    """
+    Returns (text, is_template). Strings without placeholders are formatted once
+    here so that t() can hand them back without calling str.format() again.
+    """
+    has_fields = any(field is not None for _, field, _, _ in _formatter.parse(message))
+    if has_fields:
+        return message, True
+    return message.format(), False
+
+def _compile_translations(raw: dict) -> dict:
+    """
+    Builds one flat lookup table per language with the English fallback already
+    merged in, so a lookup is a single dict access.
+    """
+    english = raw['en']
+    compiled = {}
+    for lang, lang_dict in raw.items():
+        table = {key: _compile_message(message) for key, message in english.items()}
+        table.update({key: _compile_message(message) for key, message in lang_dict.items()})
+        compiled[lang] = table
+    return compiled
+
+_compiled_translations = _compile_translations(translations)
+
+def check_translations() -> dict:
+    """
+    Returns a mapping of language code -> sorted list of keys that exist in some
+    language but are missing from this one. An empty dict means full coverage.
+    """
+    all_keys = set().union(*(lang_dict.keys() for lang_dict in translations.values()))
+    missing = {}
+    for lang, lang_dict in translations.items():
+        lang_missing = sorted(all_keys - lang_dict.keys())
+        if lang_missing:
+            missing[lang] = lang_missing
+    return missing
+
 def t(key: str, lang: str = 'en', default: str = None, **kwargs) -> str:
     """
     Simple translator function. It now dynamically uses the provided language.
     If a key is not found in the target language, it falls back to English.
     If still not found, it returns the default or the key itself.
     """
-    lang_dict = translations.get(lang, translations['en'])
-    message = lang_dict.get(key)
-    
-    if message is None:
-        # Fallback to English if the key is not in the target language
-        message = translations['en'].get(key)
-    
-    if message is None:
+    table = _compiled_translations.get(lang, _compiled_translations['en'])
+    entry = table.get(key)
+
+    if entry is None:
         # Fallback to the default value or the key itself if not in English either
-        message = default or key
         # We don't format the key itself, only real messages
-        return message
+        return default or key
 
+    message, is_template = entry
+    if not is_template:
+        return message
     return message.format(**kwargs)
 
 def get_all_translations(key: str) -> list:
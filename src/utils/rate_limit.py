@@ -0,0 +1,153 @@
+# src/utils/rate_limit.py
+import logging
+import math
+import threading
+import time
+from functools import wraps
+from typing import Optional, Tuple
+
+from flask import request
+from jose import jwt, JWTError
+
+from src.utils.cache import LRUCache
+from src.utils.config import settings
+from src.utils.exceptions import TooManyRequestsError
+
+logger = logging.getLogger(__name__)
+
+
+# --- Bucket Stores ---
+class InMemoryBucketStore:
+    """
+    Token buckets kept in this process. Each worker process limits independently,
+    so with N workers the effective limit is N times the configured one.
+    """
+    def __init__(self, max_keys: int = 100000):
+        self._buckets = LRUCache(maxsize=max_keys)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> Tuple[bool, float]:
+        """Takes one token from the bucket. Returns (allowed, seconds until a token is available)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            # A bucket that has been idle long enough to refill completely can be forgotten
+            self._buckets.set(key, (tokens, now), ttl=capacity / refill_per_second)
+        retry_after = 0.0 if allowed else (1 - tokens) / refill_per_second
+        return allowed, retry_after
+
+
+class RedisBucketStore:
+    """
+    Token buckets shared by every worker through Redis; the update is one atomic Lua script.
+    While Redis can't be reached, requests are limited by in-process buckets instead.
+    """
+    _SCRIPT = """
+        local capacity = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+        local tokens = tonumber(bucket[1]) or capacity
+        local ts = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + (now - ts) * rate)
+        local allowed = 0
+        if tokens >= 1 then
+            tokens = tokens - 1
+            allowed = 1
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+        return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str):
+        import redis  # Optional dependency, only needed for shared rate limits
+        self._errors = redis.RedisError
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._script = self._client.register_script(self._SCRIPT)
+        self._fallback = InMemoryBucketStore()
+        self._unavailable = False
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> Tuple[bool, float]:
+        try:
+            allowed, tokens = self._script(keys=[f"ratelimit:{key}"], args=[capacity, refill_per_second, time.time()])
+        except self._errors as e:
+            if not self._unavailable:
+                self._unavailable = True
+                logger.error(f"Redis rate limiting failed ({e}); using in-process buckets until it is back.")
+            return self._fallback.take(key, capacity, refill_per_second)
+        if self._unavailable:
+            self._unavailable = False
+            logger.info("Redis rate limiting is available again.")
+        tokens = float(tokens)
+        retry_after = 0.0 if allowed else (1 - tokens) / refill_per_second
+        return bool(allowed), retry_after
+
+
+def _create_store():
+    url = settings.RATE_LIMIT_STORAGE_URL
+    if url and url.startswith("redis"):
+        try:
+            return RedisBucketStore(url)
+        except Exception as e:
+            logger.error(f"Could not use Redis for rate limiting ({e}); falling back to in-process buckets.")
+    return InMemoryBucketStore()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _create_store()
+    return _store
+
+
+# --- Decorator ---
+def _client_ip() -> str:
+    if settings.RATE_LIMIT_TRUST_PROXY and request.access_route:
+        return request.access_route[0]
+    return request.remote_addr or "unknown"
+
+def _token_subject() -> Optional[str]:
+    auth_header = request.headers.get('Authorization', '')
+    parts = auth_header.split()
+    if len(parts) != 2 or parts[0].lower() != 'bearer':
+        return None
+    try:
+        return jwt.decode(parts[1], settings.SECRET_KEY, algorithms=["HS256"]).get("sub")
+    except JWTError:
+        return None
+
+def rate_limit(capacity: int, per_seconds: float, scope: str = "ip"):
+    """
+    Limits a Flask view with a token bucket of `capacity` requests refilled over `per_seconds`.
+
+    scope="ip" keys buckets by client address; scope="user" keys them by the token's
+    user id, falling back to the address for unauthenticated calls. Buckets are per
+    route. Exceeding the limit raises TooManyRequestsError (HTTP 429 with Retry-After).
+    """
+    refill_per_second = capacity / per_seconds
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not settings.RATE_LIMIT_ENABLED:
+                return f(*args, **kwargs)
+            subject = _token_subject() if scope == "user" else None
+            client_key = f"user:{subject}" if subject else f"ip:{_client_ip()}"
+            allowed, retry_after = get_bucket_store().take(
+                f"{request.endpoint}:{client_key}", capacity, refill_per_second
+            )
+            if not allowed:
+                logger.info(f"Rate limit hit on {request.endpoint} for {client_key}")
+                raise TooManyRequestsError(retry_after=max(1, math.ceil(retry_after)))
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
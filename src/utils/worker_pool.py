@@ -0,0 +1,85 @@
+# src/utils/worker_pool.py
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from src.utils.exceptions import TooManyRequestsError
+
+
+class LatencyStats:
+    """Keeps a bounded window of recent durations per label and summarizes them."""
+    def __init__(self, window: int = 512):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(label, deque(maxlen=self.window)).append(seconds)
+            self._counts[label] = self._counts.get(label, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = {label: sorted(samples) for label, samples in self._samples.items()}
+            counts = dict(self._counts)
+        summary = {}
+        for label, samples in snapshot.items():
+            if not samples:
+                continue
+            summary[label] = {
+                "count": counts[label],
+                "avg_ms": round(sum(samples) / len(samples) * 1000, 2),
+                "p50_ms": round(samples[len(samples) // 2] * 1000, 2),
+                "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2),
+                "max_ms": round(samples[-1] * 1000, 2),
+            }
+        return summary
+
+
+class BoundedWorkerPool:
+    """
+    Runs CPU-heavy calls on a fixed number of worker threads.
+
+    At most `max_workers + max_queue` calls may be running or waiting at once; any
+    call beyond that is refused immediately with TooManyRequestsError instead of
+    piling up behind the others and tying up the request thread.
+    """
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.latency = LatencyStats()
+
+    def run(self, label: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs fn in the pool and waits for its result, recording the time spent under `label`."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise TooManyRequestsError("Server is busy, please retry shortly.", retry_after=1)
+        with self._lock:
+            self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            return self._executor.submit(fn, *args, **kwargs).result()
+        finally:
+            self.latency.record(label, time.perf_counter() - started)
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "latency": self.latency.stats(),
+        }
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+# Settings are read when src.utils.config is first imported, so the test database is
+# chosen before any src module is loaded
+os.environ.setdefault("ADMIN_PHONE_NUMBER", "+251900000001")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+if os.getenv("MYSQL_TEST_DATABASE"):
+    os.environ["MYSQL_DATABASE"] = os.environ["MYSQL_TEST_DATABASE"]
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database_schema.sql")
+
+
+def _schema_statements():
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        sql = "".join(line for line in f if not line.lstrip().startswith("--"))
+    return [statement.strip() for statement in sql.split(";") if statement.strip()]
+
+
+@pytest.fixture(scope="session")
+def mysql_repo():
+    """
+    A MySQLRealEstateRepository on MYSQL_TEST_DATABASE, dropped and recreated from
+    database_schema.sql. Skipped unless that variable names a database containing "test".
+    """
+    database = os.getenv("MYSQL_TEST_DATABASE")
+    if not database or "test" not in database.lower():
+        pytest.skip("set MYSQL_TEST_DATABASE (a name containing 'test') to run the MySQL repository tests")
+    pymysql = pytest.importorskip("pymysql")
+    from src.utils.config import settings
+    from src.infrastructure.repository.mysql_repo import MySQLRealEstateRepository
+
+    conn = pymysql.connect(
+        host=settings.MYSQL_HOST, port=settings.MYSQL_PORT, user=settings.MYSQL_USER,
+        password=settings.MYSQL_PASSWORD, charset="utf8mb4", autocommit=True,
+    )
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+            cursor.execute(f"CREATE DATABASE `{database}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+            cursor.execute(f"USE `{database}`")
+            for statement in _schema_statements():
+                cursor.execute(statement)
+    finally:
+        conn.close()
+    return MySQLRealEstateRepository()
@@ -0,0 +1,31 @@
+from datetime import date
+
+from src.use_cases.analytics import activity_series
+
+
+def test_activity_series_counts_events_and_takes_medians_from_the_price_rows():
+    counts = [
+        {"day": date(2024, 5, 6), "location_site": "Bole", "event": "submitted", "n": 4},
+        {"day": date(2024, 5, 6), "location_site": "Bole", "event": "approved", "n": 3},
+        {"day": date(2024, 5, 8), "location_site": "Bole", "event": "approved", "n": 1},
+        {"day": date(2024, 5, 8), "location_site": "CMC", "event": "sold", "n": 1},
+    ]
+    prices = [
+        {"day": date(2024, 5, 6), "location_site": "Bole", "event": "approved", "price_etb": 100, "n": 2},
+        {"day": date(2024, 5, 6), "location_site": "Bole", "event": "approved", "price_etb": 300, "n": 1},
+        {"day": date(2024, 5, 8), "location_site": "Bole", "event": "approved", "price_etb": 500, "n": 1},
+        {"day": date(2024, 5, 8), "location_site": "CMC", "event": "sold", "price_etb": 900, "n": 1},
+    ]
+    daily = activity_series(counts, prices)
+    assert [(e["period"], e["site"], e["approvals"], e["median_price"]) for e in daily] == [
+        ("2024-05-06", "Bole", 3, 100.0),
+        ("2024-05-08", "Bole", 1, 500.0),
+        ("2024-05-08", "CMC", 0, None),
+    ]
+    assert daily[2]["sales"] == 1 and daily[2]["median_sold_price"] == 900.0
+
+    weekly = activity_series(counts, prices, interval="week", by_site=False)
+    assert len(weekly) == 1
+    assert weekly[0]["period"] == "2024-05-06"
+    assert (weekly[0]["submissions"], weekly[0]["approvals"], weekly[0]["sales"]) == (4, 4, 1)
+    assert weekly[0]["median_price"] == 200.0
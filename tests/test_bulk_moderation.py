@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("telegram")
+
+from telegram.error import Forbidden, NetworkError
+
+from src.domain.models.property_models import Property, PropertyStatus
+from src.use_cases.property_use_cases import PropertyUseCases
+
+
+def _property(pid: str, status: PropertyStatus) -> Property:
+    return Property(
+        pid=pid,
+        property_type="Apartment",
+        location={"region": "Addis Ababa", "city": "Addis Ababa", "site": "Bole"},
+        bedrooms=2,
+        bathrooms=1,
+        size_sqm=80,
+        price_etb=2500000,
+        description="Apartment",
+        image_urls=["/images/a"],
+        status=status,
+        broker_id="broker-1",
+        created_at=datetime(2024, 5, 1),
+        updated_at=datetime(2024, 5, 1),
+    )
+
+
+class FakeRepo:
+    """Holds listings in dicts and moves them the way the MySQL bulk methods do."""
+    def __init__(self, properties=(), cars=None):
+        self.properties = {prop.pid: prop for prop in properties}
+        self.cars = dict(cars or {})
+
+    def bulk_transition_properties(self, pids, from_statuses, to_status, updates=None, reason=None):
+        pids = list(dict.fromkeys(pids))
+        statuses = {pid: self.properties[pid].status.value for pid in pids if pid in self.properties}
+        changed = []
+        for pid in pids:
+            if pid in self.properties and self.properties[pid].status in from_statuses:
+                self.properties[pid] = self.properties[pid].model_copy(update={"status": to_status, **(updates or {})})
+                changed.append(self.properties[pid])
+        return changed, statuses
+
+    def delete_properties(self, pids):
+        return [pid for pid in dict.fromkeys(pids) if self.properties.pop(pid, None)]
+
+    def bulk_transition_cars(self, cids, from_statuses, to_status, reason=None):
+        cids = list(dict.fromkeys(cids))
+        statuses = {cid: self.cars[cid] for cid in cids if cid in self.cars}
+        moved = [cid for cid in cids if self.cars.get(cid) in [s.value for s in from_statuses]]
+        for cid in moved:
+            self.cars[cid] = to_status.value
+        return [SimpleNamespace(cid=cid) for cid in moved], statuses
+
+
+def test_outcomes_follow_request_order_once_per_id():
+    repo = FakeRepo([_property("a", PropertyStatus.PENDING), _property("b", PropertyStatus.APPROVED),
+                     _property("c", PropertyStatus.PENDING)])
+    cases = PropertyUseCases(repo)
+    generation = cases.property_generation
+    outcomes = cases.bulk_moderate_properties("approve", ["c", "missing", "b", "a", "c"])
+    assert outcomes == [
+        {"id": "c", "outcome": "ok"},
+        {"id": "missing", "outcome": "not_found"},
+        {"id": "b", "outcome": "conflict", "status": "approved"},
+        {"id": "a", "outcome": "ok"},
+    ]
+    assert cases.property_generation == generation + 1
+    assert cases.price_distribution.stats()["listings"] == 2
+
+
+def test_reject_stores_the_reason_and_nothing_changed_keeps_the_caches():
+    repo = FakeRepo([_property("a", PropertyStatus.PENDING)])
+    cases = PropertyUseCases(repo)
+    cases.bulk_moderate_properties("reject", ["a"], reason="Blurry photos")
+    assert repo.properties["a"].rejection_reason == "Blurry photos"
+    generation = cases.property_generation
+    assert cases.bulk_moderate_properties("reject", ["a"]) == [{"id": "a", "outcome": "conflict", "status": "rejected"}]
+    assert cases.property_generation == generation
+
+
+def test_delete_reports_unknown_ids_as_not_found():
+    cases = PropertyUseCases(FakeRepo([_property("a", PropertyStatus.SOLD)]))
+    assert cases.bulk_moderate_properties("delete", ["a", "b", "a"]) == [
+        {"id": "a", "outcome": "ok"},
+        {"id": "b", "outcome": "not_found"},
+    ]
+
+
+def test_cars_move_only_from_the_allowed_statuses():
+    repo = FakeRepo(cars={"x": "approved", "y": "pending"})
+    cases = PropertyUseCases(repo)
+    assert cases.bulk_moderate_cars("mark_sold", ["y", "x"]) == [
+        {"id": "y", "outcome": "conflict", "status": "pending"},
+        {"id": "x", "outcome": "ok"},
+    ]
+    assert repo.cars == {"x": "sold", "y": "pending"}
+
+
+# --- Broker notification outbox ---
+class FakeBot:
+    def __init__(self, fail=None):
+        self.sent, self.fail = [], fail or {}
+
+    async def send_message(self, chat_id, text):
+        if chat_id in self.fail:
+            raise self.fail[chat_id]
+        self.sent.append((chat_id, text))
+
+
+def _application(pending, brokers, bot):
+    marked = []
+    prop_cases = SimpleNamespace(
+        get_pending_broker_notifications=lambda limit: pending,
+        mark_broker_notifications_sent=marked.extend,
+    )
+    user_cases = SimpleNamespace(get_users_by_ids=lambda uids: {uid: brokers[uid] for uid in uids if uid in brokers})
+    application = SimpleNamespace(bot=bot, bot_data={"property_use_cases": prop_cases, "user_use_cases": user_cases})
+    return application, marked
+
+
+def _note(note_id, broker_id, event="approved", reason=None):
+    return {"id": note_id, "broker_id": broker_id, "kind": "property", "listing_id": "p", "event": event, "reason": reason}
+
+
+def test_undeliverable_notifications_are_dropped_and_the_rest_sent():
+    from src.infrastructure.telegram_bot.notifications import send_pending_notifications
+
+    brokers = {
+        "b1": SimpleNamespace(telegram_id=11, language="en"),
+        "b2": SimpleNamespace(telegram_id=22, language="en"),
+        "b3": SimpleNamespace(telegram_id=None, language="en"),
+    }
+    bot = FakeBot(fail={22: Forbidden("bot was blocked by the user")})
+    pending = [_note(1, "b1", "rejected", "Blurry photos"), _note(2, "b2"), _note(3, "b3"), _note(4, "gone")]
+    application, marked = _application(pending, brokers, bot)
+    assert asyncio.run(send_pending_notifications(application)) == 4
+    assert bot.sent == [(11, "Your property submission was rejected. Reason: Blurry photos")]
+    assert marked == [1, 2, 3, 4]
+
+
+def test_a_network_error_leaves_the_rest_of_the_batch_queued():
+    from src.infrastructure.telegram_bot.notifications import send_pending_notifications
+
+    brokers = {"b1": SimpleNamespace(telegram_id=11, language="en"), "b2": SimpleNamespace(telegram_id=22, language="en")}
+    bot = FakeBot(fail={22: NetworkError("timed out")})
+    application, marked = _application([_note(1, "b1"), _note(2, "b2"), _note(3, "b1")], brokers, bot)
+    assert asyncio.run(send_pending_notifications(application)) == 1
+    assert marked == [1]
@@ -0,0 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.cache import StaleWhileRevalidate
+
+
+def test_invalidate_during_a_load_keeps_the_value_stale():
+    counts = iter([1, 2, 3])
+    cache = None
+
+    def loader():
+        value = next(counts)
+        if value == 1:
+            cache.invalidate()  # a write lands while the first load is reading
+        return value
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        cache = StaleWhileRevalidate(loader, executor, fresh_for=60, max_stale=600)
+        assert cache.get() == 1
+        assert cache.stats()["stale"]
+        # Served once more while the refresh runs, then the refreshed value is fresh
+        assert cache.get() == 1
+    assert cache.get() == 2
+    assert not cache.stats()["stale"]
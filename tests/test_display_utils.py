@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("telegram")
+
+from src.domain.models.property_models import Property, PropertyStatus
+from src.utils import display_utils
+
+
+@pytest.fixture(autouse=True)
+def empty_card_cache():
+    display_utils.clear_property_cards()
+    yield
+    display_utils.clear_property_cards()
+
+
+def _property(**overrides) -> Property:
+    data = dict(
+        pid="p1",
+        property_type="Villa",
+        location={"region": "Addis Ababa", "city": "Addis Ababa", "site": "CMC"},
+        bedrooms=4,
+        bathrooms=3,
+        size_sqm=300,
+        price_etb=18000000,
+        description="Villa with a garden",
+        image_urls=["/images/a"],
+        status=PropertyStatus.APPROVED,
+        created_at=datetime(2024, 5, 1, 9, 30),
+        updated_at=datetime(2024, 5, 1, 9, 30),
+    )
+    data.update(overrides)
+    return Property(**data)
+
+
+def test_cards_are_cached_once_per_audience():
+    prop = _property(broker_name="Abebe", broker_phone="+251911000000")
+    public = display_utils.create_property_card_text(prop)
+    assert display_utils.create_property_card_text(prop) == public
+    display_utils.create_property_card_text(prop, for_admin=True)
+    assert display_utils.get_card_cache_stats()["entries"] == 2
+
+
+def test_invalidated_card_is_rendered_again_within_the_same_second():
+    display_utils.create_property_card_text(_property())
+    display_utils.invalidate_property_card("p1")
+    # Same updated_at (whole seconds), new price
+    card = display_utils.create_property_card_text(_property(price_etb=17500000))
+    assert "17,500,000.00" in card
@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("flask")
+
+from flask import Flask, jsonify
+
+from src.utils import http_cache
+from src.utils.cache import LRUCache
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(http_cache.settings, "HTTP_CACHE_ENABLED", True)
+    monkeypatch.setattr(http_cache.settings, "RESPONSE_CACHE_MAX_ENTRIES", 10)
+    monkeypatch.setattr(http_cache, "_responses", LRUCache(maxsize=10))
+    monkeypatch.setattr(http_cache, "_versions", {})
+
+    app = Flask(__name__)
+    app.versions = {"property": "v1"}
+    app.calls = 0
+
+    @app.route("/listings")
+    @http_cache.conditional_get(lambda kind: app.versions[kind], "property")
+    def listings():
+        app.calls += 1
+        return jsonify({"calls": app.calls})
+
+    return app
+
+
+def test_matching_if_none_match_gets_304_without_running_the_view(app):
+    client = app.test_client()
+    first = client.get("/listings")
+    assert first.status_code == 200 and first.headers["ETag"] == 'W/"v1"'
+    again = client.get("/listings", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304 and again.headers["ETag"] == 'W/"v1"'
+    assert app.calls == 1
+
+
+def test_a_write_changes_the_etag(app):
+    client = app.test_client()
+    etag = client.get("/listings").headers["ETag"]
+    app.versions["property"] = "v2"
+    response = client.get("/listings", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["ETag"] == 'W/"v2"'
+
+
+def test_cached_bodies_are_dropped_when_the_version_changes(app):
+    client = app.test_client()
+    # Equivalent URLs share one cached body
+    assert client.get("/listings?b=2&a=1").get_json() == {"calls": 1}
+    assert client.get("/listings?a=1&b=2").get_json() == {"calls": 1}
+    app.versions["property"] = "v2"
+    assert client.get("/listings?a=1&b=2").get_json() == {"calls": 2}
+    assert http_cache.get_response_cache_stats()["entries"] == 1
@@ -0,0 +1,74 @@
+import pytest
+
+pytest.importorskip("pydantic")
+
+from src.use_cases.listing_import import import_rows, normalize_row, read_rows
+
+CSV_HEADER = "property_type,location_region,location_city,location_site,bedrooms,bathrooms,size_sqm,price_etb,description,image_urls\n"
+
+
+def _csv_row(**overrides) -> str:
+    values = dict(property_type="Apartment", location_region="Addis Ababa", location_city="Addis Ababa",
+                  location_site="Bole", bedrooms="2", bathrooms="1", size_sqm="80", price_etb="2500000",
+                  description="Sunny", image_urls="/images/a | /images/b")
+    values.update(overrides)
+    return ",".join(values.values()) + "\n"
+
+
+def test_csv_rows_map_onto_the_create_model_shape():
+    rows = list(read_rows([CSV_HEADER, _csv_row(description="")], "csv"))
+    assert [(number, error) for number, _, error in rows] == [(1, None)]
+    row = normalize_row(rows[0][1], "property")
+    assert row["location"] == {"region": "Addis Ababa", "city": "Addis Ababa", "site": "Bole"}
+    assert row["image_urls"] == ["/images/a", "/images/b"]
+    # Empty cells are left out, so optional fields keep their defaults
+    assert "description" not in row
+
+
+def test_invalid_ndjson_lines_are_reported_by_row_number():
+    lines = ['{"images": "/c/1|/c/2"}\n', "\n", "{not json\n", "[1, 2]\n"]
+    rows = list(read_rows(lines, "ndjson"))
+    assert [number for number, _, _ in rows] == [1, 2, 3]
+    assert rows[1][2].startswith("invalid JSON")
+    assert rows[2][2] == "each line must be a JSON object"
+    assert normalize_row(rows[0][1], "car") == {"images": ["/c/1", "/c/2"]}
+
+
+def test_validation_errors_carry_their_row_numbers():
+    inserted = []
+
+    def insert_batch(items):
+        inserted.extend(items)
+        return len(items)
+
+    lines = [CSV_HEADER, _csv_row(), _csv_row(bedrooms="many"), _csv_row(image_urls="")]
+    report = import_rows(read_rows(lines, "csv"), "property", insert_batch)
+    assert (report["rows"], report["inserted"], report["failed"]) == (3, 1, 2)
+    assert [error["row"] for error in report["errors"]] == [2, 3]
+    assert report["errors"][0]["errors"][0].startswith("bedrooms:")
+    assert len(inserted) == 1
+
+
+def test_a_failed_batch_is_reported_against_each_of_its_rows():
+    calls = []
+
+    def insert_batch(items):
+        calls.append(len(items))
+        if len(calls) == 2:
+            raise RuntimeError("deadlock")
+        return len(items)
+
+    lines = [CSV_HEADER] + [_csv_row()] * 5
+    report = import_rows(read_rows(lines, "csv"), "property", insert_batch, batch_size=2)
+    assert calls == [2, 2, 1]
+    assert report["inserted"] == 3
+    assert report["errors"] == [{"row": 3, "errors": ["insert failed: deadlock"]},
+                                {"row": 4, "errors": ["insert failed: deadlock"]}]
+
+
+def test_error_report_is_truncated_at_max_errors():
+    lines = [CSV_HEADER] + [_csv_row(price_etb="free")] * 4
+    report = import_rows(read_rows(lines, "csv"), "property", lambda items: len(items), max_errors=2)
+    assert report["failed"] == 4
+    assert [error["row"] for error in report["errors"]] == [1, 2]
+    assert report["errors_truncated"]
@@ -0,0 +1,297 @@
+"""
+The MySQL repository builds the models it returns from create/update calls out of the
+data it wrote instead of reading the rows back. These tests check that each of them
+equals a fresh read, including column defaults and server-set fields.
+"""
+import uuid
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from src.domain.models.car_models import CarCreate, CarStatus, CarType
+from src.domain.models.property_models import PropertyCreate, PropertyStatus, PropertyType
+from src.domain.models.user_models import UserCreate, UserRole
+
+
+def _phone() -> str:
+    return f"+2519{uuid.uuid4().int % 10**8:08d}"
+
+
+def assert_same_user(returned, fresh):
+    # Roles are a set; their order is not stored
+    assert returned.model_dump(exclude={"roles"}) == fresh.model_dump(exclude={"roles"})
+    assert sorted(returned.roles) == sorted(fresh.roles)
+
+
+@pytest.fixture
+def broker(mysql_repo):
+    return mysql_repo.create_user(UserCreate(
+        phone_number=_phone(), telegram_id=0, display_name="Broker", roles=[UserRole.BROKER]
+    ))
+
+
+def _property_data(broker, **overrides) -> PropertyCreate:
+    data = dict(
+        property_type=PropertyType.APARTMENT,
+        location={"region": "Addis Ababa", "city": "Addis Ababa", "site": "Bole"},
+        bedrooms=3,
+        bathrooms=2,
+        size_sqm=120.5,
+        price_etb=4500000.456,
+        description="Sunny apartment, near the ring road",
+        image_urls=["/images/a", "/images/b", "/images/c"],
+        floor_level=4,
+        has_elevator=True,
+        broker_id=broker.uid,
+        broker_name=broker.display_name,
+        broker_phone=broker.phone_number,
+    )
+    data.update(overrides)
+    return PropertyCreate(**data)
+
+
+def _car_data(broker) -> CarCreate:
+    return CarCreate(
+        car_type=CarType.SEDAN,
+        price_etb=1850000.125,
+        images=["/images/car1", "/images/car2"],
+        manufacturer="Toyota",
+        model_name="Corolla",
+        model_year=2018,
+        fuel_efficiency_kmpl=14.333,
+        broker_id=broker.uid,
+        broker_name=broker.display_name,
+        broker_phone=broker.phone_number,
+    )
+
+
+def test_decimal_rounds_like_mysql():
+    pytest.importorskip("pymysql")
+    from src.infrastructure.repository.mysql_repo import _column_values, _decimal
+
+    # DECIMAL columns round halves away from zero; Python's round() would give .12 and 2.67
+    assert _decimal(1850000.125) == 1850000.13
+    assert _decimal(2.675) == 2.68
+    assert _decimal(-1.005) == -1.01
+    assert _decimal(None) is None
+    assert _column_values({"price_etb": 10.005, "description": "x"}) == {"price_etb": 10.01, "description": "x"}
+
+
+# --- Users ---
+@pytest.mark.parametrize("roles, password", [
+    ([], None),
+    ([UserRole.BUYER, UserRole.BROKER], None),
+    ([UserRole.ADMIN], "s3cret-pass"),
+])
+def test_create_user_matches_fresh_read(mysql_repo, roles, password):
+    returned = mysql_repo.create_user(UserCreate(
+        phone_number=_phone(), telegram_id=12345, display_name="Abebe", roles=roles, password=password
+    ))
+    assert_same_user(returned, mysql_repo.get_user_by_id(returned.uid))
+
+
+@pytest.mark.parametrize("updates", [
+    {"display_name": "Renamed", "language": "am"},
+    {"roles": ["broker", "admin"]},
+    {"roles": [], "active": False},
+    {"token_version": 3, "telegram_id": 987654},
+])
+def test_update_user_matches_fresh_read(mysql_repo, updates):
+    user = mysql_repo.create_user(UserCreate(
+        phone_number=_phone(), telegram_id=0, display_name="Before", roles=[UserRole.BUYER]
+    ))
+    returned = mysql_repo.update_user(user.uid, updates)
+    assert_same_user(returned, mysql_repo.get_user_by_id(user.uid))
+
+
+def test_bump_token_version_matches_fresh_read(mysql_repo):
+    user = mysql_repo.create_user(UserCreate(phone_number=_phone(), telegram_id=0, roles=[UserRole.BUYER]))
+    returned = mysql_repo.bump_token_version(user.uid)
+    assert returned.token_version == user.token_version + 1
+    assert_same_user(returned, mysql_repo.get_user_by_id(user.uid))
+
+
+# --- Properties ---
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"image_urls": ["/images/only"], "floor_level": None, "has_elevator": None, "broker_id": None},
+    {"property_type": PropertyType.VILLA, "title_deed": True, "water_tank": True, "parking_spaces": None},
+])
+def test_create_property_matches_fresh_read(mysql_repo, broker, overrides):
+    returned = mysql_repo.create_property(_property_data(broker, **overrides))
+    assert returned.status == PropertyStatus.PENDING
+    assert returned == mysql_repo.get_property_by_id(returned.pid)
+
+
+@pytest.mark.parametrize("updates", [
+    {"price_etb": 5100000.999, "description": "Price updated"},
+    {"has_private_rooftop": True, "is_two_story_penthouse": False, "floor_level": None},
+    {},
+])
+def test_update_property_matches_fresh_read(mysql_repo, broker, updates):
+    prop = mysql_repo.create_property(_property_data(broker))
+    returned = mysql_repo.update_property(prop.pid, updates)
+    assert returned == mysql_repo.get_property_by_id(prop.pid)
+
+
+def test_transition_property_status_matches_fresh_read(mysql_repo, broker):
+    prop = mysql_repo.create_property(_property_data(broker))
+    returned = mysql_repo.transition_property_status(
+        prop.pid, [PropertyStatus.PENDING], PropertyStatus.REJECTED, {"rejection_reason": "Blurry photos"}
+    )
+    assert returned.status == PropertyStatus.REJECTED
+    assert returned == mysql_repo.get_property_by_id(prop.pid)
+
+
+def test_transition_keeps_image_urls_with_commas(mysql_repo, broker):
+    prop = mysql_repo.create_property(_property_data(broker, image_urls=["/images/a,b.jpg", "/images/c"]))
+    returned = mysql_repo.transition_property_status(prop.pid, [PropertyStatus.PENDING], PropertyStatus.APPROVED)
+    assert returned.image_urls == ["/images/a,b.jpg", "/images/c"]
+
+
+def test_transition_from_wrong_status_is_refused(mysql_repo, broker):
+    from src.utils.exceptions import InvalidOperationError
+
+    prop = mysql_repo.create_property(_property_data(broker))
+    mysql_repo.transition_property_status(prop.pid, [PropertyStatus.PENDING], PropertyStatus.APPROVED)
+    with pytest.raises(InvalidOperationError):
+        mysql_repo.transition_property_status(prop.pid, [PropertyStatus.PENDING], PropertyStatus.REJECTED)
+    assert mysql_repo.get_property_by_id(prop.pid).status == PropertyStatus.APPROVED
+
+
+def test_create_properties_matches_fresh_read(mysql_repo, broker):
+    returned = mysql_repo.create_properties(
+        [_property_data(broker), _property_data(broker, image_urls=["/images/x"])], PropertyStatus.APPROVED
+    )
+    assert [p.status for p in returned] == [PropertyStatus.APPROVED] * 2
+    assert returned == mysql_repo.get_properties_by_ids([p.pid for p in returned])
+
+
+# --- Cars ---
+def test_create_car_matches_fresh_read(mysql_repo, broker):
+    returned = mysql_repo.create_car(_car_data(broker))
+    assert returned.status == CarStatus.PENDING
+    assert returned == mysql_repo.get_car_by_id(returned.cid)
+
+
+def test_update_car_status_matches_fresh_read(mysql_repo, broker):
+    car = mysql_repo.create_car(_car_data(broker))
+    returned = mysql_repo.update_car_status(car.cid, CarStatus.APPROVED, from_statuses=[CarStatus.PENDING])
+    assert returned.status == CarStatus.APPROVED
+    assert returned == mysql_repo.get_car_by_id(car.cid)
+
+
+# --- Activity rollup ---
+def _activity(mysql_repo, kind, site):
+    from src.infrastructure.repository.mysql_repo import _db_now
+
+    day = _db_now().date()
+    counts = {row["event"]: row["n"] for row in mysql_repo.get_listing_activity(kind, day, site=site)}
+    prices = [(row["event"], float(row["price_etb"]), row["n"])
+              for row in mysql_repo.get_listing_activity_prices(kind, day, site=site)]
+    return counts, prices
+
+
+def test_transitions_are_counted_with_the_listing_change(mysql_repo, broker):
+    site = f"site-{uuid.uuid4().hex[:8]}"
+    location = {"region": "Addis Ababa", "city": "Addis Ababa", "site": site}
+    first = mysql_repo.create_property(_property_data(broker, location=location, price_etb=1000))
+    second = mysql_repo.create_property(_property_data(broker, location=location, price_etb=1000))
+    for prop in (first, second):
+        mysql_repo.transition_property_status(prop.pid, [PropertyStatus.PENDING], PropertyStatus.APPROVED)
+    with pytest.raises(Exception):
+        mysql_repo.transition_property_status(first.pid, [PropertyStatus.PENDING], PropertyStatus.APPROVED)
+
+    counts, prices = _activity(mysql_repo, "property", site)
+    # One row per event, not per listing or price; the refused transition counted nothing
+    assert counts == {"submitted": 2, "approved": 2}
+    assert prices == [("approved", 1000.0, 2)]
+
+
+# --- Keyword search ---
+def test_keyword_conditions_match_short_words_and_stopwords_with_like():
+    pytest.importorskip("pymysql")
+    from src.infrastructure.repository.mysql_repo import MySQLRealEstateRepository
+
+    repo = MySQLRealEstateRepository.__new__(MySQLRealEstateRepository)
+    repo._fulltext_supported, repo._ft_min_token_size, repo._ft_stopwords = True, 3, frozenset({"with"})
+    conditions, params = repo._keyword_conditions(["villa", "g2", "with", "pool"])
+    assert params[0] == "+villa* +pool*"
+    assert conditions[1:] == ["(p.description LIKE %s OR p.location_site LIKE %s OR p.location_region LIKE %s)"] * 2
+    assert params[1:] == ["%g2%"] * 3 + ["%with%"] * 3
+
+    repo._fulltext_supported = False
+    conditions, params = repo._keyword_conditions(["bole"])
+    assert len(conditions) == 1 and "MATCH" not in conditions[0]
+    assert params == ["%bole%"] * 3
+
+
+# --- Streaming export ---
+def test_stream_keeps_every_image_of_long_lists(mysql_repo, broker):
+    from src.domain.models.property_models import PropertyFilter
+
+    # Far past the 1024-byte default group_concat_max_len
+    urls = [f"/images/{uuid.uuid4().hex}/{'x' * 40}.jpg" for _ in range(40)]
+    prop = mysql_repo.create_property(_property_data(broker, image_urls=urls))
+    rows = [row for row in mysql_repo.stream_properties(PropertyFilter()) if row["pid"] == prop.pid]
+    assert rows[0]["image_urls"].split("|") == urls
+
+
+# --- Projected queries ---
+def test_projected_image_lists_are_loaded_without_group_concat():
+    pytest.importorskip("pymysql")
+    from src.infrastructure.repository.mysql_repo import MySQLRealEstateRepository
+
+    select = MySQLRealEstateRepository._select_columns("property", "p", ["price_etb", "image_urls"])
+    assert select == "p.price_etb, p.pid"
+
+
+def test_projected_image_urls_match_fresh_read(mysql_repo, broker):
+    from src.domain.models.property_models import PropertyFilter
+
+    urls = [f"/images/{uuid.uuid4().hex}/{'x' * 40}.jpg" for _ in range(40)] + ["/images/a|b.jpg"]
+    prop = mysql_repo.create_property(_property_data(broker, image_urls=urls))
+    mysql_repo.transition_property_status(prop.pid, [PropertyStatus.PENDING], PropertyStatus.APPROVED)
+    rows = mysql_repo.query_property_columns(PropertyFilter(), ["price_etb", "image_urls"])
+    assert {"price_etb": prop.price_etb, "image_urls": urls} in [
+        {**row, "price_etb": float(row["price_etb"])} for row in rows
+    ]
+
+
+# --- Bulk moderation ---
+def _notifications(mysql_repo, listing_ids):
+    rows = mysql_repo._execute_query(
+        f"SELECT listing_id, broker_id, event, reason FROM broker_notifications "
+        f"WHERE listing_id IN ({', '.join(['%s'] * len(listing_ids))}) ORDER BY listing_id",
+        tuple(listing_ids), fetch_all=True
+    )
+    return sorted((row["listing_id"], row["broker_id"], row["event"], row["reason"]) for row in rows)
+
+
+def test_bulk_transition_queues_one_notification_per_brokered_listing(mysql_repo, broker):
+    brokered = [mysql_repo.create_property(_property_data(broker)) for _ in range(2)]
+    unbrokered = mysql_repo.create_property(_property_data(broker, broker_id=None))
+    sold = mysql_repo.create_property(_property_data(broker))
+    mysql_repo.transition_property_status(sold.pid, [PropertyStatus.PENDING], PropertyStatus.APPROVED)
+    mysql_repo.transition_property_status(sold.pid, [PropertyStatus.APPROVED], PropertyStatus.SOLD)
+    ids = [p.pid for p in brokered] + [unbrokered.pid, sold.pid]
+
+    changed, statuses = mysql_repo.bulk_transition_properties(
+        ids + ids[:1], [PropertyStatus.PENDING], PropertyStatus.REJECTED, {"rejection_reason": "Duplicate"}, reason="Duplicate"
+    )
+    assert [p.pid for p in changed] == ids[:3]
+    assert statuses[sold.pid] == "sold"
+    # The single approval above was not a bulk action, so only the rejections are queued
+    assert _notifications(mysql_repo, ids) == sorted((p.pid, broker.uid, "rejected", "Duplicate") for p in brokered)
+
+
+# --- Batch fetch ---
+def test_batch_fetch_keeps_request_order_and_skips_unknown_ids(mysql_repo, broker):
+    first, second, third = (mysql_repo.create_property(_property_data(broker)) for _ in range(3))
+    returned = mysql_repo.get_properties_by_ids([third.pid, "no-such-id", first.pid, third.pid, second.pid])
+    assert [p.pid for p in returned] == [third.pid, first.pid, second.pid]
+    assert returned[0] == mysql_repo.get_property_by_id(third.pid)
+
+    car = mysql_repo.create_car(_car_data(broker))
+    assert [c.cid for c in mysql_repo.get_cars_by_ids(["no-such-id", car.cid, car.cid])] == [car.cid]
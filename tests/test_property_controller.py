@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("jose")
+
+from werkzeug.datastructures import MultiDict
+
+from src.controllers.property_controller import _ids_from_args
+
+
+def test_ids_keep_request_order_without_duplicates():
+    args = MultiDict([("ids", "c, a,,c"), ("ids", "b"), ("ids", "a")])
+    assert _ids_from_args(args) == (["c", "a", "b"], None)
+
+
+def test_too_many_or_no_ids_are_refused(monkeypatch):
+    monkeypatch.setattr("src.controllers.property_controller.settings.LISTING_BATCH_MAX_IDS", 2)
+    # Duplicates don't count against the limit
+    assert _ids_from_args(MultiDict([("ids", "a,b,a")])) == (["a", "b"], None)
+    assert _ids_from_args(MultiDict([("ids", "a,b,c")])) == (None, "At most 2 ids per request")
+    assert _ids_from_args(MultiDict([("ids", " , ")]))[1] == "ids must name at least one listing"
+
+
+def test_query_without_words_is_no_keyword_filter():
+    from src.controllers.property_controller import _property_filter_from_args
+
+    assert _property_filter_from_args(MultiDict([("q", " !!! ")])).q is None
+    assert _property_filter_from_args(MultiDict([("q", " villa! ")])).q == "villa!"
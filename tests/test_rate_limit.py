@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("jose")
+
+from src.utils.rate_limit import InMemoryBucketStore, RedisBucketStore
+
+
+class RedisDown(Exception):
+    pass
+
+
+def _store_without_redis() -> RedisBucketStore:
+    def script(keys, args):
+        raise RedisDown("Connection refused")
+
+    store = RedisBucketStore.__new__(RedisBucketStore)
+    store._errors, store._script = RedisDown, script
+    store._fallback, store._unavailable = InMemoryBucketStore(), False
+    return store
+
+
+def test_redis_outage_falls_back_to_in_process_buckets():
+    store = _store_without_redis()
+    assert store.take("login:ip:1.2.3.4", capacity=2, refill_per_second=1 / 60) == (True, 0.0)
+    assert store.take("login:ip:1.2.3.4", capacity=2, refill_per_second=1 / 60)[0]
+    allowed, retry_after = store.take("login:ip:1.2.3.4", capacity=2, refill_per_second=1 / 60)
+    assert not allowed and retry_after > 0
@@ -0,0 +1,99 @@
+"""The in-memory property index has to answer like the SQL query it stands in for."""
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pydantic")
+
+from src.domain.models.property_models import Property, PropertyFilter, PropertyStatus
+from src.infrastructure.search.property_index import PropertySearchIndex
+
+
+def _property(pid: str, created_at: datetime, updated_at: datetime = None, **overrides) -> Property:
+    data = dict(
+        pid=pid,
+        property_type="Apartment",
+        location={"region": "Addis Ababa", "city": "Addis Ababa", "site": "Bole"},
+        bedrooms=2,
+        bathrooms=1,
+        size_sqm=80,
+        price_etb=2500000,
+        description="Apartment",
+        image_urls=["/images/a"],
+        status=PropertyStatus.APPROVED,
+        created_at=created_at,
+        updated_at=updated_at or created_at,
+    )
+    data.update(overrides)
+    return Property(**data)
+
+
+def test_ties_on_created_at_are_ordered_by_pid():
+    same_second = datetime(2024, 5, 1, 12, 0, 0)
+    index = PropertySearchIndex()
+    index.rebuild([
+        _property("c", same_second),
+        _property("a", same_second),
+        _property("z", datetime(2024, 6, 1)),
+        _property("b", same_second),
+    ])
+    # ORDER BY created_at DESC, pid
+    assert [p.pid for p in index.query(PropertyFilter())] == ["z", "a", "b", "c"]
+    assert [p.pid for p in index.query(PropertyFilter(), limit=2, offset=1)] == ["a", "b"]
+
+
+def test_local_writes_do_not_move_the_watermark():
+    index = PropertySearchIndex()
+    index.rebuild([_property("a", datetime(2024, 5, 1))])
+    index.upsert(_property("b", datetime(2024, 7, 1)))
+    # Writes other processes made between the two must still be synced
+    assert index.watermark == datetime(2024, 5, 1)
+    assert len(index) == 2
+
+
+def test_delta_sync_moves_the_watermark():
+    class Repo:
+        def get_properties_updated_since(self, since):
+            return [_property("b", datetime(2024, 7, 1), status=PropertyStatus.REJECTED)]
+
+    index = PropertySearchIndex(sync_interval=0)
+    index.rebuild([_property("a", datetime(2024, 5, 1)), _property("b", datetime(2024, 6, 1))])
+    index._rebuilt_at = float("inf")  # keep refresh on the delta path
+    index.refresh(Repo())
+    assert index.watermark == datetime(2024, 7, 1)
+    assert [p.pid for p in index.query(PropertyFilter())] == ["a"]
+
+
+def test_price_buckets_do_not_overlap():
+    from src.infrastructure.search.price_buckets import PriceDistribution
+
+    prices = [1_000_000, 2_000_000, 2_000_000, 3_000_000, 4_000_000, 5_000_000, 6_000_000, 7_000_000]
+    distribution = PriceDistribution()
+    distribution.rebuild([_property(str(i), datetime(2024, 5, 1), price_etb=price) for i, price in enumerate(prices)])
+    buckets = distribution.buckets(count=4)
+    assert sum(bucket["count"] for bucket in buckets) == len(prices)
+    for bucket in buckets:
+        # Filtering with the bucket's bounds (both inclusive) finds exactly its listings
+        inside = [p for p in prices
+                  if (bucket["min"] is None or p >= bucket["min"]) and (bucket["max"] is None or p <= bucket["max"])]
+        assert len(inside) == bucket["count"]
+
+
+def test_price_distribution_rebuilds_from_price_columns():
+    from src.infrastructure.search.price_buckets import PriceDistribution
+
+    class Repo:
+        def query_property_columns(self, filters, columns):
+            assert filters.status == PropertyStatus.APPROVED
+            return [{"pid": "a", "property_type": "Villa", "price_etb": 9_000_000, "updated_at": datetime(2024, 5, 1)}]
+
+        def query_properties(self, filters):
+            raise AssertionError("a rebuild should not load full listings")
+
+    distribution = PriceDistribution()
+    distribution.refresh(Repo())
+    assert distribution.stats()["by_type"] == {"Villa": 1}
+    assert distribution.watermark == datetime(2024, 5, 1)
+    distribution.remove("a")
+    assert distribution.stats()["listings"] == 0
@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("telegram")
+
+from src.infrastructure.telegram_bot.user_state import UserStateStore
+
+
+class FakeApplication:
+    def __init__(self):
+        self.user_data = {}
+
+    def drop_user_data(self, user_id):
+        del self.user_data[user_id]
+
+
+def _touch(store, app, user_id, **data):
+    app.user_data.setdefault(user_id, {}).update(data)
+    store.touch(app, user_id)
+
+
+def test_overflow_skips_users_in_a_conversation():
+    app, store = FakeApplication(), UserStateStore(max_users=2)
+    _touch(store, app, 1, submission_data={"step": "photos"})
+    _touch(store, app, 2)
+    _touch(store, app, 3)
+    # User 1 is the least recently seen but mid-submission, so user 2 goes instead
+    assert set(app.user_data) == {1, 3}
+    assert store.skipped_active_checks == 1
+
+
+def test_sweep_keeps_active_conversations_until_they_time_out(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("src.infrastructure.telegram_bot.user_state.time.monotonic", lambda: clock[0])
+    app = FakeApplication()
+    store = UserStateStore(ttl=60, sweep_interval=0, conversation_timeout=600)
+    _touch(store, app, 1, filters={"property_type": "Villa"})
+    _touch(store, app, 2)
+    clock[0] += 120
+    _touch(store, app, 3)
+    assert set(app.user_data) == {1, 3}
+    clock[0] += 600
+    _touch(store, app, 3)
+    assert set(app.user_data) == {3}
+
+
+def test_stats_estimates_size_from_a_sample():
+    app, store = FakeApplication(), UserStateStore()
+    store.SIZE_SAMPLE = 5
+    for user_id in range(50):
+        _touch(store, app, user_id, note="x" * 100)
+    stats = store.stats(app)
+    assert stats["entries"] == 50
+    assert 50 * 100 <= stats["approx_bytes"] <= 50 * 300
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("passlib")
+
+from src.domain.models.user_models import User, UserRole
+from src.use_cases.user_use_cases import UserUseCases
+
+
+class FakeRepo:
+    def __init__(self, user: User):
+        self.user = user
+
+    def get_user_by_id(self, uid):
+        return self.user
+
+    def get_token_version(self, uid):
+        return self.user.token_version
+
+    def set_user_role(self, uid, role, enable):
+        roles = set(self.user.roles) | {role} if enable else set(self.user.roles) - {role}
+        self.user = self.user.model_copy(update={"roles": sorted(roles)})
+        return self.user
+
+    def bump_token_version(self, uid):
+        self.user = self.user.model_copy(update={"token_version": self.user.token_version + 1})
+        return self.user
+
+
+def test_adding_a_role_revokes_tokens_with_the_old_roles():
+    repo = FakeRepo(User(
+        uid="u1", phone_number="N/A_1", telegram_id=1, roles=[UserRole.BUYER],
+        created_at=datetime(2024, 5, 1), updated_at=datetime(2024, 5, 1),
+    ))
+    cases = UserUseCases(repo)
+    assert cases.is_token_current("u1", 0)
+    user = cases.add_user_role("u1", UserRole.BROKER)
+    assert UserRole.BROKER in user.roles
+    assert not cases.is_token_current("u1", 0)
+    assert cases.is_token_current("u1", user.token_version)